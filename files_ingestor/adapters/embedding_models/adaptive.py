@@ -0,0 +1,79 @@
+import asyncio
+from typing import Any, Optional
+
+import httpx
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from llama_index.core.bridge.pydantic import PrivateAttr
+
+from files_ingestor.domain.ports.config import ConfigPort
+from files_ingestor.domain.ports.embedding_model import EmbeddingModelPort
+from files_ingestor.domain.services.adaptive_limiter import (
+    AIMDLimiter,
+    RetryPolicy,
+    register_overload_errors,
+    shared_limiter,
+)
+
+# Ollama and the inference APIs are called through httpx, whose timeouts are not TimeoutError
+register_overload_errors(httpx.TimeoutException, httpx.TransportError)
+
+
+class LimitedEmbedding(BaseEmbedding):
+    """Embedding model whose backend calls go through an adaptive concurrency limiter, with retries."""
+
+    _embed_model: BaseEmbedding = PrivateAttr()
+    _limiter: AIMDLimiter = PrivateAttr()
+    _retry: RetryPolicy = PrivateAttr()
+
+    def __init__(self, embed_model: BaseEmbedding, limiter: AIMDLimiter, retry: RetryPolicy, **kwargs: Any):
+        super().__init__(model_name=embed_model.model_name, embed_batch_size=embed_model.embed_batch_size, **kwargs)
+        self._embed_model = embed_model
+        self._limiter = limiter
+        self._retry = retry
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "LimitedEmbedding"
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        return self._retry.call(self._limiter, self._embed_model._get_query_embedding, query)
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._retry.call(self._limiter, self._embed_model._get_text_embedding, text)
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[Embedding]:
+        return self._retry.call(self._limiter, self._embed_model._get_text_embeddings, texts, size=len(texts))
+
+    # The async variants run the blocking call in a worker thread, sharing the same slots as sync callers
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        return await asyncio.to_thread(self._get_query_embedding, query)
+
+    async def _aget_text_embedding(self, text: str) -> Embedding:
+        return await asyncio.to_thread(self._get_text_embedding, text)
+
+    async def _aget_text_embeddings(self, texts: list[str]) -> list[Embedding]:
+        return await asyncio.to_thread(self._get_text_embeddings, texts)
+
+
+class AdaptiveEmbeddingModel(EmbeddingModelPort):
+    """
+    Wraps any embedding adapter with AIMD concurrency control and retry with backoff.
+
+    Limiters are shared per `backend` name in the process, so every ingestion and query job calling
+    the same Ollama host or inference API draws from one budget.
+    """
+
+    def __init__(
+        self,
+        embedding_model: EmbeddingModelPort,
+        config: ConfigPort,
+        backend: Optional[str] = None,
+        config_key: str = "embeddings.concurrency",
+    ):
+        model = embedding_model.get_model()
+        self.backend = backend or model.model_name
+        self.limiter = shared_limiter(self.backend, lambda: AIMDLimiter.from_config(config, config_key))
+        self._model = LimitedEmbedding(model, self.limiter, RetryPolicy.from_config(config, config_key))
+
+    def get_model(self) -> LimitedEmbedding:
+        return self._model
@@ -1,12 +1,31 @@
+from typing import Optional
+
 from llama_index.embeddings.ollama.base import OllamaEmbedding
 
+from files_ingestor.adapters.ollama_http import OllamaHttpSettings, ollama_client, use_shared_clients
+from files_ingestor.domain.ports.config import ConfigPort
 from files_ingestor.domain.ports.embedding_model import EmbeddingModelPort
 
 
 class OllamaEmbeddingModel(EmbeddingModelPort):
-    def __init__(self, url: str = "http://localhost:11434", model: str = "bge-m3:latest"):
-        self._model = OllamaEmbedding(base_url=url, model_name=model)
+    def __init__(
+        self,
+        url: str = "http://localhost:11434",
+        model: str = "bge-m3:latest",
+        http: Optional[OllamaHttpSettings] = None,
+    ):
+        self.http = http if http is not None else OllamaHttpSettings(base_url=url)
+        self._model = OllamaEmbedding(base_url=self.http.base_url, model_name=model)
+        use_shared_clients(self._model, self.http)
         self._model_name = model
 
+    @classmethod
+    def from_config(cls, config: ConfigPort, key: str = "embeddings.bgem3") -> "OllamaEmbeddingModel":
+        return cls(model=config.get(f"{key}.name", "bge-m3:latest"), http=OllamaHttpSettings.from_config(config, key))
+
+    def warm_up(self) -> None:
+        """Loads the model into the Ollama server and keeps it resident for `keep_alive`."""
+        ollama_client(self.http).embed(model=self._model_name, input="warm-up", keep_alive=self.http.model_keep_alive)
+
     def get_model(self) -> OllamaEmbedding:
         return self._model
@@ -1,15 +1,39 @@
+import asyncio
+import json
 import os
+import shutil
+import threading
+import uuid
+from collections.abc import AsyncIterator
+from typing import Any, Literal, Optional
 
-from fastapi import FastAPI, UploadFile
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
+from files_ingestor.application.commands import Command
+from files_ingestor.application.commands.delete_document import DeleteDocumentCmd
 from files_ingestor.application.commands.ingest_pdf import (
+    IngestBytesCmd,
     IngestCloudStorageCmd,
     IngestFolderCmd,
     IngestPDFCmd,
+    WatchFolderCmd,
 )
+from files_ingestor.application.commands.migrate_collection import MigrateCollectionCmd
+from files_ingestor.application.commands.snapshot import ExportSnapshotCmd, ImportSnapshotCmd
+from files_ingestor.application.commands.warm_text_cache import WarmTextCacheCmd
 from files_ingestor.application.handlers.handler import Handler
+from files_ingestor.application.handlers.question_handler import QuestionHandler
+from files_ingestor.application.queries.question_query import (
+    BatchQuestionQuery,
+    MultiCollectionRetrieveQuery,
+    RetrieveQuery,
+)
 from files_ingestor.domain.ports.logger_port import LoggerPort
+from files_ingestor.domain.services.answer_cache import AnswerCache
+from files_ingestor.domain.services.progress import IngestionProgress, ProgressTracker
+from files_ingestor.domain.services.query_cache import QueryEmbeddingCache
 
 
 class FileProcessingRequest(BaseModel):
@@ -21,53 +45,203 @@ class QueryRequest(BaseModel):
     question: str
 
 
+class QuestionBatchRequest(BaseModel):
+    """Request model for answering several questions at once."""
+
+    questions: list[str] = Field(min_length=1)
+    collection: Optional[str] = None
+    top_k: Optional[int] = Field(default=None, ge=1)
+    # Answers synthesized at the same time, to bound the load on the LLM
+    max_concurrency: Optional[int] = Field(default=None, ge=1)
+    # Only nodes with these metadata values are retrieved, e.g. {"source": "moby-dick.pdf", "page": [3, 4]}
+    filters: Optional[dict[str, Any]] = None
+    # Override the collection's query settings: fewer LLM calls and less context answer faster
+    response_mode: Optional[Literal["compact", "refine", "tree_summarize", "no_text"]] = None
+    max_context_tokens: Optional[int] = Field(default=None, ge=1)
+
+
+class RetrieveRequest(BaseModel):
+    """Request model for retrieving the chunks closest to a query, without an LLM answer."""
+
+    query: str
+    collection: Optional[str] = None
+    top_k: Optional[int] = Field(default=None, ge=1)
+    filters: Optional[dict[str, Any]] = None
+
+
+class MultiCollectionRetrieveRequest(BaseModel):
+    """Request model for retrieving the chunks closest to a query across several collections at once."""
+
+    query: str
+    # The agent's collections if missing
+    collections: Optional[list[str]] = Field(default=None, min_length=1)
+    top_k: Optional[int] = Field(default=None, ge=1)
+    filters: Optional[dict[str, Any]] = None
+    # Merging of the per-collection rankings: reciprocal rank fusion or normalized scores
+    fusion: Optional[Literal["rrf", "score"]] = None
+
+
 class CloudStorageRequest(BaseModel):
     """Request model for cloud storage URL ingestion."""
 
     url: str
     recursive: bool = True
+    # Static sharding: this node only ingests the objects whose URL hashes to shard_index
+    shard_index: int = Field(default=0, ge=0)
+    shard_count: int = Field(default=1, ge=1)
+    # Progress is reported under job_id (generated if missing); background requests return it right away
+    job_id: Optional[str] = None
+    background: bool = False
+
+
+class MigrationRequest(BaseModel):
+    """Request model for re-embedding a collection into a new version behind its alias."""
+
+    # Config entry of the target embedding model, the current one if missing
+    embeddings: Optional[str] = None
+    max_pages_per_second: Optional[float] = Field(default=None, ge=0)
+    drop_old: bool = False
+    # Needed by the first migration of a collection created before aliases: it is deleted for the alias
+    replace_collection: bool = False
+    job_id: Optional[str] = None
+    # Migrations take hours, so they run in the background unless asked otherwise
+    background: bool = True
+
+
+class SnapshotRequest(BaseModel):
+    """Request model for exporting or importing a snapshot bundle, a file on the server."""
+
+    path: str
+    # The configured collection on export, the exported one on import, if missing
+    collection: Optional[str] = None
+    # Import only: replace an existing collection
+    replace: bool = False
+    job_id: Optional[str] = None
+    background: bool = False
+
+
+class WatchFolderRequest(BaseModel):
+    """Request model for watching a folder for new or changed PDFs."""
+
+    folder_path: str
+    recursive: bool = True
+    debounce_seconds: float = 2.0
+    poll_interval: float = 5.0
+    workers: int = 4
 
 
 class HttpApp:
-    def __init__(self, logger: LoggerPort, ingestor_handler: Handler):
+    def __init__(
+        self,
+        logger: LoggerPort,
+        ingestor_handler: Handler,
+        max_in_memory_bytes: int = 32 * 1024 * 1024,
+        progress: Optional[ProgressTracker] = None,
+        question_handler: Optional[QuestionHandler] = None,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+        answer_cache: Optional[AnswerCache] = None,
+    ):
         self.app = FastAPI()
         self.logger = logger
         self.ingestion_handler = ingestor_handler
+        self.max_in_memory_bytes = max_in_memory_bytes
+        self.progress = progress or ProgressTracker()
+        self.question_handler = question_handler
+        self.query_cache = query_cache
+        self.answer_cache = answer_cache
+        self.watches: dict[str, WatchFolderCmd] = {}
         self._setup_routes()
 
     def _setup_routes(self) -> None:
         self.app.get("/status")(self._status)
+        self.app.get("/metrics")(self._metrics)
         self.app.post("/ingest-pdf")(self._upload_pdf)
         self.app.post("/ingest-folder")(self._upload_folder)
         self.app.post("/ingest-cloud")(self._ingest_cloud_storage)
+        self.app.delete("/documents")(self._delete_document)
+        self.app.post("/text-cache/warm")(self._warm_text_cache)
+        self.app.post("/collections/{collection_name}/migrate")(self._migrate_collection)
+        self.app.post("/snapshots/export")(self._export_snapshot)
+        self.app.post("/snapshots/import")(self._import_snapshot)
+        self.app.post("/watch-folder")(self._watch_folder)
+        self.app.post("/watch-folder/stop")(self._stop_watch_folder)
+        self.app.get("/ingestions")(self._list_ingestions)
+        self.app.get("/ingestions/{job_id}")(self._get_ingestion)
+        self.app.get("/ingestions/{job_id}/events")(self._ingestion_events)
+        self.app.post("/questions/batch")(self._ask_batch)
+        self.app.post("/retrieve")(self._retrieve)
+        self.app.post("/retrieve/collections")(self._retrieve_collections)
 
     async def _status(self) -> dict[str, str]:
         return {"status": "ok"}
 
-    async def _upload_pdf(self, file: UploadFile) -> dict[str, str]:
-        upload_dir = "./tmp/files_ingestor_uploads"
-        os.makedirs(upload_dir, exist_ok=True)
+    async def _metrics(self) -> dict[str, Any]:
+        metrics: dict[str, Any] = {}
+        if self.query_cache is not None:
+            metrics["query_embedding_cache"] = self.query_cache.metrics()
+        if self.answer_cache is not None:
+            metrics["answer_cache"] = self.answer_cache.metrics()
+        return metrics
 
-        file_path = os.path.join(upload_dir, file.filename)  # type: ignore # noqa: PGH003
-        with open(file_path, "wb") as buffer:
-            buffer.write(await file.read())
+    async def _upload_pdf(self, file: UploadFile, replace: bool = False) -> dict[str, str]:
+        if file.size is not None and file.size <= self.max_in_memory_bytes:
+            # Small uploads are parsed straight from memory
+            command: Command = IngestBytesCmd(
+                data=await file.read(),
+                source=file.filename,  # type: ignore # noqa: PGH003
+                metadata={"content_type": file.content_type},
+                replace=replace,
+            )
+        else:
+            upload_dir = "./tmp/files_ingestor_uploads"
+            os.makedirs(upload_dir, exist_ok=True)
+
+            file_path = os.path.join(upload_dir, file.filename)  # type: ignore # noqa: PGH003
+            with open(file_path, "wb") as buffer:
+                shutil.copyfileobj(file.file, buffer)
+            command = IngestPDFCmd(filename=file_path, replace=replace)
 
         self.logger.info(f"Uploaded PDF: {file.filename}")
 
         try:
-            self.ingestion_handler.handle(IngestPDFCmd(filename=file_path))
+            await asyncio.to_thread(self.ingestion_handler.handle, command)
         except Exception as e:
             self.logger.error("Error processing PDF", error=e)  # noqa: TRY400
             return {"status": "error", "message": str(e)}
         else:
             return {"status": "success", "filename": file.filename}  # type: ignore # noqa: PGH003
 
-    async def _upload_folder(self, folder_path: str) -> dict[str, str | int]:
+    def _start_background(self, cmd: Command) -> dict[str, str | int]:
+        """Runs an ingestion in a background thread, returning the job id to follow its progress with."""
+        cmd.job_id = cmd.job_id or uuid.uuid4().hex[:12]
+        self.progress.expect(cmd.job_id, cmd.name())
+        threading.Thread(target=self._run_background, args=(cmd,), name=f"ingest:{cmd.job_id}", daemon=True).start()
+        return {"status": "accepted", "job_id": cmd.job_id}
+
+    def _run_background(self, cmd: Command) -> None:
+        try:
+            self.ingestion_handler.handle(cmd)
+        except Exception as e:
+            self.logger.error(f"Error processing background job {cmd.job_id}", error=e)  # noqa: TRY400
+
+    async def _upload_folder(
+        self,
+        folder_path: str,
+        shard_index: int = 0,
+        shard_count: int = 1,
+        job_id: Optional[str] = None,
+        background: bool = False,
+    ) -> dict[str, str | int]:
         if not os.path.exists(folder_path):
             raise ValueError(f"Folder {folder_path} does not exist")  # noqa: TRY003
 
+        cmd = IngestFolderCmd(folder_path=folder_path, shard_index=shard_index, shard_count=shard_count)
+        cmd.job_id = job_id
+        if background:
+            return self._start_background(cmd)
+
         try:
-            num_files = self.ingestion_handler.handle(IngestFolderCmd(folder_path=folder_path))
+            num_files = await asyncio.to_thread(self.ingestion_handler.handle, cmd)
         except Exception as e:
             self.logger.error("Error processing folder", error=e)  # noqa: TRY400
             return {"status": "error", "message": str(e)}
@@ -76,10 +250,18 @@ class HttpApp:
 
     async def _ingest_cloud_storage(self, request: CloudStorageRequest) -> dict[str, str | int]:
         """Ingest files from a cloud storage URL."""
+        cmd = IngestCloudStorageCmd(
+            url=request.url,
+            recursive=request.recursive,
+            shard_index=request.shard_index,
+            shard_count=request.shard_count,
+        )
+        cmd.job_id = request.job_id
+        if request.background:
+            return self._start_background(cmd)
+
         try:
-            num_files = self.ingestion_handler.handle(
-                IngestCloudStorageCmd(url=request.url, recursive=request.recursive)
-            )
+            num_files = await asyncio.to_thread(self.ingestion_handler.handle, cmd)
         except ValueError as e:
             self.logger.error("Invalid cloud storage request", e)  # noqa: TRY400
             return {"status": "error", "message": str(e)}
@@ -89,8 +271,213 @@ class HttpApp:
         else:
             return {"status": "success", "num_files": num_files}
 
+    async def _warm_text_cache(self, request: CloudStorageRequest) -> dict[str, str | int]:
+        """Parses the PDFs of a folder or storage URL into the extracted-text cache, without ingesting them."""
+        cmd = WarmTextCacheCmd(
+            url=request.url,
+            recursive=request.recursive,
+            shard_index=request.shard_index,
+            shard_count=request.shard_count,
+        )
+        cmd.job_id = request.job_id
+        if request.background:
+            return self._start_background(cmd)
+
+        try:
+            num_files = await asyncio.to_thread(self.ingestion_handler.handle, cmd)
+        except Exception as e:
+            self.logger.error("Error warming the text cache", error=e)  # noqa: TRY400
+            return {"status": "error", "message": str(e)}
+        else:
+            return {"status": "success", "num_files": num_files}
+
+    async def _migrate_collection(self, collection_name: str, request: MigrationRequest) -> dict[str, str | int]:
+        """Re-embeds a collection into a new version and swaps its alias once done."""
+        cmd = MigrateCollectionCmd(
+            collection_name,
+            embeddings=request.embeddings,
+            max_pages_per_second=request.max_pages_per_second,
+            drop_old=request.drop_old,
+            replace_collection=request.replace_collection,
+        )
+        cmd.job_id = request.job_id
+        if request.background:
+            return self._start_background(cmd)
+
+        try:
+            num_pages = await asyncio.to_thread(self.ingestion_handler.handle, cmd)
+        except Exception as e:
+            self.logger.error("Error migrating collection", error=e)  # noqa: TRY400
+            return {"status": "error", "message": str(e)}
+        else:
+            return {"status": "success", "num_pages": num_pages}
+
+    async def _export_snapshot(self, request: SnapshotRequest) -> dict[str, str | int]:
+        """Exports a collection with its docstore into a bundle file, to bootstrap other nodes with."""
+        cmd = ExportSnapshotCmd(request.path, collection_name=request.collection)
+        return await self._handle_snapshot(cmd, request, "exporting")
+
+    async def _import_snapshot(self, request: SnapshotRequest) -> dict[str, str | int]:
+        """Restores a collection with its docstore from a bundle file, without embedding anything."""
+        cmd = ImportSnapshotCmd(request.path, collection_name=request.collection, replace=request.replace)
+        return await self._handle_snapshot(cmd, request, "importing")
+
+    async def _handle_snapshot(self, cmd: Command, request: SnapshotRequest, action: str) -> dict[str, str | int]:
+        cmd.job_id = request.job_id
+        if request.background:
+            return self._start_background(cmd)
+
+        try:
+            num_points = await asyncio.to_thread(self.ingestion_handler.handle, cmd)
+        except Exception as e:
+            self.logger.error(f"Error {action} snapshot", error=e)  # noqa: TRY400
+            return {"status": "error", "message": str(e)}
+        else:
+            return {"status": "success", "num_points": num_points}
+
+    async def _delete_document(self, source: str) -> dict[str, str | int]:
+        """Removes every chunk ingested from a source document."""
+        try:
+            num_nodes = await asyncio.to_thread(self.ingestion_handler.handle, DeleteDocumentCmd(source=source))
+        except Exception as e:
+            self.logger.error("Error deleting document", error=e)  # noqa: TRY400
+            return {"status": "error", "message": str(e)}
+        else:
+            return {"status": "success", "num_nodes": num_nodes}
+
+    async def _watch_folder(self, request: WatchFolderRequest) -> dict[str, str]:
+        """Starts ingesting the changes of a folder in the background."""
+        folder_path = os.path.abspath(request.folder_path)
+        if not os.path.isdir(folder_path):
+            return {"status": "error", "message": f"Folder {request.folder_path} does not exist"}
+        if folder_path in self.watches:
+            return {"status": "error", "message": f"Folder {request.folder_path} is already watched"}
+
+        cmd = WatchFolderCmd(
+            folder_path=folder_path,
+            recursive=request.recursive,
+            debounce_seconds=request.debounce_seconds,
+            poll_interval=request.poll_interval,
+            workers=request.workers,
+        )
+        self.watches[folder_path] = cmd
+        threading.Thread(target=self._run_watch, args=(cmd,), name=f"watch:{folder_path}", daemon=True).start()
+        return {"status": "watching", "folder_path": folder_path}
+
+    def _run_watch(self, cmd: WatchFolderCmd) -> None:
+        try:
+            self.ingestion_handler.handle(cmd)
+        except Exception as e:
+            self.logger.error(f"Error watching folder {cmd.folder_path}", error=e)  # noqa: TRY400
+        finally:
+            self.watches.pop(cmd.folder_path, None)
+
+    async def _stop_watch_folder(self, folder_path: str) -> dict[str, str]:
+        cmd = self.watches.get(os.path.abspath(folder_path))
+        if cmd is None:
+            return {"status": "error", "message": f"Folder {folder_path} is not watched"}
+
+        cmd.stop_event.set()
+        return {"status": "stopped", "folder_path": cmd.folder_path}
+
+    async def _list_ingestions(self) -> list[dict[str, Any]]:
+        return [progress.snapshot() for progress in self.progress.jobs()]
+
+    def _get_progress(self, job_id: str) -> IngestionProgress:
+        progress = self.progress.get(job_id)
+        if progress is None:
+            raise HTTPException(status_code=404, detail=f"Unknown ingestion {job_id}")
+        return progress
+
+    async def _get_ingestion(self, job_id: str) -> dict[str, Any]:
+        """Current counters, rates and ETA of an ingestion, for polling."""
+        return self._get_progress(job_id).snapshot()
+
+    async def _ingestion_events(self, job_id: str, interval: float = 1.0) -> StreamingResponse:
+        """Streams the progress of an ingestion as server-sent events until it finishes."""
+        progress = self._get_progress(job_id)
+
+        async def events() -> AsyncIterator[str]:
+            while True:
+                finished = progress.finished
+                yield f"event: progress\ndata: {json.dumps(progress.snapshot())}\n\n"
+                if finished:
+                    return
+                await asyncio.sleep(interval)
+
+        return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    def _get_question_handler(self) -> QuestionHandler:
+        if self.question_handler is None:
+            raise HTTPException(status_code=501, detail="Questions are not served by this app")
+        return self.question_handler
+
+    async def _ask_batch(self, request: QuestionBatchRequest) -> dict[str, Any]:
+        """Answers a batch of questions, with the time each of them took."""
+        question_handler = self._get_question_handler()
+        query = BatchQuestionQuery(
+            request.questions,
+            request.collection,
+            request.top_k,
+            request.max_concurrency,
+            request.filters,
+            request.response_mode,
+            request.max_context_tokens,
+        )
+        try:
+            # Synthesis takes seconds per question, so it runs off the event loop
+            answers = await asyncio.to_thread(question_handler.handle, query)
+        except Exception as e:
+            self.logger.error("Error answering questions", error=e)  # noqa: TRY400
+            return {"status": "error", "message": str(e)}
+        else:
+            return {"status": "success", "answers": [answer.to_dict() for answer in answers]}
+
+    async def _retrieve(self, request: RetrieveRequest) -> dict[str, Any]:
+        """Returns the chunks closest to a query with their scores; no LLM is involved."""
+        question_handler = self._get_question_handler()
+        query = RetrieveQuery(request.query, request.collection, request.top_k, request.filters)
+        try:
+            nodes = await asyncio.to_thread(question_handler.handle, query)
+        except Exception as e:
+            self.logger.error("Error retrieving nodes", error=e)  # noqa: TRY400
+            return {"status": "error", "message": str(e)}
+        else:
+            return {"status": "success", "nodes": [node.to_dict() for node in nodes]}
+
+    async def _retrieve_collections(self, request: MultiCollectionRetrieveRequest) -> dict[str, Any]:
+        """Returns the chunks closest to a query across collections, each searched concurrently under a timeout."""
+        question_handler = self._get_question_handler()
+        query = MultiCollectionRetrieveQuery(
+            request.query, request.collections, request.top_k, request.filters, request.fusion
+        )
+        try:
+            # Awaited on the server's event loop, the one the async vector store client is bound to
+            nodes = await question_handler.ahandle(query)
+        except Exception as e:
+            self.logger.error("Error retrieving nodes", error=e)  # noqa: TRY400
+            return {"status": "error", "message": str(e)}
+        else:
+            return {"status": "success", "nodes": [node.to_dict() for node in nodes]}
+
 
-def create_http_app(logger: LoggerPort, ingestor_handler: Handler) -> FastAPI:
-    """Creates an HTTP app for processing files."""
-    http_app = HttpApp(logger=logger, ingestor_handler=ingestor_handler)
+def create_http_app(
+    logger: LoggerPort,
+    ingestor_handler: Handler,
+    max_in_memory_bytes: int = 32 * 1024 * 1024,
+    progress: Optional[ProgressTracker] = None,
+    question_handler: Optional[QuestionHandler] = None,
+    query_cache: Optional[QueryEmbeddingCache] = None,
+    answer_cache: Optional[AnswerCache] = None,
+) -> FastAPI:
+    """Creates an HTTP app for processing files and answering questions."""
+    http_app = HttpApp(
+        logger=logger,
+        ingestor_handler=ingestor_handler,
+        max_in_memory_bytes=max_in_memory_bytes,
+        progress=progress,
+        question_handler=question_handler,
+        query_cache=query_cache,
+        answer_cache=answer_cache,
+    )
     return http_app.app
@@ -0,0 +1,208 @@
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from typing import Any, Optional, TextIO
+
+from files_ingestor.domain.ports.config import ConfigPort
+from files_ingestor.domain.ports.logger_port import LOG_CONTEXT, LoggerPort
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as compact one-line JSON objects, context fields included."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            **getattr(record, "context", {}),
+        }
+        sampled = getattr(record, "sampled", 1)
+        if sampled > 1:
+            entry["sampled"] = sampled
+        if record.exc_text:
+            entry["error"] = record.exc_text
+        return json.dumps(entry, separators=(",", ":"), default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one record in `1 / rate` per level, for levels given a rate below 1.
+
+    Each kept record carries in `sampled` how many records it stands for.
+    """
+
+    def __init__(self, rates: dict[int, float]):
+        super().__init__()
+        self.every = {level: max(round(1 / rate), 1) for level, rate in rates.items() if 0 < rate < 1}
+        self.dropped_levels = {level for level, rate in rates.items() if rate <= 0}
+        self._counts: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno in self.dropped_levels:
+            return False
+        every = self.every.get(record.levelno)
+        if every is None:
+            return True
+        with self._lock:
+            count = self._counts.get(record.levelno, 0)
+            self._counts[record.levelno] = count + 1
+        record.sampled = every
+        return count % every == 0
+
+
+class _ContextQueueHandler(logging.handlers.QueueHandler):
+    """
+    Captures the log context of the calling thread and hands a self-contained record to the queue.
+
+    Records arriving while the queue is full are dropped and counted rather than blocking the caller.
+    """
+
+    def __init__(self, records: queue.Queue[logging.LogRecord]):
+        super().__init__(records)
+        self.records = records
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.records.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.context = LOG_CONTEXT.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Tracebacks are not picklable nor safe to format later, so they are rendered here
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _BlockingStopQueueListener(logging.handlers.QueueListener):
+    """Waits for room for the stop sentinel, where the stock listener fails when the queue is full."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)  # type: ignore[attr-defined]
+
+
+class QueueJsonLoggerAdapter(LoggerPort):
+    def __init__(
+        self,
+        logger_name: str = "files_ingestor",
+        log_level: int = logging.INFO,
+        sample_rates: Optional[dict[int, float]] = None,
+        stream: Optional[TextIO] = None,
+        max_queue_size: int = 10000,
+    ) -> None:
+        """
+        Initialize a logger whose records are written as JSON by a background thread.
+
+        Callers only pay for putting the record in a queue; a slow stdout collector never blocks
+        request handlers or ingestion loops. Once `max_queue_size` records are waiting, new ones are
+        dropped and counted in `dropped`, reported by a warning on `close`. The queue is drained and the
+        stream flushed on `close`, which also runs at interpreter exit.
+
+        :param logger_name: Name of the logger (default: 'files_ingestor')
+        :param log_level: Logging level (default: logging.INFO)
+        :param sample_rates: Fraction of records kept per level, e.g. {logging.DEBUG: 0.01} (default: keep all)
+        :param stream: Stream the JSON lines are written to (default: sys.stderr)
+        :param max_queue_size: Records buffered before new ones are dropped (default: 10000)
+        """
+        self.logger = logging.getLogger(logger_name)
+        self.logger.setLevel(log_level)
+        self.logger.propagate = False
+
+        self.queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=max_queue_size)
+        self.queue_handler = _ContextQueueHandler(self.queue)
+        if sample_rates:
+            self.queue_handler.addFilter(SamplingFilter(sample_rates))
+        self.logger.handlers = [self.queue_handler]
+
+        self.stream_handler = logging.StreamHandler(stream or sys.stderr)
+        self.stream_handler.setFormatter(JsonFormatter())
+        self.listener = _BlockingStopQueueListener(self.queue, self.stream_handler, respect_handler_level=True)
+        self.listener.start()
+        self._closed = False
+        atexit.register(self.close)
+
+    @classmethod
+    def from_config(cls, config: ConfigPort, logger_name: str = "files_ingestor") -> "QueueJsonLoggerAdapter":
+        """
+        Build the adapter from the `logging` config section.
+
+        :param config: Configuration with `logging.level` and `logging.sampling` ({level name: rate})
+        :param logger_name: Name of the logger (default: 'files_ingestor')
+        """
+        levels = ("DEBUG", "INFO", "WARNING", "ERROR")
+        return cls(
+            logger_name=logger_name,
+            log_level=logging.getLevelName(config.get("logging.level", "INFO")),
+            sample_rates={
+                logging.getLevelName(level): config.get(f"logging.sampling.{level}", 1.0) for level in levels
+            },
+        )
+
+    @property
+    def dropped(self) -> int:
+        """Records dropped so far because the queue was full."""
+        return self.queue_handler.dropped
+
+    def close(self) -> None:
+        """
+        Write out every queued record and flush the stream. Safe to call more than once; records
+        logged afterwards are written synchronously.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self.listener.stop()
+        self.stream_handler.flush()
+        self.logger.handlers = [self.stream_handler]
+        if self.dropped:
+            self.logger.warning(f"Dropped {self.dropped} log records while the writer was falling behind")
+
+    def debug(self, message: str) -> None:
+        """
+        Log a debug message.
+
+        :param message: Debug message to log
+        """
+        self.logger.debug(message)
+
+    def info(self, message: str) -> None:
+        """
+        Log an info message.
+
+        :param message: Info message to log
+        """
+        self.logger.info(message)
+
+    def warn(self, message: str) -> None:
+        """
+        Log a warning message.
+
+        :param message: Warning message to log
+        """
+        self.logger.warning(message)
+
+    def error(self, message: str, error: Exception) -> None:
+        """
+        Log an error message with an exception.
+
+        :param message: Error message to log
+        :param error: Exception associated with the error
+        """
+        self.logger.error(f"{message}: {error!s}", exc_info=error)
@@ -1,20 +1,38 @@
 # import files_ingestor.domain.ports.config as ConfigPort
+from typing import Optional
+
 from langchain_ollama.chat_models import ChatOllama
 from llama_index.llms.ollama import Ollama
 
+from files_ingestor.adapters.ollama_http import OllamaHttpSettings, ollama_client, use_shared_clients
+from files_ingestor.domain.ports.config import ConfigPort
 from files_ingestor.domain.ports.llm import FunctionCallingLLMPort
 from files_ingestor.domain.ports.logger_port import LoggerPort
 
 
 class OllamaAdapter(FunctionCallingLLMPort):
-    def __init__(self, model_name: str, logger: LoggerPort):
+    def __init__(self, model_name: str, logger: LoggerPort, http: Optional[OllamaHttpSettings] = None):
         self.logger = logger
         self.model_name = model_name
-        llama_index_model = Ollama(model=self.model_name, base_url="http://localhost:11434", request_timeout=300)
-        langchain_model = ChatOllama(model=self.model_name, base_url="http://localhost:11434")
+        self.http = http if http is not None else OllamaHttpSettings()
+        llama_index_model = Ollama(
+            model=self.model_name, base_url=self.http.base_url, request_timeout=self.http.timeout
+        )
+        langchain_model = ChatOllama(model=self.model_name, base_url=self.http.base_url)
+        # Both libraries share the connection pool of the host instead of opening their own
+        use_shared_clients(llama_index_model, self.http)
+        use_shared_clients(langchain_model, self.http)
         self.models = {"llamaindex": llama_index_model, "langchain": langchain_model}
         self.logger.info(f"Using Ollama model {self.model_name}")
 
+    @classmethod
+    def from_config(cls, config: ConfigPort, key: str, logger: LoggerPort) -> "OllamaAdapter":
+        return cls(config.get(f"{key}.name", ""), logger=logger, http=OllamaHttpSettings.from_config(config, key))
+
+    def warm_up(self) -> None:
+        """Loads the model into the Ollama server (an empty prompt generates nothing) and keeps it resident."""
+        ollama_client(self.http).generate(model=self.model_name, prompt="", keep_alive=self.http.model_keep_alive)
+
     def get_model(self, library: str):  # type: ignore  # noqa: PGH003
         if library not in FunctionCallingLLMPort.__SUPPORTED_LIBRARIES:
             raise ValueError(f"Unsupported library: {library}")  # noqa: TRY003
@@ -0,0 +1,93 @@
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import httpx
+import ollama
+
+from files_ingestor.domain.ports.config import ConfigPort
+from files_ingestor.domain.ports.logger_port import LoggerPort
+
+
+@dataclass(frozen=True)
+class OllamaHttpSettings:
+    """Connection settings of an Ollama host, read from an `llm.<name>` or `embeddings.<name>` config entry."""
+
+    base_url: str = "http://localhost:11434"
+    timeout: float = 300.0
+    connect_timeout: float = 5.0
+    max_connections: int = 16
+    max_keepalive_connections: int = 8
+    keepalive_expiry: float = 60.0
+    model_keep_alive: str = "30m"
+
+    @classmethod
+    def from_config(cls, config: ConfigPort, key: str) -> "OllamaHttpSettings":
+        return cls(
+            base_url=config.get(f"{key}.base_url", cls.base_url),
+            timeout=config.get(f"{key}.timeout", cls.timeout),
+            connect_timeout=config.get(f"{key}.connect_timeout", cls.connect_timeout),
+            max_connections=config.get(f"{key}.pool.max_connections", cls.max_connections),
+            max_keepalive_connections=config.get(
+                f"{key}.pool.max_keepalive_connections", cls.max_keepalive_connections
+            ),
+            keepalive_expiry=config.get(f"{key}.pool.keepalive_expiry", cls.keepalive_expiry),
+            model_keep_alive=config.get(f"{key}.keep_alive", cls.model_keep_alive),
+        )
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def httpx_timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.timeout, connect=self.connect_timeout)
+
+
+_transports: dict[str, httpx.HTTPTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def shared_transport(settings: OllamaHttpSettings) -> httpx.HTTPTransport:
+    """
+    Returns the process-wide connection pool of an Ollama host.
+
+    Every client of the same base URL (embeddings and LLMs alike) reuses its keep-alive connections;
+    the pool limits of the first settings seen for a host apply.
+    """
+    with _transports_lock:
+        if settings.base_url not in _transports:
+            _transports[settings.base_url] = httpx.HTTPTransport(limits=settings.limits())
+        return _transports[settings.base_url]
+
+
+def ollama_client(settings: OllamaHttpSettings) -> ollama.Client:
+    return ollama.Client(host=settings.base_url, timeout=settings.httpx_timeout(), transport=shared_transport(settings))
+
+
+def ollama_async_client(settings: OllamaHttpSettings) -> ollama.AsyncClient:
+    # Async connections are bound to the event loop that opened them, so they get a pool of their own
+    return ollama.AsyncClient(host=settings.base_url, timeout=settings.httpx_timeout(), limits=settings.limits())
+
+
+def use_shared_clients(model: Any, settings: OllamaHttpSettings) -> None:
+    """Points a llama-index or langchain Ollama model at the shared pools instead of its default clients."""
+    model._client = ollama_client(settings)
+    model._async_client = ollama_async_client(settings)
+
+
+def warm_up_in_background(name: str, warm_up: Callable[[], None], logger: LoggerPort) -> threading.Thread:
+    """Runs a model warm-up without holding back startup; a failure only costs the first request its latency."""
+
+    def run() -> None:
+        try:
+            warm_up()
+            logger.info(f"Warmed up Ollama model {name}")
+        except Exception as e:
+            logger.warn(f"Could not warm up Ollama model {name}: {e}")
+
+    thread = threading.Thread(target=run, name=f"warm-up-{name}", daemon=True)
+    thread.start()
+    return thread
@@ -1,6 +1,11 @@
+from collections.abc import Iterator
+from typing import Any, Optional
+
+from llama_index.core.schema import NodeWithScore, TextNode
 from llama_index.core.vector_stores.types import BasePydanticVectorStore
+from llama_index.core.vector_stores.utils import metadata_dict_to_node
 from llama_index.vector_stores.qdrant import QdrantVectorStore
-from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient, models
 
 from files_ingestor.domain.ports.logger_port import LoggerPort
 from files_ingestor.domain.ports.vectorstore import VectorStorePort
@@ -10,7 +15,8 @@ class QdrantRepository(VectorStorePort):
     def __init__(self, connection_string: str, logger: LoggerPort):
         self.logger = logger
         self.qdrant_client = QdrantClient(location=connection_string)
-        self.async_qdrant_client = AsyncQdrantClient(location=":memory:")
+        # Both clients must reach the same server; with ":memory:" each one holds its own separate store
+        self.async_qdrant_client = AsyncQdrantClient(location=connection_string)
         self.logger.info(f"Created Qdrant client: {self.qdrant_client.info()}")
 
     def collection_exist(self, collection_name: str) -> bool:
@@ -26,6 +32,8 @@ class QdrantRepository(VectorStorePort):
         return [collection.name for collection in collections.collections]
 
     def get_vector_store(self, collection_name: str) -> BasePydanticVectorStore:
+        """Returns the store of a collection, following the alias of that name to the collection it points to."""
+        collection_name = self.resolve_collection(collection_name)
         vector_store = (
             QdrantVectorStore(
                 client=self.qdrant_client, aclient=self.async_qdrant_client, collection_name=collection_name
@@ -34,3 +42,198 @@ class QdrantRepository(VectorStorePort):
             else QdrantVectorStore(client=self.qdrant_client, collection_name=collection_name)
         )
         return vector_store
+
+    def delete_documents(self, collection_name: str, ref_doc_ids: list[str]) -> None:
+        """Deletes every point of the given source documents with a single filtered request."""
+        if not ref_doc_ids or not self.collection_exist(collection_name):
+            return
+
+        self.qdrant_client.delete(
+            collection_name=collection_name,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(must=[models.FieldCondition(key="doc_id", match=models.MatchAny(any=ref_doc_ids))])
+            ),
+        )
+        self.logger.info(f"Deleted points of {len(ref_doc_ids)} documents from {collection_name}")
+
+    def create_collection(self, collection_name: str, vector_size: int, datatype: str = "float32") -> None:
+        """
+        Creates a collection for vectors of the given size and precision.
+
+        "float16" vectors are stored at half precision. "int8" vectors are scalar quantized and kept in RAM
+        while the float32 originals move to disk, where they are only read to rescore the best candidates.
+        """
+        quantization_config = None
+        if datatype == "int8":
+            quantization_config = models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, always_ram=True)
+            )
+        self.qdrant_client.create_collection(
+            collection_name=collection_name,
+            vectors_config=models.VectorParams(
+                size=vector_size,
+                distance=models.Distance.COSINE,
+                datatype=models.Datatype.FLOAT16 if datatype == "float16" else None,
+                on_disk=datatype == "int8",
+            ),
+            quantization_config=quantization_config,
+        )
+        self.logger.info(f"Created collection {collection_name} for {vector_size}-dimension {datatype} vectors")
+
+    def get_vector_size(self, collection_name: str) -> Optional[int]:
+        if not self.collection_exist(collection_name):
+            return None
+        vectors = self.qdrant_client.get_collection(collection_name=collection_name).config.params.vectors
+        if isinstance(vectors, dict):
+            vectors = next(iter(vectors.values()), None)
+        return vectors.size if vectors is not None else None
+
+    def resolve_collection(self, collection_name: str) -> str:
+        """Returns the collection an alias points to, or the name itself when it is not an alias."""
+        return self._aliases().get(collection_name, collection_name)
+
+    def swap_alias(self, alias: str, collection_name: str, replace_collection: bool = False) -> Optional[str]:
+        """
+        Points an alias at a collection, returning the collection it pointed to before.
+
+        Moving an existing alias is a single atomic request, so readers never see a missing collection.
+        A plain collection with the alias name (one created before aliases were used) has to be deleted
+        before the alias can take its name, leaving retrieval without a collection until the alias exists.
+        That one-time cut-over only happens with `replace_collection`, a ValueError is raised otherwise.
+        """
+        previous = self._aliases().get(alias)
+        operations: list[models.AliasOperations] = []
+        if previous is not None:
+            operations.append(models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=alias)))
+        elif self.collection_exist(alias):
+            if not replace_collection:
+                raise ValueError(  # noqa: TRY003
+                    f"{alias} is a collection, not an alias: it can only be replaced with replace_collection"
+                )
+            self.logger.warn(f"Replacing collection {alias} by an alias to {collection_name}")
+            self.qdrant_client.delete_collection(collection_name=alias)
+            previous = alias
+        create_alias = models.CreateAlias(collection_name=collection_name, alias_name=alias)
+        operations.append(models.CreateAliasOperation(create_alias=create_alias))
+        self.qdrant_client.update_collection_aliases(change_aliases_operations=operations)
+        self.logger.info(f"Alias {alias} now points to {collection_name} (was {previous})")
+        return previous
+
+    def delete_collection(self, collection_name: str) -> None:
+        self.qdrant_client.delete_collection(collection_name=collection_name)
+        self.logger.info(f"Deleted collection {collection_name}")
+
+    def scroll_points(self, collection_name: str, batch_size: int = 256) -> Iterator[list[dict[str, Any]]]:
+        """Reads every point of a collection with its vector and payload, as `{"id", "vector", "payload"}` batches."""
+        offset = None
+        while True:
+            records, offset = self.qdrant_client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            if records:
+                yield [
+                    {"id": record.id, "vector": record.vector, "payload": record.payload or {}} for record in records
+                ]
+            if offset is None:
+                return
+
+    def upsert_points(self, collection_name: str, points: list[dict[str, Any]]) -> None:
+        self.qdrant_client.upsert(
+            collection_name=collection_name,
+            points=[
+                models.PointStruct(id=point["id"], vector=point["vector"], payload=point["payload"]) for point in points
+            ],
+            wait=True,
+        )
+
+    def create_payload_indexes(self, collection_name: str, fields: dict[str, str]) -> None:
+        """
+        Indexes payload fields (name: schema type, e.g. "keyword" or "integer") so filtered searches do not
+        scan the whole collection. Fields already indexed are skipped, so it is safe to call repeatedly.
+        """
+        if not fields or not self.collection_exist(collection_name):
+            return
+        collection_name = self.resolve_collection(collection_name)
+        indexed = self.qdrant_client.get_collection(collection_name=collection_name).payload_schema
+        for field_name, field_type in fields.items():
+            if field_name in indexed:
+                continue
+            self.qdrant_client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=models.PayloadSchemaType(field_type),
+                wait=True,
+            )
+            self.logger.info(f"Created {field_type} payload index on {field_name} in {collection_name}")
+
+    def search_batch(
+        self,
+        collection_name: str,
+        vectors: list[list[float]],
+        top_k: int,
+        filters: Optional[dict[str, Any]] = None,
+    ) -> list[list[NodeWithScore]]:
+        """Searches the nearest nodes of several query vectors in a single request, all with the same filters."""
+        if not vectors:
+            return []
+        responses = self.qdrant_client.query_batch_points(
+            collection_name=collection_name, requests=self._query_requests(vectors, top_k, filters)
+        )
+        return [[self._to_node(point) for point in response.points] for response in responses]
+
+    async def asearch_batch(
+        self,
+        collection_name: str,
+        vectors: list[list[float]],
+        top_k: int,
+        filters: Optional[dict[str, Any]] = None,
+    ) -> list[list[NodeWithScore]]:
+        """Like search_batch, through the async client, so searches in several collections can run concurrently."""
+        if not vectors:
+            return []
+        responses = await self.async_qdrant_client.query_batch_points(
+            collection_name=collection_name, requests=self._query_requests(vectors, top_k, filters)
+        )
+        return [[self._to_node(point) for point in response.points] for response in responses]
+
+    @classmethod
+    def _query_requests(
+        cls, vectors: list[list[float]], top_k: int, filters: Optional[dict[str, Any]]
+    ) -> list[models.QueryRequest]:
+        query_filter = cls._to_filter(filters)
+        return [
+            models.QueryRequest(query=vector, filter=query_filter, limit=top_k, with_payload=True) for vector in vectors
+        ]
+
+    @staticmethod
+    def _to_filter(filters: Optional[dict[str, Any]]) -> Optional[models.Filter]:
+        """Matches every field (node metadata is stored at the top of the payload), lists matching any value."""
+        if not filters:
+            return None
+        return models.Filter(
+            must=[
+                models.FieldCondition(
+                    key=key,
+                    match=models.MatchAny(any=value) if isinstance(value, list) else models.MatchValue(value=value),
+                )
+                for key, value in filters.items()
+            ]
+        )
+
+    @staticmethod
+    def _to_node(point: models.ScoredPoint) -> NodeWithScore:
+        """Rebuilds the node the llama-index vector store serialized into the point payload."""
+        payload = point.payload or {}
+        try:
+            node = metadata_dict_to_node(payload)
+        except ValueError:
+            node = TextNode(text=payload.get("text", ""), metadata=payload)
+        node.id_ = str(point.id)
+        return NodeWithScore(node=node, score=point.score)
+
+    def _aliases(self) -> dict[str, str]:
+        return {alias.alias_name: alias.collection_name for alias in self.qdrant_client.get_aliases().aliases}
@@ -1,5 +1,14 @@
+import errno
 import os
+import queue
+import shutil
+import threading
+import time
+from collections.abc import Iterator
+from typing import Optional
 
+from files_ingestor.adapters.repositories.local_watcher import NativeWatcher, PollingWatcher
+from files_ingestor.domain.model.storage_entry import FileChange, StorageEntry, literal_prefix, matches_filters
 from files_ingestor.domain.ports.cloud_storage_port import CloudStoragePort
 from files_ingestor.domain.ports.logger_port import LoggerPort
 
@@ -20,28 +29,121 @@ class LocalStorageAdapter(CloudStoragePort):
             raise ValueError(f"Invalid file URL: {url}")  # noqa: TRY003
         return url[7:]  # Strip file:// prefix
 
-    def list_files(self, url: str, recursive: bool = False) -> list[str]:
-        """Lists files in local directory."""
+    def iter_files(
+        self,
+        url: str,
+        recursive: bool = False,
+        suffix: Optional[str] = None,
+        pattern: Optional[str] = None,
+        continuation_token: Optional[str] = None,
+    ) -> Iterator[StorageEntry]:
+        """
+        Lazily lists files in local directory with os.scandir.
+
+        The directory part of a glob pattern's literal head narrows the walk to that subfolder.
+        Local listings are a single page, so the continuation token is ignored.
+        """
         path = self._parse_local_url(url)
 
         if not os.path.exists(path):
             raise ValueError(f"Local path not found: {path}")  # noqa: TRY003
 
-        files = []
-        if recursive:
-            for root, _, filenames in os.walk(path):
-                for filename in filenames:
-                    file_path = os.path.join(root, filename)
-                    files.append(f"file://{file_path}")
-        else:
-            for entry in os.listdir(path):
-                file_path = os.path.join(path, entry)
-                if os.path.isfile(file_path):
-                    files.append(f"file://{file_path}")
-        return files
+        start_dir = path
+        if pattern:
+            pattern_dir = os.path.dirname(literal_prefix(pattern))
+            start_dir = os.path.join(path, pattern_dir)
+            if not recursive and pattern_dir:
+                return
+
+        yield from self._walk(start_dir, path, recursive, suffix, pattern)
+
+    @staticmethod
+    def _walk(
+        start_dir: str, root: str, recursive: bool, suffix: Optional[str], pattern: Optional[str]
+    ) -> Iterator[StorageEntry]:
+        """Scans `start_dir` (and its subfolders if `recursive`), yielding the files matching the filters."""
+        pending = [start_dir]
+        while pending:
+            current = pending.pop()
+            try:
+                scan = os.scandir(current)
+            except FileNotFoundError:
+                # Folder removed while walking, or pattern pointing to a missing subfolder
+                continue
+            with scan as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            pending.append(entry.path)
+                    elif entry.is_file() and matches_filters(os.path.relpath(entry.path, root), suffix, pattern):
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            # Removed since it was listed, its siblings are still there
+                            continue
+                        yield StorageEntry(url=f"file://{entry.path}", size=stat.st_size, mtime=stat.st_mtime)
+
+    def watch(
+        self,
+        url: str,
+        recursive: bool = True,
+        suffix: Optional[str] = None,
+        debounce_seconds: float = 2.0,
+        poll_interval: float = 5.0,
+        stop_event: Optional[threading.Event] = None,
+    ) -> Iterator[list[FileChange]]:
+        """
+        Watches a local folder, with inotify (through watchdog) when available or by polling.
+
+        Raw events are collapsed per file and only reported once the file has been quiet for
+        `debounce_seconds`, so a PDF still being copied is not picked up half written.
+        """
+        path = self._parse_local_url(url)
+
+        if not os.path.isdir(path):
+            raise ValueError(f"Local folder not found: {path}")  # noqa: TRY003
+
+        stop_event = stop_event or threading.Event()
+        changes: queue.Queue[tuple[str, str]] = queue.Queue()
+        watcher: NativeWatcher | PollingWatcher
+        try:
+            if not NativeWatcher.available():
+                raise OSError("watchdog is not installed")  # noqa: TRY003, TRY301
+            watcher = NativeWatcher(path, recursive, changes)
+            watcher.start()
+            self.logger.info(f"Watching {path} for changes")
+        except OSError as e:
+            self.logger.warn(f"Native file watching unavailable ({e!s}), polling {path} every {poll_interval}s")
+            watcher = PollingWatcher(path, recursive, changes, poll_interval=poll_interval)
+            watcher.start()
+
+        pending: dict[str, tuple[str, float]] = {}
+        try:
+            while not stop_event.is_set():
+                try:
+                    file_path, kind = changes.get(timeout=min(debounce_seconds, 1.0))
+                    if matches_filters(os.path.relpath(file_path, path), suffix):
+                        pending[file_path] = (kind, time.monotonic())
+                except queue.Empty:
+                    pass
+
+                now = time.monotonic()
+                settled = [file_path for file_path, (_, seen) in pending.items() if now - seen >= debounce_seconds]
+                if settled:
+                    yield [FileChange(url=f"file://{p}", kind=pending.pop(p)[0]) for p in settled]
+        finally:
+            watcher.stop()
+
+    def list_files(self, url: str, recursive: bool = False) -> list[str]:
+        """Lists files in local directory."""
+        return [entry.url for entry in self.iter_files(url, recursive=recursive)]
+
+    def local_path(self, url: str) -> Optional[str]:
+        """Local files are read in place."""
+        return self._parse_local_url(url)
 
     def download_file(self, url: str, local_path: str) -> str:
-        """Creates a hard link for local files."""
+        """Creates a hard link for local files, or a copy when the target is on another filesystem."""
         source_path = self._parse_local_url(url)
 
         if not os.path.exists(source_path):
@@ -49,6 +151,21 @@ class LocalStorageAdapter(CloudStoragePort):
 
         os.makedirs(os.path.dirname(local_path), exist_ok=True)
         if source_path != local_path:
-            os.link(source_path, local_path)  # Hard link for local files
+            try:
+                os.link(source_path, local_path)  # Hard link for local files
+            except OSError as e:
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                    raise
+                shutil.copy2(source_path, local_path)
 
         return local_path
+
+    def read_bytes(self, url: str) -> bytes:
+        """Reads a local file into memory."""
+        source_path = self._parse_local_url(url)
+
+        if not os.path.exists(source_path):
+            raise ValueError(f"Local file not found: {source_path}")  # noqa: TRY003
+
+        with open(source_path, "rb") as f:
+            return f.read()
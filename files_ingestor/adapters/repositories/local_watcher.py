@@ -0,0 +1,116 @@
+"""
+Raw change sources for watched local folders.
+
+Both watchers push `(path, kind)` tuples into a queue; debouncing is left to the consumer.
+The native watcher relies on the optional `watchdog` package (inotify on Linux, FSEvents or
+ReadDirectoryChangesW elsewhere); when it is not installed the polling watcher diffs
+os.scandir snapshots instead.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from typing import Any
+
+try:
+    from watchdog.events import FileSystemEvent, FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # pragma: no cover
+    Observer = None  # type: ignore[assignment]
+    FileSystemEventHandler = object  # type: ignore[assignment, misc]
+
+
+class PollingWatcher:
+    """Detects changes by comparing (mtime, size) snapshots of the folder every `poll_interval` seconds."""
+
+    def __init__(self, path: str, recursive: bool, changes: queue.Queue[tuple[str, str]], poll_interval: float = 5.0):
+        self.path = path
+        self.recursive = recursive
+        self.changes = changes
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._snapshot = self._scan()
+        self._thread = threading.Thread(target=self._run, name=f"poll-watch:{path}", daemon=True)
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        snapshot = {}
+        pending = [self.path]
+        while pending:
+            current = pending.pop()
+            try:
+                scan = os.scandir(current)
+            except FileNotFoundError:
+                continue
+            with scan as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if self.recursive:
+                            pending.append(entry.path)
+                    elif entry.is_file():
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            # Deleted mid-scan: only this file is gone, not its whole folder
+                            continue
+                        snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            snapshot = self._scan()
+            for path, signature in snapshot.items():
+                previous = self._snapshot.get(path)
+                if previous is None:
+                    self.changes.put((path, "created"))
+                elif previous != signature:
+                    self.changes.put((path, "modified"))
+            for path in self._snapshot.keys() - snapshot.keys():
+                self.changes.put((path, "deleted"))
+            self._snapshot = snapshot
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+class _QueueEventHandler(FileSystemEventHandler):
+    def __init__(self, changes: queue.Queue[tuple[str, str]]):
+        super().__init__()
+        self.changes = changes
+
+    def on_any_event(self, event: FileSystemEvent) -> None:
+        if event.is_directory:
+            return
+        match event.event_type:
+            case "created" | "modified" | "deleted":
+                self.changes.put((os.fsdecode(event.src_path), event.event_type))
+            case "closed":
+                # inotify reports the end of a write as IN_CLOSE_WRITE
+                self.changes.put((os.fsdecode(event.src_path), "modified"))
+            case "moved":
+                self.changes.put((os.fsdecode(event.src_path), "deleted"))
+                self.changes.put((os.fsdecode(event.dest_path), "created"))
+
+
+class NativeWatcher:
+    """Receives change notifications from the OS through watchdog."""
+
+    def __init__(self, path: str, recursive: bool, changes: queue.Queue[tuple[str, str]]):
+        self._observer: Any = Observer()
+        self._observer.schedule(_QueueEventHandler(changes), path, recursive=recursive)
+
+    @staticmethod
+    def available() -> bool:
+        return Observer is not None
+
+    def start(self) -> None:
+        self._observer.start()
+
+    def stop(self) -> None:
+        self._observer.stop()
+        self._observer.join()
@@ -1,9 +1,13 @@
 import os
+from collections.abc import Iterator
+from typing import Optional
 from urllib.parse import urlparse
 
 import boto3  # type: ignore  # noqa: PGH003
+from boto3.s3.transfer import TransferConfig  # type: ignore  # noqa: PGH003
 from botocore.exceptions import ClientError  # type: ignore  # noqa: PGH003
 
+from files_ingestor.domain.model.storage_entry import StorageEntry, literal_prefix, matches_filters
 from files_ingestor.domain.ports.cloud_storage_port import CloudStoragePort
 from files_ingestor.domain.ports.config import ConfigPort
 from files_ingestor.domain.ports.logger_port import LoggerPort
@@ -39,6 +43,14 @@ class S3StorageAdapter(CloudStoragePort):
             region_name=aws_region,
         )
 
+        # Multipart settings for large objects: parts are fetched as parallel ranged GETs
+        self.transfer_config = TransferConfig(
+            multipart_threshold=self.config.get("storage.s3.transfer.multipart_threshold", 8 * 1024 * 1024),
+            multipart_chunksize=self.config.get("storage.s3.transfer.multipart_chunksize", 8 * 1024 * 1024),
+            max_concurrency=self.config.get("storage.s3.transfer.max_concurrency", 10),
+            use_threads=self.config.get("storage.s3.transfer.use_threads", True),
+        )
+
     def _parse_s3_url(self, url: str) -> tuple[str, str]:
         """Parse S3 URL into bucket and key."""
         if not url.startswith("s3://"):
@@ -61,28 +73,64 @@ class S3StorageAdapter(CloudStoragePort):
         """
         return url.startswith("s3://")
 
-    def list_files(self, url: str, recursive: bool = False) -> list[str]:
-        """Lists files in S3 bucket."""
-        bucket, prefix = self._parse_s3_url(url)
+    def iter_files(
+        self,
+        url: str,
+        recursive: bool = False,
+        suffix: Optional[str] = None,
+        pattern: Optional[str] = None,
+        continuation_token: Optional[str] = None,
+    ) -> Iterator[StorageEntry]:
+        """
+        Lazily lists files in S3 bucket, one ListObjectsV2 page at a time.
 
-        try:
-            paginator = self.s3_client.get_paginator("list_objects_v2")
-            files = []
+        Non-recursive listings use the "/" delimiter and the literal head of a glob pattern
+        extends the listing prefix, so S3 only returns candidate keys. Suffix and the rest of
+        the pattern are matched on each page.
+        """
+        bucket, prefix = self._parse_s3_url(url)
 
-            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
-                if "Contents" not in page:
+        list_prefix = prefix
+        if (not recursive or pattern) and prefix and not prefix.endswith("/"):
+            # The delimiter and the pattern work on the contents of "folder/", not on "folder*" keys
+            list_prefix += "/"
+        if pattern:
+            list_prefix += literal_prefix(pattern)
+
+        params = {"Bucket": bucket, "Prefix": list_prefix}
+        if not recursive:
+            params["Delimiter"] = "/"
+
+        page_token = continuation_token
+        while True:
+            request = {**params, "ContinuationToken": page_token} if page_token is not None else params
+            try:
+                page = self.s3_client.list_objects_v2(**request)
+            except ClientError as e:
+                self.logger.error("Error listing S3 bucket", e)  # noqa: TRY400
+                raise OSError(f"Failed to list {url}: {e!s}") from e  # noqa: TRY003
+
+            for obj in page.get("Contents", []):
+                relative_key = obj["Key"][len(prefix) :].lstrip("/")
+                if not recursive and "/" in relative_key:
                     continue
+                if not matches_filters(relative_key, suffix, pattern):
+                    continue
+                yield StorageEntry(
+                    url=f"s3://{bucket}/{obj['Key']}",
+                    size=obj.get("Size", 0),
+                    etag=obj["ETag"].strip('"') if "ETag" in obj else None,
+                    mtime=obj["LastModified"].timestamp() if "LastModified" in obj else None,
+                    page_token=page_token,
+                )
+
+            if not page.get("IsTruncated"):
+                return
+            page_token = page["NextContinuationToken"]
 
-                for obj in page["Contents"]:
-                    if not recursive and "/" in obj["Key"][len(prefix) :].lstrip("/"):
-                        continue
-                    files.append(f"s3://{bucket}/{obj['Key']}")
-
-        except ClientError as e:
-            self.logger.error("Error listing S3 bucket", e)  # noqa: TRY400
-            raise OSError(f"Failed to list {url}: {e!s}") from e  # noqa: TRY003
-        else:
-            return files
+    def list_files(self, url: str, recursive: bool = False) -> list[str]:
+        """Lists files in S3 bucket."""
+        return [entry.url for entry in self.iter_files(url, recursive=recursive)]
 
     def download_file(self, url: str, local_path: str) -> str:
         """Downloads a file from S3."""
@@ -90,9 +138,22 @@ class S3StorageAdapter(CloudStoragePort):
 
         try:
             os.makedirs(os.path.dirname(local_path), exist_ok=True)
-            self.s3_client.download_file(bucket, key, local_path)
+            self.s3_client.download_file(bucket, key, local_path, Config=self.transfer_config)
         except ClientError as e:
             self.logger.error("Error downloading from S3", e)  # noqa: TRY400
             raise OSError(f"Failed to download {url}: {e!s}") from e  # noqa: TRY003
         else:
             return local_path
+
+    def read_bytes(self, url: str) -> bytes:
+        """Fetches a file from S3 into memory with a single GET."""
+        bucket, key = self._parse_s3_url(url)
+
+        try:
+            response = self.s3_client.get_object(Bucket=bucket, Key=key)
+            data: bytes = response["Body"].read()
+        except ClientError as e:
+            self.logger.error("Error reading from S3", e)  # noqa: TRY400
+            raise OSError(f"Failed to read {url}: {e!s}") from e  # noqa: TRY003
+        else:
+            return data
@@ -1,7 +1,13 @@
 from __future__ import annotations  # noqa: I001
 
+import argparse
+
+from files_ingestor.application.commands import Command
 from files_ingestor.application.handlers.handler import Handler
-from files_ingestor.application.commands.ingest_pdf import IngestPDFCmd
+from files_ingestor.application.commands.ingest_pdf import IngestCloudStorageCmd, IngestFolderCmd, IngestPDFCmd
+from files_ingestor.application.commands.migrate_collection import MigrateCollectionCmd
+from files_ingestor.application.commands.snapshot import ExportSnapshotCmd, ImportSnapshotCmd
+from files_ingestor.application.commands.warm_text_cache import WarmTextCacheCmd
 from files_ingestor.domain.ports.logger_port import LoggerPort
 
 
@@ -12,13 +18,65 @@ class TerminalAdapter:
         self.handler = handler
         self.logger = logger
 
-    def run(self) -> None:
-        """Runs the CLI interface."""
-        file_name = input("Enter the file name: ")
-        # operations = input("Enter the operations (words, characters, or both): ").split(",")
+    @staticmethod
+    def parse_command(argv: list[str]) -> Command:
+        """
+        Builds the command for a folder (`--folder`) or storage URL (`--url`) ingestion, optionally sharded,
+        for warming the extracted-text cache with it (`--warm-text-cache`), for migrating a collection
+        to a new version (`--migrate`), or for exporting or importing a snapshot bundle.
+        """
+        parser = argparse.ArgumentParser(prog="main_terminal")
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument("--folder", help="Local folder to ingest")
+        target.add_argument("--url", help="s3:// or file:// URL to ingest")
+        target.add_argument("--migrate", metavar="COLLECTION", help="Re-embed a collection into a new version")
+        target.add_argument("--export-snapshot", metavar="PATH", help="Export a collection and its docstore")
+        target.add_argument("--import-snapshot", metavar="PATH", help="Restore a collection and its docstore")
+        parser.add_argument("--shard-index", type=int, default=0, help="Shard ingested by this node (0-based)")
+        parser.add_argument("--shard-count", type=int, default=1, help="Number of nodes sharing the corpus")
+        parser.add_argument(
+            "--warm-text-cache", action="store_true", help="Only parse the PDFs into the extracted-text cache"
+        )
+        parser.add_argument("--embeddings", help="Config entry of the embedding model to migrate to")
+        parser.add_argument("--max-pages-per-second", type=float, help="Pace of the migration")
+        parser.add_argument("--drop-old", action="store_true", help="Delete the old collection after the migration")
+        parser.add_argument("--collection", help="Collection to export or import into (default: the configured one)")
+        parser.add_argument(
+            "--replace",
+            action="store_true",
+            help="Replace an existing collection on import, or a plain (non-alias) one on its first migration",
+        )
+        args = parser.parse_args(argv)
+
+        if args.export_snapshot is not None:
+            return ExportSnapshotCmd(args.export_snapshot, collection_name=args.collection)
+        if args.import_snapshot is not None:
+            return ImportSnapshotCmd(args.import_snapshot, collection_name=args.collection, replace=args.replace)
+
+        if args.migrate is not None:
+            return MigrateCollectionCmd(
+                args.migrate,
+                embeddings=args.embeddings,
+                max_pages_per_second=args.max_pages_per_second,
+                drop_old=args.drop_old,
+                replace_collection=args.replace,
+            )
+        if args.warm_text_cache:
+            return WarmTextCacheCmd(args.folder or args.url, shard_index=args.shard_index, shard_count=args.shard_count)
+        if args.folder is not None:
+            return IngestFolderCmd(args.folder, shard_index=args.shard_index, shard_count=args.shard_count)
+        return IngestCloudStorageCmd(args.url, shard_index=args.shard_index, shard_count=args.shard_count)
+
+    def run(self, argv: list[str] | None = None) -> None:
+        """Runs the CLI interface. Without arguments it asks for a single file to ingest."""
+        if argv:
+            command = self.parse_command(argv)
+        else:
+            file_name = input("Enter the file name: ")
+            # operations = input("Enter the operations (words, characters, or both): ").split(",")
 
-        # query = CountFileQuery(file_name=file_name, operations=operations)
-        command = IngestPDFCmd(filename=file_name)
+            # query = CountFileQuery(file_name=file_name, operations=operations)
+            command = IngestPDFCmd(filename=file_name)
         result = self.handler.handle(command)
 
         self.logger.info(f"Result: {result}")
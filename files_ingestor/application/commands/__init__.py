@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Optional
 
 
 class Command(ABC):
+    # Identifies the run for progress reporting and logs; generated when the command is processed if unset
+    job_id: Optional[str] = None
+
     @property
     @abstractmethod
     def name(self) -> Any: ...
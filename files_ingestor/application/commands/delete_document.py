@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from . import Command
+
+
+class DeleteDocumentCmd(Command):
+    """Encapsulates the source (file path or storage URL) of a document whose chunks must be removed."""
+
+    def __init__(self, source: str):
+        self.source: str = source
+
+    def name(self) -> str:
+        return "Delete Document Command"
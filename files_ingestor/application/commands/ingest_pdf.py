@@ -1,34 +1,107 @@
 from __future__ import annotations
 
+import threading
+from typing import Any, BinaryIO
+
 from . import Command
 
 
 class IngestPDFCmd(Command):
     """Encapsulates input parameters for file ingestion operations."""
 
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, replace: bool = False):
         self.file_name: str = filename
+        # Remove the pages a previous ingestion of the same file had and this one lacks
+        self.replace: bool = replace
 
     def name(self) -> str:
         return "Ingest PDF Command"
 
 
+class IngestBytesCmd(Command):
+    """Encapsulates an in-memory PDF (bytes, memoryview or binary file-like) and its source metadata."""
+
+    def __init__(
+        self,
+        data: bytes | memoryview | BinaryIO,
+        source: str,
+        metadata: dict[str, Any] | None = None,
+        replace: bool = False,
+    ):
+        self.data: bytes | memoryview | BinaryIO = data
+        self.source: str = source
+        self.metadata: dict[str, Any] = metadata or {}
+        self.replace: bool = replace
+
+    def name(self) -> str:
+        return "Ingest Bytes Command"
+
+
 class IngestFolderCmd(Command):
-    """Encapsulates input parameter (path) for folder ingestion operations."""
+    """
+    Encapsulates input parameter (path) for folder ingestion operations.
+
+    `shard_index` and `shard_count` restrict the run to the files whose path relative to the
+    folder hashes to this shard, so several nodes can split one folder between them.
+    """
 
-    def __init__(self, folder_path: str):
+    def __init__(self, folder_path: str, shard_index: int = 0, shard_count: int = 1):
         self.folder_path: str = folder_path
+        self.shard_index: int = shard_index
+        self.shard_count: int = shard_count
 
     def name(self) -> str:
         return "Ingest Folder Command"
 
 
+class WatchFolderCmd(IngestFolderCmd):
+    """Encapsulates input parameters for continuously ingesting the changes of a folder."""
+
+    def __init__(
+        self,
+        folder_path: str,
+        recursive: bool = True,
+        debounce_seconds: float = 2.0,
+        poll_interval: float = 5.0,
+        workers: int = 4,
+        stop_event: threading.Event | None = None,
+    ):
+        super().__init__(folder_path)
+        self.recursive: bool = recursive
+        self.debounce_seconds: float = debounce_seconds
+        self.poll_interval: float = poll_interval
+        self.workers: int = workers
+        self.stop_event: threading.Event = stop_event or threading.Event()
+
+    def name(self) -> str:
+        return "Watch Folder Command"
+
+
 class IngestCloudStorageCmd(Command):
-    """Encapsulates input parameters for cloud storage ingestion operations."""
+    """
+    Encapsulates input parameters for cloud storage ingestion operations.
+
+    `shard_index` and `shard_count` restrict the run to the objects whose URL hashes to this shard.
+    """
 
-    def __init__(self, url: str, recursive: bool = True):
+    def __init__(
+        self,
+        url: str,
+        recursive: bool = True,
+        resume: bool = False,
+        checkpoint_path: str | None = None,
+        stage_local: bool = False,
+        shard_index: int = 0,
+        shard_count: int = 1,
+    ):
         self.url: str = url
         self.recursive: bool = recursive
+        self.resume: bool = resume
+        self.checkpoint_path: str | None = checkpoint_path
+        # Stage local (file://) sources in a temp dir instead of reading them in place
+        self.stage_local: bool = stage_local
+        self.shard_index: int = shard_index
+        self.shard_count: int = shard_count
 
     def name(self) -> str:
         return "Ingest Cloud Storage Command"
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from . import Command
+
+
+class MigrateCollectionCmd(Command):
+    """
+    Encapsulates a blue/green re-embedding of a collection into a new versioned one.
+
+    `embeddings` names the config entry of the target embedding model (e.g. "embeddings.bgem3"),
+    the current model when None. The migration is paced to `max_pages_per_second` (from the
+    collection's migration config when None) and `drop_old` deletes the previous collection once
+    the alias points to the new one. The first migration of a plain collection, one created before
+    aliases were used, needs `replace_collection`: it is deleted right before the alias takes its
+    name, so retrieval briefly finds no collection.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        embeddings: str | None = None,
+        max_pages_per_second: float | None = None,
+        drop_old: bool = False,
+        replace_collection: bool = False,
+    ):
+        self.collection_name: str = collection_name
+        self.embeddings: str | None = embeddings
+        self.max_pages_per_second: float | None = max_pages_per_second
+        self.drop_old: bool = drop_old
+        self.replace_collection: bool = replace_collection
+
+    def name(self) -> str:
+        return "Migrate Collection Command"
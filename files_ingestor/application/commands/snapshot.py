@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from . import Command
+
+
+class ExportSnapshotCmd(Command):
+    """Encapsulates the export of a collection (the default one if None) and its docstore into a bundle file."""
+
+    def __init__(self, path: str, collection_name: str | None = None):
+        self.path: str = path
+        self.collection_name: str | None = collection_name
+
+    def name(self) -> str:
+        return "Export Snapshot Command"
+
+
+class ImportSnapshotCmd(Command):
+    """
+    Encapsulates the restore of a snapshot bundle into `collection_name` (the exported one if None).
+
+    An existing collection is only replaced with `replace`, and is then deleted once the alias points
+    to the restored one.
+    """
+
+    def __init__(self, path: str, collection_name: str | None = None, replace: bool = False):
+        self.path: str = path
+        self.collection_name: str | None = collection_name
+        self.replace: bool = replace
+
+    def name(self) -> str:
+        return "Import Snapshot Command"
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from . import Command
+
+
+class WarmTextCacheCmd(Command):
+    """
+    Encapsulates a folder path or storage URL whose PDFs are parsed into the extracted-text cache,
+    without embedding anything, so later ingestions of the corpus skip parsing.
+
+    `shard_index` and `shard_count` split the work between nodes sharing the cache directory.
+    """
+
+    def __init__(self, url: str, recursive: bool = True, shard_index: int = 0, shard_count: int = 1):
+        self.url: str = url
+        self.recursive: bool = recursive
+        self.shard_index: int = shard_index
+        self.shard_count: int = shard_count
+
+    def name(self) -> str:
+        return "Warm Text Cache Command"
@@ -1,9 +1,5 @@
 from __future__ import annotations
 
-from collections.abc import Sequence
-
-from llama_index.core.schema import BaseNode
-
 from files_ingestor.application.commands import Command
 from files_ingestor.application.handlers.handler import Handler
 from files_ingestor.domain.services.file_processor_service import FileProcessorService
@@ -15,6 +11,6 @@ class IngestionHandler(Handler):
     def __init__(self, ingestor_service: FileProcessorService):
         self.ingestor = ingestor_service
 
-    def handle(self, cmd: Command) -> Sequence[BaseNode] | int:
-        """Handles the query and invokes the domain service."""
+    def handle(self, cmd: Command) -> int:
+        """Handles the query and invokes the domain service, returning the number of nodes or files processed."""
         return self.ingestor.process(cmd)
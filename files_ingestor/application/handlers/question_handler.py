@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from files_ingestor.application.queries.question_query import (
+    BatchQuestionQuery,
+    MultiCollectionRetrieveQuery,
+    RetrieveQuery,
+)
+from files_ingestor.domain.model.answer import QuestionAnswer, RetrievedNode
+from files_ingestor.domain.services.question_service import QuestionService
+
+
+class QuestionHandler:
+    """Handles the question queries"""
+
+    def __init__(self, question_service: QuestionService):
+        self.questions = question_service
+
+    def handle(self, query: BatchQuestionQuery | RetrieveQuery) -> list[QuestionAnswer] | list[RetrievedNode]:
+        """Handles the query and invokes the domain service, returning one answer per question or the chunks."""
+        match query:
+            case RetrieveQuery():
+                return self.questions.retrieve(query.query, query.collection_name, query.top_k, query.filters)
+            case BatchQuestionQuery():
+                return self.questions.ask_batch(
+                    query.questions,
+                    query.collection_name,
+                    query.top_k,
+                    query.max_concurrency,
+                    query.filters,
+                    query.response_mode,
+                    query.max_context_tokens,
+                )
+            case _:
+                raise ValueError(f"Unknown query type: {type(query)}")  # noqa: TRY003
+
+    async def ahandle(self, query: MultiCollectionRetrieveQuery) -> list[RetrievedNode]:
+        """Handles the queries served on the caller's event loop, where the async vector store client runs."""
+        return await self.questions.aretrieve_collections(
+            query.query, query.collection_names, query.top_k, query.filters, query.fusion
+        )
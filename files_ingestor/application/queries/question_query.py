@@ -1,8 +1,69 @@
 from __future__ import annotations
 
+from typing import Any
+
 
 class QuestionQuery:
     """Encapsulates input parameters for counting file operations."""
 
     def __init__(self, query: str):
         self.query = query
+
+
+class BatchQuestionQuery:
+    """Encapsulates several questions answered together over one collection (the default one if None)."""
+
+    def __init__(
+        self,
+        questions: list[str],
+        collection_name: str | None = None,
+        top_k: int | None = None,
+        max_concurrency: int | None = None,
+        filters: dict[str, Any] | None = None,
+        response_mode: str | None = None,
+        max_context_tokens: int | None = None,
+    ):
+        self.questions = questions
+        self.collection_name = collection_name
+        self.top_k = top_k
+        self.max_concurrency = max_concurrency
+        # Metadata values the retrieved nodes must have, e.g. {"source": "moby-dick.pdf"}
+        self.filters = filters
+        # Override the collection's query settings when set
+        self.response_mode = response_mode
+        self.max_context_tokens = max_context_tokens
+
+
+class RetrieveQuery:
+    """Encapsulates a query whose closest chunks are returned as they are, without an LLM answer."""
+
+    def __init__(
+        self,
+        query: str,
+        collection_name: str | None = None,
+        top_k: int | None = None,
+        filters: dict[str, Any] | None = None,
+    ):
+        self.query = query
+        self.collection_name = collection_name
+        self.top_k = top_k
+        self.filters = filters
+
+
+class MultiCollectionRetrieveQuery:
+    """Encapsulates a query searched in several collections at once (the agent's ones if None), results fused."""
+
+    def __init__(
+        self,
+        query: str,
+        collection_names: list[str] | None = None,
+        top_k: int | None = None,
+        filters: dict[str, Any] | None = None,
+        fusion: str | None = None,
+    ):
+        self.query = query
+        self.collection_names = collection_names
+        self.top_k = top_k
+        self.filters = filters
+        # "rrf" or "score", the configured method if None
+        self.fusion = fusion
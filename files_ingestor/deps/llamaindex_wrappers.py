@@ -1,45 +1,105 @@
-from typing import Callable
+from typing import Any, Callable, Optional
 
 from llama_index.core import VectorStoreIndex, get_response_synthesizer
+from llama_index.core.base.embeddings.base import BaseEmbedding
 from llama_index.core.indices.vector_store import VectorIndexAutoRetriever, VectorIndexRetriever
+from llama_index.core.postprocessor.types import BaseNodePostprocessor
 from llama_index.core.query_engine import RetrieverQueryEngine
 from llama_index.core.response_synthesizers import ResponseMode
 from llama_index.core.tools import QueryEngineTool, ToolMetadata
 
 # from llama_index.tools.database import DatabaseToolSpec
 # from llama_index.vector_stores.qdrant import QdrantVectorStore
-from llama_index.core.vector_stores import MetadataInfo, VectorStoreInfo
+from llama_index.core.vector_stores import (
+    FilterOperator,
+    MetadataFilter,
+    MetadataFilters,
+    MetadataInfo,
+    VectorStoreInfo,
+)
 from llama_index.core.vector_stores.types import BasePydanticVectorStore
 
+from files_ingestor.domain.model.query_settings import QuerySettings
+from files_ingestor.domain.model.vector_encoding import VectorEncoding
 from files_ingestor.domain.ports.embedding_model import EmbeddingModelPort
 from files_ingestor.domain.ports.llm import FunctionCallingLLMPort
 from files_ingestor.domain.ports.vectorstore import VectorStorePort
+from files_ingestor.domain.services.query_cache import QueryEmbeddingCache, cache_query_embeddings
+from files_ingestor.domain.services.question_service import ContextTokenLimit
+from files_ingestor.domain.services.vector_encoding import encode_embed_model
 
 # from files_ingestor.domain.ports.sql_repository import SQLRepositoryPort
 
 
 class LlamaIndexWrapper:
+    @staticmethod
+    def mk_embed_model(
+        collection_name: str,
+        vector_store: VectorStorePort,
+        embedding_model: EmbeddingModelPort,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+    ) -> BaseEmbedding:
+        """
+        Embeds queries in the space of the collection, truncating them to its vector size.
+
+        With a query cache, repeated questions are answered from it instead of the embedding backend;
+        the cache holds full vectors, so it is shared by collections of any size.
+        """
+        vector_size = vector_store.get_vector_size(collection_name)
+        embed_model = cache_query_embeddings(embedding_model.get_model(), query_cache)
+        return encode_embed_model(embed_model, VectorEncoding(dimensions=vector_size))
+
     @staticmethod
     def mk_index(
-        collection_name: str, vector_store: VectorStorePort, embedding_model: EmbeddingModelPort
+        collection_name: str,
+        vector_store: VectorStorePort,
+        embedding_model: EmbeddingModelPort,
+        query_cache: Optional[QueryEmbeddingCache] = None,
     ) -> VectorStoreIndex:
         qdrant_vector_store: BasePydanticVectorStore = vector_store.get_vector_store(collection_name)
         # storage_context = StorageContext.from_defaults(vector_store=qdrant_vector_store)
         index = VectorStoreIndex.from_vector_store(
             vector_store=qdrant_vector_store,
-            embed_model=embedding_model.get_model(),
+            embed_model=LlamaIndexWrapper.mk_embed_model(collection_name, vector_store, embedding_model, query_cache),
             show_progress=True,
             use_async=False,
         )
         return index
 
+    @staticmethod
+    def mk_metadata_filters(filters: Optional[dict[str, Any]]) -> Optional[MetadataFilters]:
+        """
+        Builds the filters of a scoped query from metadata values, e.g. {"source": "moby-dick.pdf"}.
+
+        Every field must match; a list matches any of its values. Declare the fields in the collection's
+        `payload_indexes` config so the filtered search does not scan the whole collection.
+        """
+        if not filters:
+            return None
+        return MetadataFilters(
+            filters=[
+                MetadataFilter(key=key, value=value, operator=FilterOperator.IN)
+                if isinstance(value, list)
+                else MetadataFilter(key=key, value=value, operator=FilterOperator.EQ)
+                for key, value in filters.items()
+            ]
+        )
+
     @staticmethod
     def mk_vector_retriever(
-        collection_name: str, similarity_top_k: int, vector_store: VectorStorePort, embedding_model: EmbeddingModelPort
+        collection_name: str,
+        similarity_top_k: int,
+        vector_store: VectorStorePort,
+        embedding_model: EmbeddingModelPort,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+        filters: Optional[dict[str, Any]] = None,
     ) -> VectorIndexRetriever:
-        index = LlamaIndexWrapper.mk_index(collection_name, vector_store, embedding_model)
+        index = LlamaIndexWrapper.mk_index(collection_name, vector_store, embedding_model, query_cache)
         retriever = VectorIndexRetriever(
-            index=index, similarity_top_k=similarity_top_k, embed_model=embedding_model.get_model()
+            index=index,
+            similarity_top_k=similarity_top_k,
+            embed_model=index._embed_model,
+            filters=LlamaIndexWrapper.mk_metadata_filters(filters),
         )
         return retriever
 
@@ -86,25 +146,49 @@ class LlamaIndexWrapper:
         vector_store: VectorStorePort,
         embedding_model: EmbeddingModelPort,
         llm: FunctionCallingLLMPort,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+        filters: Optional[dict[str, Any]] = None,
+        settings: Optional[QuerySettings] = None,
     ) -> tuple[RetrieverQueryEngine, VectorIndexRetriever]:
-        retriever = LlamaIndexWrapper.mk_vector_retriever(collection_name, topk, vector_store, embedding_model)
+        """
+        Builds a query engine answering with the `response_mode` of `settings` (tree_summarize by default),
+        on at most `max_context_tokens` of retrieved text.
+        """
+        settings = settings or QuerySettings()
+        retriever = LlamaIndexWrapper.mk_vector_retriever(
+            collection_name, topk, vector_store, embedding_model, query_cache, filters
+        )
         response_synthesizer = get_response_synthesizer(
-            response_mode=ResponseMode.TREE_SUMMARIZE, llm=llm.get_model("llamaindex"), verbose=True
+            response_mode=ResponseMode(settings.response_mode), llm=llm.get_model("llamaindex"), verbose=True
         )
+        node_postprocessors: list[BaseNodePostprocessor] = []
+        if settings.max_context_tokens is not None:
+            node_postprocessors.append(ContextTokenLimit(max_tokens=settings.max_context_tokens))
         return RetrieverQueryEngine(
             retriever=retriever,
             response_synthesizer=response_synthesizer,
+            node_postprocessors=node_postprocessors,
         ), retriever
 
     @staticmethod
     def create_retrieval_tool(
-        vector_store: VectorStorePort, embedding_model: EmbeddingModelPort, llm: FunctionCallingLLMPort
-    ) -> Callable[[str, str, int], QueryEngineTool]:
-        # collection_name: str, tool_description: str, topk: int)
+        vector_store: VectorStorePort,
+        embedding_model: EmbeddingModelPort,
+        llm: FunctionCallingLLMPort,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+    ) -> Callable[..., QueryEngineTool]:
+        # collection_name: str, tool_description: str, topk: int, filters: Optional[dict[str, Any]] = None,
+        # settings: Optional[QuerySettings] = None)
 
-        def _mk_tool(collection_name: str, tool_description: str, topk: int) -> QueryEngineTool:
+        def _mk_tool(
+            collection_name: str,
+            tool_description: str,
+            topk: int,
+            filters: Optional[dict[str, Any]] = None,
+            settings: Optional[QuerySettings] = None,
+        ) -> QueryEngineTool:
             query_engine, _ = LlamaIndexWrapper.create_query_engine(
-                collection_name, topk, vector_store, embedding_model, llm
+                collection_name, topk, vector_store, embedding_model, llm, query_cache, filters, settings
             )
 
             return QueryEngineTool(
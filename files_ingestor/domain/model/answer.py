@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class QuestionAnswer:
+    """
+    Answer to one question of a batch, with the chunks it was synthesized from and where its time went.
+
+    `timings` holds `embed_seconds` and `search_seconds` (shared by the whole batch, since all questions
+    are embedded and searched together), `queue_seconds` waiting for a synthesis slot,
+    `synthesis_seconds` and `total_seconds` from the start of the batch.
+    """
+
+    question: str
+    answer: str | None
+    sources: list[dict[str, Any]] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+    # Served from the answer cache rather than synthesized
+    cached: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "question": self.question,
+            "answer": self.answer,
+            "sources": self.sources,
+            "timings": self.timings,
+            "error": self.error,
+            "cached": self.cached,
+        }
+
+
+@dataclass
+class RetrievedNode:
+    """A chunk retrieved for a query, with its similarity score."""
+
+    node_id: str
+    score: float | None
+    text: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"node_id": self.node_id, "score": self.score, "text": self.text, "metadata": self.metadata}
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Any
+
+from files_ingestor.domain.model.shard import Shard
+
+
+class IngestionCheckpoint:
+    """
+    Durable progress record for a cloud storage ingestion.
+
+    Keeps the listing continuation token of the page being processed and the keys already
+    ingested from that page. Keys of earlier pages are covered by the token, so the record
+    stays small no matter how many objects live under the prefix.
+    """
+
+    def __init__(self, path: str, url: str, recursive: bool):
+        self.path = path
+        self.url = url
+        self.recursive = recursive
+        self.continuation_token: str | None = None
+        self.completed: set[str] = set()
+        self.processed: int = 0
+        self.finished: bool = False
+
+    @staticmethod
+    def default_path(checkpoint_dir: str, url: str, recursive: bool, shard: Shard | None = None) -> str:
+        """Builds a stable checkpoint file path for the given URL, listing mode and shard."""
+        key = f"{url}|{recursive}"
+        if shard is not None and not shard.is_whole:
+            # Shards of one corpus may share the checkpoint directory
+            key = f"{key}|{shard.index}/{shard.count}"
+        digest = hashlib.sha1(key.encode(), usedforsecurity=False).hexdigest()
+        return os.path.join(checkpoint_dir, f"{digest}.json")
+
+    @classmethod
+    def load(cls, path: str, url: str, recursive: bool) -> IngestionCheckpoint:
+        """
+        Loads a checkpoint from disk, or returns an empty one if there is none.
+
+        Raises:
+            ValueError: If the stored checkpoint belongs to a different ingestion
+        """
+        checkpoint = cls(path, url, recursive)
+        if not os.path.exists(path):
+            return checkpoint
+
+        with open(path) as f:
+            data: dict[str, Any] = json.load(f)
+
+        if data.get("url") != url or data.get("recursive") != recursive:
+            raise ValueError(f"Checkpoint {path} belongs to {data.get('url')}, not {url}")  # noqa: TRY003
+
+        checkpoint.continuation_token = data.get("continuation_token")
+        checkpoint.completed = set(data.get("completed", []))
+        checkpoint.processed = data.get("processed", 0)
+        checkpoint.finished = data.get("finished", False)
+        return checkpoint
+
+    def is_done(self, key: str) -> bool:
+        return key in self.completed
+
+    def mark_done(self, key: str) -> None:
+        self.completed.add(key)
+        self.processed += 1
+
+    def advance(self, continuation_token: str | None) -> None:
+        """Moves the checkpoint to the next listing page and persists it."""
+        self.continuation_token = continuation_token
+        self.completed = set()
+        self.save()
+
+    def finish(self) -> None:
+        self.finished = True
+        self.save()
+
+    def save(self) -> None:
+        """Writes the checkpoint atomically, so a crash never leaves a truncated file."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {
+            "url": self.url,
+            "recursive": self.recursive,
+            "continuation_token": self.continuation_token,
+            "completed": sorted(self.completed),
+            "processed": self.processed,
+            "finished": self.finished,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+
+class CollectionMigration:
+    """
+    Progress of a blue/green migration of a collection into a new versioned one.
+
+    Keeps the hash of the version of each page document embedded into the target, so successive
+    passes only embed what was ingested or changed since and remove what was deleted.
+    """
+
+    def __init__(self, collection_name: str, target: str):
+        self.collection_name = collection_name
+        self.target = target
+        self.hashes: dict[str, str] = {}
+        self.node_ids: dict[str, list[str]] = {}
+        self.pages = 0
+
+    @staticmethod
+    def next_version(collection_name: str, existing: Iterable[str]) -> str:
+        """Returns the name of the next version of a collection, `<name>-v<n>` (a plain `<name>` counts as v0)."""
+        pattern = re.compile(rf"{re.escape(collection_name)}-v(\d+)")
+        versions = [int(match.group(1)) for name in existing if (match := pattern.fullmatch(name))]
+        return f"{collection_name}-v{max(versions, default=0) + 1}"
+
+    def plan(self, current: dict[str, tuple[str, str]]) -> tuple[list[str], dict[str, list[str]]]:
+        """
+        Compares the documents currently indexed (doc id: (source, hash)) with the migrated ones.
+
+        Returns:
+            tuple: IDs of the documents to remove from the target (deleted or changed since they were
+            migrated) and IDs of the documents to embed, by source
+        """
+        current_hashes = {doc_id: doc_hash for doc_id, (_, doc_hash) in current.items()}
+        stale = [doc_id for doc_id, doc_hash in self.hashes.items() if current_hashes.get(doc_id) != doc_hash]
+        to_embed: dict[str, list[str]] = {}
+        for doc_id, (source, doc_hash) in current.items():
+            if self.hashes.get(doc_id) != doc_hash:
+                to_embed.setdefault(source, []).append(doc_id)
+        return stale, to_embed
+
+    def record(self, doc_id: str, doc_hash: str, node_ids: list[str]) -> None:
+        self.hashes[doc_id] = doc_hash
+        self.node_ids[doc_id] = node_ids
+        self.pages += 1
+
+    def forget(self, doc_ids: Iterable[str]) -> list[str]:
+        """Drops migrated documents, returning the IDs of their nodes in the target."""
+        node_ids = []
+        for doc_id in doc_ids:
+            self.hashes.pop(doc_id, None)
+            node_ids.extend(self.node_ids.pop(doc_id, []))
+        return node_ids
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Any
+
+from files_ingestor.domain.ports.config import ConfigPort
+
+# Fewest LLM calls first: no_text makes none, compact packs the chunks into as few prompts as fit,
+# refine makes one call per chunk and tree_summarize several rounds of them
+RESPONSE_MODES = ("no_text", "compact", "refine", "tree_summarize")
+
+
+@dataclass(frozen=True)
+class QuerySettings:
+    """How questions over a collection are answered, trading answer quality for latency.
+
+    `similarity_top_k` chunks are retrieved and synthesized into an answer with `response_mode`.
+    `max_context_tokens` caps the text of the chunks passed to the LLM, dropping the lowest scored
+    ones beyond it; None passes them all.
+    """
+
+    similarity_top_k: int = 5
+    response_mode: str = "tree_summarize"
+    max_context_tokens: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.response_mode not in RESPONSE_MODES:
+            raise ValueError(f"Unknown response mode: {self.response_mode}")  # noqa: TRY003
+        if self.similarity_top_k <= 0:
+            raise ValueError(f"similarity_top_k must be positive: {self.similarity_top_k}")  # noqa: TRY003
+
+    @classmethod
+    def from_config(cls, config: ConfigPort, collection_name: str) -> QuerySettings:
+        """Reads the collection's `query` settings, falling back to the global `query` ones."""
+        query_key = f"vectorstore.qdrant.collections.{collection_name}.query"
+
+        def get(name: str, default: Any) -> Any:
+            return config.get(f"{query_key}.{name}", config.get(f"query.{name}", default))
+
+        return cls(
+            similarity_top_k=get("similarity_top_k", 5),
+            response_mode=get("response_mode", "tree_summarize"),
+            max_context_tokens=get("max_context_tokens", 0) or None,
+        )
+
+    def override(
+        self,
+        similarity_top_k: int | None = None,
+        response_mode: str | None = None,
+        max_context_tokens: int | None = None,
+    ) -> QuerySettings:
+        """Applies the settings of a request, those it leaves as None keep their configured value."""
+        return replace(
+            self,
+            similarity_top_k=similarity_top_k or self.similarity_top_k,
+            response_mode=response_mode or self.response_mode,
+            max_context_tokens=max_context_tokens or self.max_context_tokens,
+        )
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    Static slice of an ingestion run: the files whose source key hashes to `index` modulo `count`.
+
+    Assignment only depends on the key, so N nodes given indexes 0..N-1 ingest disjoint slices of
+    the same corpus without a coordinator, and a rerun of a node picks exactly the same files.
+    """
+
+    index: int = 0
+    count: int = 1
+
+    def __post_init__(self) -> None:
+        if self.count < 1 or not 0 <= self.index < self.count:
+            raise ValueError(f"Invalid shard {self.index} of {self.count}")  # noqa: TRY003
+
+    @property
+    def is_whole(self) -> bool:
+        return self.count == 1
+
+    def owns(self, key: str) -> bool:
+        if self.is_whole:
+            return True
+        digest = hashlib.sha1(key.encode(), usedforsecurity=False).digest()
+        return int.from_bytes(digest[:8], "big") % self.count == self.index
+
+    def __str__(self) -> str:
+        return f"shard {self.index}/{self.count}"
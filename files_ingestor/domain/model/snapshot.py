@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import base64
+import contextlib
+import gzip
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import uuid
+from array import array
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+FORMAT_VERSION = 1
+
+
+@dataclass
+class SnapshotManifest:
+    """Describes a snapshot bundle: the collection it holds and the embedding model its vectors come from."""
+
+    collection_name: str
+    embedding_model: str
+    vector_size: int
+    datatype: str = "float32"
+    points: int = 0
+    # Docstore files in the bundle, by role (e.g. "docstore.json")
+    files: list[str] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+    format_version: int = FORMAT_VERSION
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SnapshotManifest:
+        if data.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format version {data.get('format_version')}")  # noqa: TRY003
+        return cls(**data)
+
+
+def encode_point(point: dict[str, Any]) -> dict[str, Any]:
+    """Serializes a point ({"id", "vector", "payload"}), its vector as base64 float32, the vector store precision."""
+    vector = point["vector"]
+    if not isinstance(vector, list):
+        raise TypeError(f"Point {point['id']} has named vectors, which snapshots do not support")  # noqa: TRY003
+    encoded = base64.b64encode(array("f", vector).tobytes()).decode()
+    return {"id": point["id"], "vector": encoded, "payload": point["payload"]}
+
+
+def decode_point(data: dict[str, Any]) -> dict[str, Any]:
+    vector = array("f")
+    vector.frombytes(base64.b64decode(data["vector"]))
+    return {"id": data["id"], "vector": vector.tolist(), "payload": data["payload"]}
+
+
+class SnapshotWriter:
+    """
+    Writes a snapshot bundle: a tar file with `manifest.json`, the points in `points.jsonl.gz` and the
+    docstore files under `store/`.
+
+    Points are streamed to a temp file next to the bundle; the bundle only replaces `path` once complete.
+    """
+
+    MANIFEST = "manifest.json"
+    POINTS = "points.jsonl.gz"
+    STORE = "store"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.points = 0
+        self.files: dict[str, str] = {}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._tmp_dir = tempfile.mkdtemp(prefix=".snapshot-", dir=os.path.dirname(path) or ".")
+        self._points_path = os.path.join(self._tmp_dir, self.POINTS)
+        with contextlib.ExitStack() as stack:
+            stack.callback(shutil.rmtree, self._tmp_dir, ignore_errors=True)
+            self._points_file = stack.enter_context(gzip.open(self._points_path, "wt", encoding="utf-8"))
+            # Closed, and the temp dir removed, by close()
+            self._resources = stack.pop_all()
+
+    def __enter__(self) -> SnapshotWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def add_points(self, points: list[dict[str, Any]]) -> None:
+        for point in points:
+            self._points_file.write(json.dumps(encode_point(point), separators=(",", ":")) + "\n")
+        self.points += len(points)
+
+    def add_file(self, relative_path: str, local_path: str) -> None:
+        self.files[relative_path] = local_path
+
+    def finish(self, manifest: SnapshotManifest) -> None:
+        """Writes the bundle, filling in the point count and file list of the manifest."""
+        self._points_file.close()
+        manifest.points = self.points
+        manifest.files = sorted(self.files)
+        manifest_path = os.path.join(self._tmp_dir, self.MANIFEST)
+        with open(manifest_path, "w") as f:
+            json.dump(manifest.to_dict(), f, indent=2)
+
+        tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        with tarfile.open(tmp_path, "w") as tar:
+            tar.add(manifest_path, arcname=self.MANIFEST)
+            tar.add(self._points_path, arcname=self.POINTS)
+            for relative_path, local_path in sorted(self.files.items()):
+                tar.add(local_path, arcname=f"{self.STORE}/{relative_path}")
+        os.replace(tmp_path, self.path)
+
+    def close(self) -> None:
+        self._resources.close()
+
+
+class SnapshotReader:
+    """Reads a bundle written by SnapshotWriter."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with contextlib.ExitStack() as stack:
+            self._tar = stack.enter_context(tarfile.open(path, "r"))
+            self.manifest = SnapshotManifest.from_dict(json.load(self._member(SnapshotWriter.MANIFEST)))
+            # Only kept open once the manifest is valid
+            self._resources = stack.pop_all()
+
+    def __enter__(self) -> SnapshotReader:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._resources.close()
+
+    def _member(self, name: str) -> Any:
+        member = self._tar.extractfile(name)
+        if member is None:
+            raise ValueError(f"Snapshot {self.path} has no {name}")  # noqa: TRY003
+        return member
+
+    def points(self, batch_size: int = 256) -> Iterator[list[dict[str, Any]]]:
+        batch = []
+        with gzip.open(self._member(SnapshotWriter.POINTS), "rt", encoding="utf-8") as f:
+            for line in f:
+                batch.append(decode_point(json.loads(line)))
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def extract_file(self, relative_path: str, dest_path: str) -> None:
+        """Restores a docstore file of the bundle to `dest_path`, replacing it atomically."""
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        tmp_path = f"{dest_path}.{uuid.uuid4().hex}.tmp"
+        with self._member(f"{SnapshotWriter.STORE}/{relative_path}") as src, open(tmp_path, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, dest_path)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import os
+
+
+class SourceIndex:
+    """
+    Maps each ingested source (file path or storage URL) to its page documents and their node IDs.
+
+    Persisted next to the docstore, so a source can be deleted or replaced without scanning
+    the vector store.
+    """
+
+    FILE_NAME = "source_index.json"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.sources: dict[str, dict[str, list[str]]] = {}
+
+    @classmethod
+    def load(cls, persist_dir: str) -> SourceIndex:
+        index = cls(os.path.join(persist_dir, cls.FILE_NAME))
+        if os.path.exists(index.path):
+            with open(index.path) as f:
+                index.sources = json.load(f)
+        return index
+
+    def doc_ids(self, source: str) -> list[str]:
+        return list(self.sources.get(source, {}))
+
+    def node_ids(self, source: str) -> list[str]:
+        return [node_id for node_ids in self.sources.get(source, {}).values() for node_id in node_ids]
+
+    def update(self, source: str, doc_ids: list[str], nodes_by_doc: dict[str, list[str]]) -> list[str]:
+        """
+        Records the documents of a new ingestion of `source`.
+
+        Documents skipped by the pipeline because they did not change keep their previous nodes.
+
+        Returns:
+            list[str]: IDs of documents indexed for the source earlier but missing from this ingestion
+        """
+        documents = self.sources.setdefault(source, {})
+        for doc_id in doc_ids:
+            documents.setdefault(doc_id, [])
+        documents.update(nodes_by_doc)
+        current = set(doc_ids)
+        return [doc_id for doc_id in documents if doc_id not in current]
+
+    def remove(self, source: str, doc_ids: list[str] | None = None) -> dict[str, list[str]]:
+        """Removes some (or all) documents of a source, returning their node IDs by document."""
+        documents = self.sources.get(source, {})
+        doc_ids = list(documents) if doc_ids is None else doc_ids
+        removed = {doc_id: documents.pop(doc_id) for doc_id in doc_ids if doc_id in documents}
+        if not documents:
+            self.sources.pop(source, None)
+        return removed
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.sources, f)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import fnmatch
+from dataclasses import dataclass
+
+GLOB_CHARS = "*?["
+
+
+@dataclass(frozen=True)
+class StorageEntry:
+    """A file listed from a storage backend, with the metadata the listing already provides.
+
+    `page_token` is the continuation token that lists the page the entry came from
+    (None for the first page or for backends without paginated listings).
+    """
+
+    url: str
+    size: int
+    etag: str | None = None
+    mtime: float | None = None
+    page_token: str | None = None
+
+
+@dataclass(frozen=True)
+class FileChange:
+    """A debounced change to a watched file. `kind` is one of "created", "modified" or "deleted"."""
+
+    url: str
+    kind: str
+
+    @property
+    def deleted(self) -> bool:
+        return self.kind == "deleted"
+
+
+def literal_prefix(pattern: str) -> str:
+    """Returns the part of a glob pattern before its first wildcard."""
+    for i, char in enumerate(pattern):
+        if char in GLOB_CHARS:
+            return pattern[:i]
+    return pattern
+
+
+def matches_filters(name: str, suffix: str | None = None, pattern: str | None = None) -> bool:
+    """Checks a name relative to the listed location against a case-insensitive suffix and a glob."""
+    if suffix is not None and not name.lower().endswith(suffix.lower()):
+        return False
+    return pattern is None or fnmatch.fnmatchcase(name, pattern)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import contextlib
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import uuid
+from typing import Any, BinaryIO
+
+
+def content_digest(data: bytes | BinaryIO) -> str:
+    """SHA-256 of a PDF, read in blocks when given a file."""
+    digest = hashlib.sha256()
+    if isinstance(data, bytes):
+        digest.update(data)
+    else:
+        for block in iter(lambda: data.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExtractedTextCache:
+    """
+    Content-addressed store of the text and metadata extracted from PDFs, gzip-compressed on disk.
+
+    Entries are keyed by the SHA-256 of the PDF and live under a directory per extractor version, so
+    upgrading the parser never serves stale text; old versions age out through eviction. Reads touch
+    the entry, and once the store outgrows `max_bytes` the least recently used entries are removed
+    down to `low_watermark` of the limit.
+    """
+
+    SUFFIX = ".json.gz"
+
+    def __init__(
+        self,
+        path: str,
+        extractor_version: str,
+        max_bytes: int = 4 * 1024**3,
+        compress_level: int = 6,
+        low_watermark: float = 0.9,
+    ):
+        self.path = path
+        self.extractor_version = extractor_version
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+        self.low_watermark = low_watermark
+        self.hits = 0
+        self.misses = 0
+        self._size: int | None = None
+        self._lock = threading.Lock()
+
+    def entry_path(self, digest: str) -> str:
+        version_dir = re.sub(r"[^A-Za-z0-9_.-]", "_", self.extractor_version)
+        return os.path.join(self.path, version_dir, digest[:2], f"{digest}{self.SUFFIX}")
+
+    def get(self, digest: str) -> list[dict[str, Any]] | None:
+        """Returns the cached pages (`{"text", "metadata"}` dicts) of a PDF, None on a miss."""
+        entry_path = self.entry_path(digest)
+        try:
+            with gzip.open(entry_path, "rt", encoding="utf-8") as f:
+                pages: list[dict[str, Any]] = json.load(f)
+            os.utime(entry_path)
+        except FileNotFoundError:
+            self._count(hit=False)
+            return None
+        except (OSError, ValueError):
+            # A truncated or corrupt entry is dropped and extracted again
+            self._remove(entry_path)
+            self._count(hit=False)
+            return None
+        self._count(hit=True)
+        return pages
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def put(self, digest: str, pages: list[dict[str, Any]]) -> None:
+        entry_path = self.entry_path(digest)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        # Unique temp names let concurrent writers of the same PDF race harmlessly
+        tmp_path = f"{entry_path}.{uuid.uuid4().hex}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=self.compress_level) as f:
+            json.dump(pages, f, separators=(",", ":"), default=str)
+        size = os.path.getsize(tmp_path)
+        previous = os.path.getsize(entry_path) if os.path.exists(entry_path) else 0
+        os.replace(tmp_path, entry_path)
+
+        with self._lock:
+            self._size = self._scan_size() if self._size is None else self._size + size - previous
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def __contains__(self, digest: str) -> bool:
+        return os.path.exists(self.entry_path(digest))
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            return self._size
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for root, _, files in os.walk(self.path):
+            for file in files:
+                if file.endswith(self.SUFFIX):
+                    try:
+                        stat = os.stat(os.path.join(root, file))
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, os.path.join(root, file)))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        """Removes the least recently used entries until the store is back under the low watermark."""
+        entries = sorted(self._entries())
+        self._size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * self.low_watermark
+        for _, size, entry_path in entries:
+            if self._size <= target:
+                break
+            self._remove(entry_path)
+            self._size -= size
+
+    @staticmethod
+    def _remove(entry_path: str) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(entry_path)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import math
+import struct
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from files_ingestor.domain.ports.config import ConfigPort
+
+DATATYPE_BYTES = {"float32": 4, "float16": 2, "int8": 1}
+
+
+@dataclass(frozen=True)
+class VectorEncoding:
+    """How the vectors of a collection are stored.
+
+    `dimensions` keeps only the leading components of each embedding (Matryoshka-style truncation,
+    re-normalized); None keeps the model output as is. `datatype` is the precision the vector store
+    searches on: "float16" vectors are stored at half precision, "int8" vectors are scalar quantized
+    in RAM with the originals kept on disk for rescoring.
+    """
+
+    dimensions: int | None = None
+    datatype: str = "float32"
+
+    def __post_init__(self) -> None:
+        if self.datatype not in DATATYPE_BYTES:
+            raise ValueError(f"Unknown vector datatype: {self.datatype}")  # noqa: TRY003
+        if self.dimensions is not None and self.dimensions <= 0:
+            raise ValueError(f"Vector dimensions must be positive: {self.dimensions}")  # noqa: TRY003
+
+    @classmethod
+    def from_config(cls, config: ConfigPort, collection_name: str) -> VectorEncoding:
+        vectors_key = f"vectorstore.qdrant.collections.{collection_name}.vectors"
+        return cls(
+            dimensions=config.get(f"{vectors_key}.dimensions", 0) or None,
+            datatype=config.get(f"{vectors_key}.datatype", "float32"),
+        )
+
+    @property
+    def is_default(self) -> bool:
+        return self.dimensions is None and self.datatype == "float32"
+
+    def truncate(self, vector: Sequence[float]) -> list[float]:
+        """Keeps the leading `dimensions` components, re-normalized to unit length."""
+        if self.dimensions is None or self.dimensions >= len(vector):
+            return list(vector)
+        head = vector[: self.dimensions]
+        norm = math.sqrt(sum(value * value for value in head)) or 1.0
+        return [value / norm for value in head]
+
+    def quantize(self, vector: Sequence[float]) -> list[float]:
+        """Rounds a vector to the precision it is searched on, as an estimate of the store's behaviour."""
+        if self.datatype == "float16":
+            return list(struct.unpack(f"{len(vector)}e", struct.pack(f"{len(vector)}e", *vector)))
+        if self.datatype == "int8":
+            scale = max((abs(value) for value in vector), default=0.0) / 127 or 1.0
+            return [round(value / scale) * scale for value in vector]
+        return list(vector)
+
+    def encode(self, vector: Sequence[float]) -> list[float]:
+        return self.quantize(self.truncate(vector))
+
+    def bytes_per_vector(self, model_dimensions: int) -> int:
+        """Size of one vector in the searched (in-memory) representation."""
+        dimensions = min(self.dimensions or model_dimensions, model_dimensions)
+        return dimensions * DATATYPE_BYTES[self.datatype]
+
+    def __str__(self) -> str:
+        return f"{self.dimensions or 'full'}d/{self.datatype}"
+
+    @classmethod
+    def parse(cls, text: str) -> VectorEncoding:
+        """Parses the "<dimensions|full>d/<datatype>" form used on the command line, e.g. "512d/int8"."""
+        dimensions, _, datatype = text.partition("/")
+        dimensions = dimensions.removesuffix("d")
+        return cls(dimensions=None if dimensions == "full" else int(dimensions), datatype=datatype or "float32")
@@ -1,5 +1,9 @@
+import threading
 from abc import abstractmethod
-from typing import Protocol
+from collections.abc import Iterator
+from typing import Optional, Protocol
+
+from files_ingestor.domain.model.storage_entry import FileChange, StorageEntry
 
 
 class CloudStoragePort(Protocol):
@@ -22,6 +26,24 @@ class CloudStoragePort(Protocol):
         """
         pass
 
+    @abstractmethod
+    def read_bytes(self, url: str) -> bytes:
+        """Reads a whole file from cloud storage into memory.
+
+        Meant for objects small enough to be parsed straight from a buffer.
+
+        Args:
+            url: The cloud storage URL (s3://, file://, etc.)
+
+        Returns:
+            bytes: Content of the file
+
+        Raises:
+            ValueError: If URL is invalid or file not found
+            IOError: If download fails
+        """
+        pass
+
     @abstractmethod
     def list_files(self, url: str, recursive: bool = False) -> list[str]:
         """Lists files in a cloud storage path.
@@ -39,6 +61,75 @@ class CloudStoragePort(Protocol):
         """
         pass
 
+    @abstractmethod
+    def iter_files(
+        self,
+        url: str,
+        recursive: bool = False,
+        suffix: Optional[str] = None,
+        pattern: Optional[str] = None,
+        continuation_token: Optional[str] = None,
+    ) -> Iterator[StorageEntry]:
+        """Lazily lists files in a cloud storage path, page by page.
+
+        Filters are pushed down to the backend as far as it allows, the rest is applied
+        while iterating, so the first entries are available before the listing completes.
+
+        Args:
+            url: The cloud storage URL (s3://, file://, etc.)
+            recursive: Whether to list files recursively
+            suffix: Case-insensitive suffix the file names must end with (e.g. ".pdf")
+            pattern: Glob pattern matched against the path relative to the URL
+            continuation_token: Token of the page to start listing from, None for the first one
+
+        Yields:
+            StorageEntry: Listed file with its size, ETag, mtime and page token
+
+        Raises:
+            ValueError: If URL is invalid
+            IOError: If listing fails
+        """
+        pass
+
+    def local_path(self, url: str) -> Optional[str]:
+        """Returns a filesystem path the file can be read from in place, if the backend has one.
+
+        Args:
+            url: The cloud storage URL (s3://, file://, etc.)
+
+        Returns:
+            Optional[str]: Local path of the file, None if it has to be downloaded first
+        """
+        return None
+
+    def watch(
+        self,
+        url: str,
+        recursive: bool = True,
+        suffix: Optional[str] = None,
+        debounce_seconds: float = 2.0,
+        poll_interval: float = 5.0,
+        stop_event: Optional[threading.Event] = None,
+    ) -> Iterator[list[FileChange]]:
+        """Watches a storage path and yields batches of debounced file changes until stopped.
+
+        Args:
+            url: The storage URL to watch
+            recursive: Whether to watch subfolders too
+            suffix: Case-insensitive suffix the file names must end with (e.g. ".pdf")
+            debounce_seconds: Quiet period a file needs before its change is reported
+            poll_interval: Seconds between scans when the backend has to poll
+            stop_event: Event that ends the watch when set
+
+        Yields:
+            list[FileChange]: Files whose changes settled, with their last change kind
+
+        Raises:
+            ValueError: If the backend cannot be watched
+        """
+        # Watching is an optional capability: a concrete default keeps adapters without it instantiable
+        raise ValueError(f"Watching is not supported for {url}")  # noqa: TRY003
+
     @abstractmethod
     def is_cloud_url(self, url: str) -> bool:
         """
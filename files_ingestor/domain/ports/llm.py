@@ -5,6 +5,7 @@ from llama_index.core.llms.function_calling import FunctionCallingLLM
 
 class FunctionCallingLLMPort(ABC):
     __SUPPORTED_LIBRARIES = property(lambda self: ["llamaindex", "langchain"])
+    model_name: str
 
     @abstractmethod
     def get_model(self, library: str) -> FunctionCallingLLM: ...
@@ -1,4 +1,21 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+# Fields (job, file, ...) describing the work in progress, for adapters that emit structured records
+LOG_CONTEXT: ContextVar[dict[str, Any]] = ContextVar("log_context", default={})  # noqa: B039
+
+
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """Adds fields to the context of every message logged within the block, in this thread or task."""
+    token = LOG_CONTEXT.set({**LOG_CONTEXT.get(), **fields})
+    try:
+        yield
+    finally:
+        LOG_CONTEXT.reset(token)
 
 
 class LoggerPort(ABC):
@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from typing import Any, Optional
 
+from llama_index.core.schema import NodeWithScore
 from llama_index.core.vector_stores.types import BasePydanticVectorStore
 
 
@@ -10,3 +13,37 @@ class VectorStorePort(ABC):
     def get_collections(self) -> list[str]: ...
     @abstractmethod
     def get_vector_store(self, collection_name: str) -> BasePydanticVectorStore: ...
+    @abstractmethod
+    def delete_documents(self, collection_name: str, ref_doc_ids: list[str]) -> None: ...
+    @abstractmethod
+    def create_collection(self, collection_name: str, vector_size: int, datatype: str = "float32") -> None: ...
+    @abstractmethod
+    def get_vector_size(self, collection_name: str) -> Optional[int]: ...
+    @abstractmethod
+    def resolve_collection(self, collection_name: str) -> str: ...
+    @abstractmethod
+    def swap_alias(self, alias: str, collection_name: str, replace_collection: bool = False) -> Optional[str]: ...
+    @abstractmethod
+    def delete_collection(self, collection_name: str) -> None: ...
+    @abstractmethod
+    def scroll_points(self, collection_name: str, batch_size: int = 256) -> Iterator[list[dict[str, Any]]]: ...
+    @abstractmethod
+    def upsert_points(self, collection_name: str, points: list[dict[str, Any]]) -> None: ...
+    @abstractmethod
+    def create_payload_indexes(self, collection_name: str, fields: dict[str, str]) -> None: ...
+    @abstractmethod
+    def search_batch(
+        self,
+        collection_name: str,
+        vectors: list[list[float]],
+        top_k: int,
+        filters: Optional[dict[str, Any]] = None,
+    ) -> list[list[NodeWithScore]]: ...
+    @abstractmethod
+    async def asearch_batch(
+        self,
+        collection_name: str,
+        vectors: list[list[float]],
+        top_k: int,
+        filters: Optional[dict[str, Any]] = None,
+    ) -> list[list[NodeWithScore]]: ...
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, Callable, TypeVar
+
+from files_ingestor.domain.ports.config import ConfigPort
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = frozenset({408, 425, 429})
+
+# Client libraries raise their own timeout and connection errors; adapters register them here
+_overload_errors: list[type[BaseException]] = [TimeoutError, ConnectionError]
+
+
+def register_overload_errors(*error_types: type[BaseException]) -> None:
+    """Declares exceptions of a backend client that mean a timeout or a dropped connection."""
+    _overload_errors.extend(error_type for error_type in error_types if error_type not in _overload_errors)
+
+
+def is_overload(error: BaseException) -> bool:
+    """Tells whether a failed call means the backend is overloaded (429/5xx, timeout or dropped connection)."""
+    if isinstance(error, tuple(_overload_errors)):
+        return True
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return isinstance(status, int) and (status in RETRYABLE_STATUS or status >= 500)
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit that adapts to the backend, additive-increase / multiplicative-decrease.
+
+    Every call completing within `latency_tolerance` times the best latency seen raises the limit
+    by about one per limit-many calls; slower calls shrink it by `latency_backoff` and overload
+    responses (429, 5xx, timeouts) halve it. Callers beyond the current limit wait for a slot.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = 4,
+        min_limit: float = 1,
+        max_limit: float = 64,
+        latency_tolerance: float = 2.0,
+        latency_backoff: float = 0.9,
+        overload_backoff: float = 0.5,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.latency_backoff = latency_backoff
+        self.overload_backoff = overload_backoff
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._baseline: float | None = None
+        self._condition = threading.Condition()
+
+    @classmethod
+    def from_config(cls, config: ConfigPort, key: str) -> AIMDLimiter:
+        return cls(
+            initial_limit=config.get(f"{key}.initial_limit", 4),
+            min_limit=config.get(f"{key}.min_limit", 1),
+            max_limit=config.get(f"{key}.max_limit", 64),
+            latency_tolerance=config.get(f"{key}.latency_tolerance", 2.0),
+        )
+
+    @property
+    def limit(self) -> int:
+        return max(int(self._limit), 1)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> None:
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    def release(self, latency: float | None = None, overloaded: bool = False) -> None:
+        """
+        Frees a slot and feeds the outcome of the call back into the limit.
+
+        `latency` should be normalized by the size of the request (e.g. seconds per text) so batches
+        of different sizes compare; None (a failed call that says nothing about latency) only frees the slot.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if overloaded:
+                self._limit = max(self.min_limit, self._limit * self.overload_backoff)
+            elif latency is not None:
+                if self._baseline is None or latency < self._baseline:
+                    self._baseline = latency
+                else:
+                    # Drift up slowly so the baseline follows a backend that got permanently slower
+                    self._baseline += (latency - self._baseline) * 0.01
+                if latency > self._baseline * self.latency_tolerance:
+                    self._limit = max(self.min_limit, self._limit * self.latency_backoff)
+                else:
+                    self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, size: int = 1) -> Iterator[None]:
+        """Holds a slot for one call, measuring its latency per item of `size`."""
+        self.acquire()
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.release(overloaded=is_overload(e))
+            raise
+        else:
+            self.release(latency=(time.monotonic() - start) / max(size, 1))
+
+
+class RetryPolicy:
+    """Retries overload failures with exponential backoff and full jitter."""
+
+    def __init__(self, max_retries: int = 5, backoff_base: float = 0.5, backoff_max: float = 30.0):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    @classmethod
+    def from_config(cls, config: ConfigPort, key: str) -> RetryPolicy:
+        return cls(
+            max_retries=config.get(f"{key}.max_retries", 5),
+            backoff_base=config.get(f"{key}.backoff_base", 0.5),
+            backoff_max=config.get(f"{key}.backoff_max", 30.0),
+        )
+
+    def delay(self, attempt: int, error: BaseException) -> float:
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        retry_after = headers.get("retry-after")
+        if retry_after is not None and str(retry_after).isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))  # noqa: S311
+
+    def call(self, limiter: AIMDLimiter, fn: Callable[..., T], *args: Any, size: int = 1) -> T:
+        """Calls `fn` within a limiter slot, retrying overload failures."""
+        attempt = 0
+        while True:
+            try:
+                with limiter.slot(size):
+                    return fn(*args)
+            except Exception as e:
+                if not is_overload(e) or attempt >= self.max_retries:
+                    raise
+                # Back off without holding a slot, so other callers can use the shrunk budget
+                time.sleep(self.delay(attempt, e))
+                attempt += 1
+
+
+class Throttle:
+    """Paces background work to `rate` units per second on average; a rate of 0 or less does not throttle."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._next_at = time.monotonic()
+
+    def wait(self, units: float = 1) -> None:
+        """Waits until the previous work has been paid for, then books the time of `units` more."""
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        if self._next_at > now:
+            time.sleep(self._next_at - now)
+            now = self._next_at
+        self._next_at = now + units / self.rate
+
+
+_shared_limiters: dict[str, AIMDLimiter] = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def shared_limiter(name: str, factory: Callable[[], AIMDLimiter]) -> AIMDLimiter:
+    """Returns the process-wide limiter of a backend, so every job calling it shares one budget."""
+    with _shared_limiters_lock:
+        if name not in _shared_limiters:
+            _shared_limiters[name] = factory()
+        return _shared_limiters[name]
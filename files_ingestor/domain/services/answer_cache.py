@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+from files_ingestor.domain.ports.config import ConfigPort
+from files_ingestor.domain.services.query_cache import QueryEmbeddingCache
+
+
+class AnswerCache:
+    """
+    LLM answers keyed by (normalized question, sorted IDs of the nodes synthesized from, model, response mode).
+
+    Entries expire after `ttl_seconds` and the least recently used are evicted beyond `max_entries`.
+    Each entry is indexed by the nodes it cites, so reingesting or deleting any of them drops it.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 3600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[str, tuple[str, float, tuple[str, ...]]] = OrderedDict()
+        self._keys_by_node: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: ConfigPort, key: str = "query.answer_cache") -> AnswerCache | None:
+        if not config.get(f"{key}.enabled", False):
+            return None
+        return cls(
+            max_entries=config.get(f"{key}.max_entries", 1000),
+            ttl_seconds=config.get(f"{key}.ttl_seconds", 3600.0),
+        )
+
+    @staticmethod
+    def key(question: str, node_ids: Iterable[str], model: str, response_mode: str) -> str:
+        parts = [model, response_mode, QueryEmbeddingCache.normalize(question), *sorted(node_ids)]
+        return hashlib.sha1("\0".join(parts).encode(), usedforsecurity=False).hexdigest()
+
+    def get(self, question: str, node_ids: list[str], model: str, response_mode: str) -> str | None:
+        key = self.key(question, node_ids, model, response_mode)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] < time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, question: str, node_ids: list[str], model: str, response_mode: str, answer: str) -> None:
+        key = self.key(question, node_ids, model, response_mode)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (answer, time.monotonic() + self.ttl_seconds, tuple(node_ids))
+            for node_id in node_ids:
+                self._keys_by_node.setdefault(node_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_nodes(self, node_ids: Iterable[str]) -> int:
+        """Drops the answers citing any of the nodes, returning how many were dropped."""
+        with self._lock:
+            keys = {key for node_id in node_ids for key in self._keys_by_node.get(node_id, ())}
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drops every answer, as when the whole collection is replaced."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys_by_node.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for node_id in entry[2]:
+            keys = self._keys_by_node.get(node_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_node[node_id]
+
+    def metrics(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries),
+        }
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import atexit
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from functools import cache
+from typing import Any
+
+from llama_index.core.node_parser import NodeParser, SentenceSplitter, TokenTextSplitter
+from llama_index.core.schema import BaseNode, TransformComponent
+
+SPLITTERS: dict[str, type[SentenceSplitter] | type[TokenTextSplitter]] = {
+    "sentence": SentenceSplitter,
+    "token": TokenTextSplitter,
+}
+
+
+@cache
+def get_splitter(strategy: str = "sentence", chunk_size: int = 512, chunk_overlap: int = 128) -> NodeParser:
+    """Returns the splitter for a chunking setup, built once per process (tokenizer included)."""
+    if strategy not in SPLITTERS:
+        raise ValueError(f"Unknown chunking strategy: {strategy}")  # noqa: TRY003
+    return SPLITTERS[strategy](chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+@cache
+def _get_process_pool(num_workers: int) -> ProcessPoolExecutor:
+    pool = ProcessPoolExecutor(max_workers=num_workers)
+    atexit.register(pool.shutdown, wait=False, cancel_futures=True)
+    return pool
+
+
+def _split(splitter: NodeParser, nodes: Sequence[BaseNode]) -> list[BaseNode]:
+    return splitter(nodes)
+
+
+class ParallelSplitter(TransformComponent):
+    """
+    Pipeline stage that splits large batches of documents across worker processes.
+
+    Only splitting is fanned out: the embedding model that follows keeps running in the
+    calling process with its own batching and connection pool.
+    """
+
+    splitter: NodeParser
+    num_workers: int = 1
+    min_parallel_documents: int = 64
+
+    def __call__(self, nodes: Sequence[BaseNode], **kwargs: Any) -> list[BaseNode]:
+        if self.num_workers <= 1 or len(nodes) < self.min_parallel_documents:
+            return self.splitter(nodes, **kwargs)
+
+        # Contiguous slices keep the chunks in document order
+        slice_size = -(-len(nodes) // self.num_workers)
+        slices = [nodes[i : i + slice_size] for i in range(0, len(nodes), slice_size)]
+        pool = _get_process_pool(self.num_workers)
+        results = pool.map(_split, [self.splitter] * len(slices), slices)
+        return [node for chunk in results for node in chunk]
@@ -1,28 +1,74 @@
+import contextvars
+import importlib.metadata
 import os
 import tempfile
-from collections.abc import Sequence
+import threading
+import uuid
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Callable, Optional
 
 import dotenv
+from langchain.schema import Document as LCDocument
+from langchain_community.document_loaders.blob_loaders import Blob
+from langchain_community.document_loaders.parsers.pdf import PyPDFParser
 from langchain_community.document_loaders.pdf import PyPDFLoader
 from llama_index.core import Document
-from llama_index.core.ingestion.pipeline import IngestionPipeline
-from llama_index.core.node_parser.text.sentence import SentenceSplitter
-from llama_index.core.schema import BaseNode
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from llama_index.core.ingestion import IngestionCache
+from llama_index.core.ingestion.pipeline import DEFAULT_CACHE_NAME, IngestionPipeline
 from llama_index.core.storage.docstore.simple_docstore import SimpleDocumentStore
 
 from files_ingestor.application.commands import Command
-from files_ingestor.application.commands.ingest_pdf import IngestCloudStorageCmd, IngestFolderCmd, IngestPDFCmd
+from files_ingestor.application.commands.delete_document import DeleteDocumentCmd
+from files_ingestor.application.commands.ingest_pdf import (
+    IngestBytesCmd,
+    IngestCloudStorageCmd,
+    IngestFolderCmd,
+    IngestPDFCmd,
+    WatchFolderCmd,
+)
+from files_ingestor.application.commands.migrate_collection import MigrateCollectionCmd
+from files_ingestor.application.commands.snapshot import ExportSnapshotCmd, ImportSnapshotCmd
+from files_ingestor.application.commands.warm_text_cache import WarmTextCacheCmd
+from files_ingestor.domain.model.checkpoint import IngestionCheckpoint
+from files_ingestor.domain.model.migration import CollectionMigration
+from files_ingestor.domain.model.shard import Shard
+from files_ingestor.domain.model.snapshot import SnapshotManifest, SnapshotReader, SnapshotWriter
+from files_ingestor.domain.model.source_index import SourceIndex
+from files_ingestor.domain.model.storage_entry import FileChange, StorageEntry
+from files_ingestor.domain.model.text_cache import ExtractedTextCache, content_digest
+from files_ingestor.domain.model.vector_encoding import VectorEncoding
 from files_ingestor.domain.ports.cloud_storage_port import CloudStoragePort
 from files_ingestor.domain.ports.config import ConfigPort
 from files_ingestor.domain.ports.embedding_model import EmbeddingModelPort
 from files_ingestor.domain.ports.file_processor_port import FileProcessorPort
 from files_ingestor.domain.ports.file_reader_port import FileReaderPort
-from files_ingestor.domain.ports.logger_port import LoggerPort
+from files_ingestor.domain.ports.logger_port import LoggerPort, log_context
 from files_ingestor.domain.ports.vectorstore import VectorStorePort
+from files_ingestor.domain.services.adaptive_limiter import Throttle
+from files_ingestor.domain.services.answer_cache import AnswerCache
+from files_ingestor.domain.services.chunking import ParallelSplitter, get_splitter
+from files_ingestor.domain.services.memory_budget import MemoryBudget, Reservation
+from files_ingestor.domain.services.near_duplicates import NearDuplicateFilter, SimHashIndex
+from files_ingestor.domain.services.progress import ProgressCounter, ProgressTracker
+from files_ingestor.domain.services.vector_encoding import encode_embed_model
 
 dotenv.load_dotenv()
 
 
+def _pdf_extractor_version() -> str:
+    """Identifies the PDF text extraction, so cached text is not reused across parser upgrades."""
+    versions = []
+    for package in ("pypdf", "langchain-community"):
+        try:
+            versions.append(f"{package}-{importlib.metadata.version(package)}")
+        except importlib.metadata.PackageNotFoundError:
+            versions.append(package)
+    return "+".join(versions)
+
+
 class FileProcessorService(FileProcessorPort):
     """Service to process files and count words or characters."""
 
@@ -35,6 +81,11 @@ class FileProcessorService(FileProcessorPort):
         file_reader: FileReaderPort,
         s3_storage: CloudStoragePort,
         local_storage: CloudStoragePort,
+        progress: Optional[ProgressTracker] = None,
+        embedding_factory: Optional[Callable[[str], EmbeddingModelPort]] = None,
+        answer_cache: Optional[AnswerCache] = None,
+        on_embeddings_changed: Optional[Callable[[EmbeddingModelPort], None]] = None,
+        on_alias_swapped: Optional[Callable[[str], None]] = None,
     ):
         self.file_reader = file_reader
         self.logger = logger
@@ -43,15 +94,82 @@ class FileProcessorService(FileProcessorPort):
         self.embeddings = embeddings_port
         self.s3_storage = s3_storage
         self.local_storage = local_storage
+        self.progress = progress or ProgressTracker()
+        # Builds the embedding adapter of a config entry (e.g. "embeddings.bgem3") for migrations to another model
+        self.embedding_factory = embedding_factory
+        # Answers of the question service citing nodes this service replaces or deletes are dropped from it
+        self.answer_cache = answer_cache
+        # Called when a migration switches the embedding model, so questions get embedded with it too
+        self.on_embeddings_changed = on_embeddings_changed
+        # Called with the collection name once a migration or an import pointed its alias at a new collection
+        self.on_alias_swapped = on_alias_swapped
+        # The docstore and the source index are loaded and persisted as a whole, so pipeline runs must not interleave
+        self._pipeline_lock = threading.Lock()
+        self._source_index: Optional[SourceIndex] = None
+        self._near_duplicate_indexes: dict[str, SimHashIndex] = {}
+        # Collections whose configured payload indexes exist, checked once per process
+        self._indexed_collections: set[str] = set()
+        # Shared by every concurrent ingestion of the process: fetching and parsing wait while it is exhausted
+        self.memory_budget = MemoryBudget(self.config.get("ingestion.memory_budget.max_bytes", 512 * 1024 * 1024))
+        # Pages extracted from PDFs, reused by reingest and re-chunk runs instead of parsing again
+        self.text_cache: Optional[ExtractedTextCache] = None
+        if self.config.get("ingestion.text_cache.enabled", False):
+            self.text_cache = ExtractedTextCache(
+                self.config.get("ingestion.text_cache.path", "data/text_cache"),
+                _pdf_extractor_version(),
+                max_bytes=self.config.get("ingestion.text_cache.max_bytes", 4 * 1024**3),
+                compress_level=self.config.get("ingestion.text_cache.compress_level", 6),
+            )
 
-    def process(self, cmd: Command) -> Sequence[BaseNode] | int:
+    def process(self, cmd: Command) -> int:
+        # Every message of the command carries its job id, for structured loggers and progress reporting
+        job_id = cmd.job_id or uuid.uuid4().hex[:12]
+        with log_context(job=job_id, command=cmd.name()), self.progress.track(job_id, cmd.name()):
+            return self._dispatch(cmd)
+
+    def _dispatch(self, cmd: Command) -> int:
         match cmd:
             case IngestPDFCmd():
-                return self.ingest_pdf(cmd.file_name)
+                return self.ingest_pdf(cmd.file_name, replace=cmd.replace)
+            case IngestBytesCmd():
+                return self.ingest_pdf_bytes(cmd.data, cmd.source, cmd.metadata, replace=cmd.replace)
+            case DeleteDocumentCmd():
+                return self.delete_document(cmd.source)
+            case WatchFolderCmd():
+                return self.watch_folder(
+                    cmd.folder_path, cmd.recursive, cmd.debounce_seconds, cmd.poll_interval, cmd.workers, cmd.stop_event
+                )
             case IngestFolderCmd():
-                return self.ingest_folder(cmd.folder_path)
+                return self.ingest_folder(cmd.folder_path, Shard(cmd.shard_index, cmd.shard_count))
             case IngestCloudStorageCmd():
-                return self.ingest_cloud_storage(cmd.url, cmd.recursive)
+                return self.ingest_cloud_storage(
+                    cmd.url,
+                    cmd.recursive,
+                    cmd.resume,
+                    cmd.checkpoint_path,
+                    cmd.stage_local,
+                    Shard(cmd.shard_index, cmd.shard_count),
+                )
+            case _:
+                return self._dispatch_maintenance(cmd)
+
+    def _dispatch_maintenance(self, cmd: Command) -> int:
+        """Runs the commands maintaining collections and caches rather than ingesting documents."""
+        match cmd:
+            case MigrateCollectionCmd():
+                return self.migrate_collection(
+                    cmd.collection_name,
+                    self._get_embeddings(cmd.embeddings),
+                    cmd.max_pages_per_second,
+                    cmd.drop_old,
+                    cmd.replace_collection,
+                )
+            case ExportSnapshotCmd():
+                return self.export_snapshot(cmd.path, cmd.collection_name)
+            case ImportSnapshotCmd():
+                return self.import_snapshot(cmd.path, cmd.collection_name, cmd.replace)
+            case WarmTextCacheCmd():
+                return self.warm_text_cache(cmd.url, cmd.recursive, Shard(cmd.shard_index, cmd.shard_count))
             case _:
                 raise ValueError(f"Unknown command type: {type(cmd)}")  # noqa: TRY003
 
@@ -64,92 +182,892 @@ class FileProcessorService(FileProcessorPort):
         else:
             raise ValueError(f"Unsupported URL scheme: {url}")  # noqa: TRY003
 
-    def ingest_cloud_storage(self, url: str, recursive: bool = False) -> int:
-        """Ingests files from a cloud storage URL."""
+    def _open_checkpoint(
+        self, url: str, recursive: bool, resume: bool, checkpoint_path: Optional[str], shard: Optional[Shard] = None
+    ) -> IngestionCheckpoint:
+        """Loads the checkpoint to resume from, or starts a fresh one."""
+        if checkpoint_path is None:
+            checkpoint_dir = self.config.get("ingestion.checkpoint.path", "data/checkpoints")
+            checkpoint_path = IngestionCheckpoint.default_path(checkpoint_dir, url, recursive, shard)
+
+        if resume:
+            checkpoint = IngestionCheckpoint.load(checkpoint_path, url, recursive)
+            self.logger.info(f"Resuming {url} from checkpoint {checkpoint_path} ({checkpoint.processed} files done)")
+            return checkpoint
+
+        return IngestionCheckpoint(checkpoint_path, url, recursive)
+
+    def ingest_cloud_storage(
+        self,
+        url: str,
+        recursive: bool = False,
+        resume: bool = False,
+        checkpoint_path: Optional[str] = None,
+        stage_local: bool = False,
+        shard: Optional[Shard] = None,
+    ) -> int:
+        """
+        Ingests files from a cloud storage URL, checkpointing progress so the run can be resumed.
+
+        With a `shard`, only the objects whose URL hashes to it are ingested (and checkpointed).
+        """
+        shard = shard or Shard()
         try:
             # Get appropriate storage adapter
             storage = self._get_storage_adapter(url)
 
-            # List all files at the URL
-            files = storage.list_files(url, recursive=recursive)
-
-            # Filter for PDF files
-            pdf_files = [f for f in files if f.lower().endswith(".pdf")]
-            if not pdf_files:
-                self.logger.warn(f"No PDF files found at {url}")
+            checkpoint = self._open_checkpoint(url, recursive, resume, checkpoint_path, shard)
+            if checkpoint.finished:
+                self.logger.info(f"Checkpoint for {url} is already finished, nothing to resume")
                 return 0
+            pdf_count, processed = self._ingest_entries(storage, url, recursive, stage_local, checkpoint, shard)
+        except Exception as e:
+            self.logger.error("Error processing cloud storage", e)  # noqa: TRY400
+            raise
+
+        if pdf_count == 0 and checkpoint.processed == 0:
+            self.logger.warn(f"No PDF files found at {url}")
+            return 0
 
-            processed = 0
-            temp_dir = tempfile.mkdtemp(prefix="cloud_storage_")
+        checkpoint.finish()
+        if not shard.is_whole:
+            self.logger.info(f"Ingested {processed} of {pdf_count} PDF files at {url} as {shard}")
+        return processed
+
+    def _ingest_entries(
+        self,
+        storage: CloudStoragePort,
+        url: str,
+        recursive: bool,
+        stage_local: bool,
+        checkpoint: IngestionCheckpoint,
+        shard: Shard,
+    ) -> tuple[int, int]:
+        """Ingests the PDFs listed under a URL from the checkpointed page on, returning (listed, ingested)."""
+        checkpoint_every = self.config.get("ingestion.checkpoint.every", 50)
+        processed = 0
+        pdf_count = 0
+        with tempfile.TemporaryDirectory(prefix="cloud_storage_") as temp_dir:
+            # Stream PDF entries page by page, starting at the checkpointed page
+            entries = storage.iter_files(
+                url, recursive=recursive, suffix=".pdf", continuation_token=checkpoint.continuation_token
+            )
+            for entry in entries:
+                pdf_count += 1
+                if not self._claim_entry(entry, checkpoint, shard):
+                    continue
+                if not self._ingest_entry(storage, entry, temp_dir, stage_local):
+                    continue
+                processed += 1
+                checkpoint.mark_done(entry.url)
+                if processed % checkpoint_every == 0:
+                    checkpoint.save()
+        return pdf_count, processed
+
+    @staticmethod
+    def _claim_entry(entry: StorageEntry, checkpoint: IngestionCheckpoint, shard: Shard) -> bool:
+        """Moves the checkpoint to the listing page of an entry; True if this run still has to ingest the entry."""
+        if entry.page_token != checkpoint.continuation_token:
+            checkpoint.advance(entry.page_token)
+        return shard.owns(entry.url) and not checkpoint.is_done(entry.url)
+
+    def _ingest_entry(self, storage: CloudStoragePort, entry: StorageEntry, temp_dir: str, stage_local: bool) -> bool:
+        """Fetches and ingests one listed PDF; a failure is logged and counted, and returns False."""
+        # Local sources are read in place, small objects are parsed from memory
+        # and large ones are downloaded to a temp location
+        local_path = os.path.join(temp_dir, os.path.basename(entry.url))
+        in_place_path = None if stage_local else storage.local_path(entry.url)
+        in_memory_max_bytes = self.config.get("ingestion.in_memory.max_bytes", 32 * 1024 * 1024)
+        try:
+            # Reserved before fetching, so a burst of big objects waits instead of piling up in memory
+            with self.memory_budget.reserve(entry.size):
+                if in_place_path is not None:
+                    self.ingest_pdf(in_place_path)
+                elif entry.size <= in_memory_max_bytes:
+                    data = storage.read_bytes(entry.url)
+                    ProgressTracker.add(bytes_downloaded=len(data))
+                    self.ingest_pdf_bytes(data, source=entry.url)
+                else:
+                    storage.download_file(entry.url, local_path)
+                    ProgressTracker.add(bytes_downloaded=entry.size)
+                    self.ingest_pdf(local_path, source=entry.url)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Failed to process {entry.url}", e)  # noqa: TRY400
+            ProgressTracker.add(files_failed=1)
+            return False
+        finally:
+            # Clean up downloaded file
+            if os.path.exists(local_path):
+                os.unlink(local_path)
+        return True
+
+    def ingest_pdf(self, pdf_filepath: str, source: Optional[str] = None, replace: bool = False) -> int:
+        """
+        Ingests a PDF file, returning the number of nodes produced. `source` overrides the path as the document
+        source (e.g. the URL of a downloaded object) and `replace` removes the pages a previous ingestion of the
+        same source had and this one lacks.
+        """
+        source = source or pdf_filepath
+        with self.memory_budget.reserve(os.path.getsize(pdf_filepath)) as reservation:
+            documents = self._to_documents(self._load_pdf(pdf_filepath), source)
+            num_nodes = self._run_budgeted_pipeline(reservation, documents, source, replace)
+        ProgressTracker.add(files_done=1)
+        return num_nodes
+
+    def ingest_pdf_bytes(
+        self,
+        data: bytes | memoryview | BinaryIO,
+        source: str,
+        metadata: Optional[dict[str, Any]] = None,
+        replace: bool = False,
+    ) -> int:
+        """Ingests a PDF held in memory, parsing it straight from the buffer. Returns the number of nodes produced."""
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        elif not isinstance(data, bytes):
+            data = data.read()
+
+        with self.memory_budget.reserve(len(data)) as reservation:
+            langchain_documents = self._parse_pdf_bytes(data, source)
+            for langchain_document in langchain_documents:
+                langchain_document.metadata.update(metadata or {})
+            documents = self._to_documents(langchain_documents, source)
+            num_nodes = self._run_budgeted_pipeline(reservation, documents, source, replace)
+        ProgressTracker.add(files_done=1)
+        return num_nodes
+
+    def _load_pdf(self, pdf_filepath: str) -> list[LCDocument]:
+        """Extracts the pages of a PDF file, from the text cache when it has them."""
+        if self.text_cache is None:
+            return PyPDFLoader(file_path=pdf_filepath).load()
+        with open(pdf_filepath, "rb") as f:
+            digest = content_digest(f)
+        return self._cached_pages(digest, lambda: PyPDFLoader(file_path=pdf_filepath).load())
+
+    def _parse_pdf_bytes(self, data: bytes, source: str) -> list[LCDocument]:
+        """Extracts the pages of a PDF held in memory, from the text cache when it has them."""
+
+        def parse() -> list[LCDocument]:
+            blob = Blob.from_data(data, path=source, mime_type="application/pdf")
+            return list(PyPDFParser().lazy_parse(blob))
+
+        if self.text_cache is None:
+            return parse()
+        return self._cached_pages(content_digest(data), parse)
+
+    def _cached_pages(self, digest: str, parse: Callable[[], list[LCDocument]]) -> list[LCDocument]:
+        text_cache: ExtractedTextCache = self.text_cache  # type: ignore  # noqa: PGH003
+        pages = text_cache.get(digest)
+        if pages is not None:
+            return [LCDocument(page_content=page["text"], metadata=page["metadata"]) for page in pages]
+
+        langchain_documents = parse()
+        try:
+            pages = [{"text": document.page_content, "metadata": document.metadata} for document in langchain_documents]
+            text_cache.put(digest, pages)
+        except OSError as e:
+            # A full or read-only cache disk must not fail the ingestion
+            self.logger.warn(f"Could not cache the extracted text of {digest}: {e}")
+        return langchain_documents
 
+    def warm_text_cache(self, url: str, recursive: bool = True, shard: Optional[Shard] = None) -> int:
+        """
+        Parses the PDFs under a folder path or storage URL into the text cache, without embedding them.
+
+        Already cached PDFs are only read and hashed. Returns the number of PDFs processed.
+        """
+        if self.text_cache is None:
+            raise ValueError("The extracted-text cache is disabled (ingestion.text_cache.enabled)")  # noqa: TRY003
+        shard = shard or Shard()
+        if "://" not in url:
+            url = f"file://{os.path.abspath(url)}"
+        storage = self._get_storage_adapter(url)
+        in_memory_max_bytes = self.config.get("ingestion.in_memory.max_bytes", 32 * 1024 * 1024)
+        misses = self.text_cache.misses
+
+        num_files = 0
+        for entry in storage.iter_files(url, recursive=recursive, suffix=".pdf"):
+            if not shard.owns(entry.url):
+                continue
             try:
-                for file_url in pdf_files:
-                    # Download to temp location
-                    filename = os.path.basename(file_url)
-                    local_path = os.path.join(temp_dir, filename)
+                with self.memory_budget.reserve(entry.size):
+                    self._warm_entry(storage, entry, in_memory_max_bytes)
+                num_files += 1
+                ProgressTracker.add(files_done=1)
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Failed to extract {entry.url}", e)  # noqa: TRY400
+                ProgressTracker.add(files_failed=1)
 
-                    try:
-                        storage.download_file(file_url, local_path)
-                        self.ingest_pdf(local_path)
-                        processed += 1
-                    except (OSError, ValueError) as e:
-                        self.logger.error(f"Failed to process {file_url}", e)  # noqa: TRY400
-                        continue
-                    finally:
-                        # Clean up downloaded file
-                        if os.path.exists(local_path):
-                            os.unlink(local_path)
-
-                return processed
-            finally:
-                # Clean up temp directory
-                if os.path.exists(temp_dir):
-                    os.rmdir(temp_dir)
+        extracted = self.text_cache.misses - misses
+        self.logger.info(f"Warmed the text cache with {num_files} PDFs from {url} ({extracted} newly extracted)")
+        return num_files
 
-        except Exception as e:
-            self.logger.error("Error processing cloud storage", e)  # noqa: TRY400
-            raise
+    def _warm_entry(self, storage: CloudStoragePort, entry: StorageEntry, in_memory_max_bytes: int) -> None:
+        in_place_path = storage.local_path(entry.url)
+        if in_place_path is not None:
+            self._load_pdf(in_place_path)
+        elif entry.size <= in_memory_max_bytes:
+            data = storage.read_bytes(entry.url)
+            ProgressTracker.add(bytes_downloaded=len(data))
+            self._parse_pdf_bytes(data, entry.url)
+        else:
+            with tempfile.TemporaryDirectory(prefix="text_cache_") as temp_dir:
+                local_path = os.path.join(temp_dir, os.path.basename(entry.url))
+                storage.download_file(entry.url, local_path)
+                ProgressTracker.add(bytes_downloaded=entry.size)
+                self._load_pdf(local_path)
 
-    def ingest_pdf(self, pdf_filepath: str) -> Sequence[BaseNode]:
-        langchain_documents = PyPDFLoader(file_path=pdf_filepath).load()
-        documents = [Document.from_langchain_format(doc) for doc in langchain_documents]
+    def _run_budgeted_pipeline(
+        self, reservation: Reservation, documents: list[Document], source: str, replace: bool
+    ) -> int:
+        """Runs the pipeline once the reservation covers the extracted text and the vectors it will produce."""
+        reservation.resize(max(reservation.size, self._estimate_memory(documents)))
+        return self._run_pipeline(documents, source, replace)
 
-        doc_store_name = self.config.get("documentStores.bookstore.name", "")
-        persist_path = self.config.get("documentStores.bookstore.props.path", "data")
+    def _estimate_memory(self, documents: list[Document]) -> int:
+        """
+        Estimates the bytes an ingestion holds: the extracted text twice (pages and their chunks) and one
+        in-memory embedding per chunk (Python floats take ~32 bytes each, 32KB for a 1024-dimension vector).
+        """
         collection_name = self.config.get("collections.book-library", "book-library")
+        chunk_size: int = self.config.get(f"vectorstore.qdrant.collections.{collection_name}.chunking.chunk_size", 512)
+        bytes_per_vector: int = self.config.get("ingestion.memory_budget.bytes_per_vector", 32 * 1024)
+
+        text_bytes = sum(len(document.text) for document in documents)
+        # Chunk sizes are in tokens, about 4 characters each
+        num_chunks = text_bytes // (chunk_size * 4) + len(documents)
+        return 2 * text_bytes + num_chunks * bytes_per_vector
+
+    @staticmethod
+    def _to_documents(langchain_documents: list[LCDocument], source: str) -> list[Document]:
+        """
+        Converts parsed pages into documents with stable IDs derived from source and page, so the
+        pipeline docstore skips unchanged pages and replaces the vectors of changed ones on reingestion.
+        """
+        documents = []
+        for i, langchain_document in enumerate(langchain_documents):
+            langchain_document.metadata["source"] = source
+            document = Document.from_langchain_format(langchain_document)
+            document.id_ = f"{source}#page={langchain_document.metadata.get('page', i)}"
+            documents.append(document)
+        return documents
+
+    def _get_source_index(self, persist_path: str) -> SourceIndex:
+        if self._source_index is None:
+            self._source_index = SourceIndex.load(persist_path)
+        return self._source_index
+
+    def _get_splitter(self, collection_name: str) -> ParallelSplitter:
+        """Builds the chunking stage from the collection settings, reusing one splitter per setup."""
+        chunking_key = f"vectorstore.qdrant.collections.{collection_name}.chunking"
+        splitter = get_splitter(
+            self.config.get(f"{chunking_key}.strategy", "sentence"),
+            self.config.get(f"{chunking_key}.chunk_size", 512),
+            self.config.get(f"{chunking_key}.chunk_overlap", 128),
+        )
+        return ParallelSplitter(
+            splitter=splitter,
+            num_workers=self.config.get("ingestion.chunking.num_workers", 1),
+            min_parallel_documents=self.config.get("ingestion.chunking.min_parallel_documents", 64),
+        )
 
-        splitter = SentenceSplitter(chunk_size=512, chunk_overlap=128)
+    def _get_near_duplicate_index(self, collection_name: str) -> SimHashIndex:
+        if collection_name not in self._near_duplicate_indexes:
+            persist_path = self.config.get("documentStores.bookstore.props.path", "data")
+            self._near_duplicate_indexes[collection_name] = SimHashIndex.load(
+                os.path.join(persist_path, "near_duplicates", f"{collection_name}.json"),
+                max_distance=self.config.get(
+                    f"vectorstore.qdrant.collections.{collection_name}.near_duplicates.max_hamming_distance", 3
+                ),
+            )
+        return self._near_duplicate_indexes[collection_name]
+
+    def _create_payload_indexes(self, collection_name: str, target: Optional[str] = None) -> None:
+        """
+        Creates the payload indexes configured for a collection in it (or in `target`, a new version of it),
+        once it exists: the vector store only creates default collections on their first write.
+        """
+        target = target or collection_name
+        if target in self._indexed_collections or not self.vector_store_repo.collection_exist(target):
+            return
+        fields = self.config.get(f"vectorstore.qdrant.collections.{collection_name}.payload_indexes", {})
+        self.vector_store_repo.create_payload_indexes(target, fields)
+        self._indexed_collections.add(target)
+
+    def _near_duplicates_enabled(self, collection_name: str) -> bool:
+        return bool(self.config.get(f"vectorstore.qdrant.collections.{collection_name}.near_duplicates.enabled", False))
+
+    def _get_near_duplicate_filter(self, collection_name: str) -> Optional[NearDuplicateFilter]:
+        """Builds the optional near-duplicate stage, enabled per collection."""
+        if not self._near_duplicates_enabled(collection_name):
+            return None
+        return NearDuplicateFilter(
+            index=self._get_near_duplicate_index(collection_name),
+            mode=self.config.get(f"vectorstore.qdrant.collections.{collection_name}.near_duplicates.mode", "drop"),
+        )
+
+    def _get_embed_model(self, collection_name: str) -> BaseEmbedding:
+        """Returns the embedding model for the collection's vector encoding, creating the collection if needed."""
+        encoding = VectorEncoding.from_config(self.config, collection_name)
+        embed_model = encode_embed_model(self.embeddings.get_model(), encoding)
+        if encoding.is_default:
+            # The vector store creates float32 collections of the model size on first write
+            return embed_model
+
+        vector_size = self.vector_store_repo.get_vector_size(collection_name)
+        if vector_size is None:
+            vector_size = encoding.dimensions or len(embed_model.get_text_embedding("vector size probe"))
+            self.vector_store_repo.create_collection(collection_name, vector_size, encoding.datatype)
+        elif encoding.dimensions is not None and vector_size != encoding.dimensions:
+            self.logger.warn(
+                f"Collection {collection_name} stores {vector_size}-dimension vectors but is configured as {encoding}; "
+                "reingest it into a new collection to change its encoding"
+            )
+        return embed_model
+
+    def _build_pipeline(self, collection_name: str) -> IngestionPipeline:
+        doc_store_name = self.config.get("documentStores.bookstore.name", "")
+        splitter = self._get_splitter(collection_name)
+        near_duplicate_filter = self._get_near_duplicate_filter(collection_name)
         document_store = SimpleDocumentStore(namespace=doc_store_name)
-        embeddings_model = self.embeddings.get_model()
-        model_name = embeddings_model.model_name
-        pipeline = IngestionPipeline(
-            transformations=[splitter, embeddings_model],
+        embeddings_model = self._get_embed_model(collection_name)
+        transformations = [splitter, embeddings_model, ProgressCounter()]
+        if near_duplicate_filter is not None:
+            transformations.insert(1, near_duplicate_filter)
+        return IngestionPipeline(
+            transformations=transformations,
             docstore=document_store,
             vector_store=self.vector_store_repo.get_vector_store(collection_name=collection_name),
         )
 
-        pipeline.load(persist_path) if os.path.exists(persist_path) else None
+    def _load_pipeline(self, pipeline: IngestionPipeline, persist_path: str) -> None:
+        """
+        Restores the cache and the docstore persisted by previous runs, if any. IngestionPipeline.load would
+        reload the docstore without its namespace, so every page would look new and keep its old vectors.
+        """
+        doc_store_name = self.config.get("documentStores.bookstore.name", "")
+        cache_path = os.path.join(persist_path, DEFAULT_CACHE_NAME)
+        if os.path.exists(cache_path):
+            pipeline.cache = IngestionCache.from_persist_path(cache_path)
+        docstore_path = os.path.join(persist_path, "docstore.json")
+        if os.path.exists(docstore_path):
+            pipeline.docstore = SimpleDocumentStore.from_persist_path(docstore_path, namespace=doc_store_name)
+
+    def _run_pipeline(self, documents: list[Document], source: str, replace: bool = False) -> int:
+        """Embeds and stores the documents of a source, returning the number of nodes produced."""
+        persist_path = self.config.get("documentStores.bookstore.props.path", "data")
+        collection_name = self.config.get("collections.book-library", "book-library")
+
+        with self._pipeline_lock, log_context(file=source):
+            # Built under the lock, so a migration swapping the collection alias cannot interleave with the writes
+            pipeline = self._build_pipeline(collection_name)
+            model_name = self.embeddings.get_model().model_name
+            self._load_pipeline(pipeline, persist_path)
+
+            self.logger.info(
+                f"Running ingestion pipeline (splitter, extractor, {model_name}) for {len(documents)} documents."
+            )
+            ProgressTracker.add(pages=len(documents))
+            source_index = self._get_source_index(persist_path)
+            self._release_near_duplicates(pipeline, collection_name, source_index, source, documents, replace)
+            with self._near_duplicates_staged(pipeline):
+                nodes = pipeline.run(documents=documents)
+            ProgressTracker.add(vectors_upserted=len(nodes))
+            self.logger.info(f"Produced {len(nodes)} nodes after processing.")
+            self._create_payload_indexes(collection_name)
+            self._report_near_duplicates(pipeline, collection_name)
+
+            nodes_by_doc: dict[str, list[str]] = {}
+            for node in nodes:
+                nodes_by_doc.setdefault(node.ref_doc_id or node.node_id, []).append(node.node_id)
+            previous_nodes = source_index.sources.get(source, {})
+            self._invalidate_answers(node_id for doc_id in nodes_by_doc for node_id in previous_nodes.get(doc_id, []))
+            stale_doc_ids = source_index.update(source, [document.id_ for document in documents], nodes_by_doc)
+            if replace and stale_doc_ids:
+                self._remove_documents(pipeline, collection_name, source_index, source, stale_doc_ids)
 
-        self.logger.info(
-            f"Running ingestion pipeline (splitter, extractor, {model_name}) for {len(documents)} documents."
+            pipeline.persist(persist_path)
+            source_index.save()
+
+        return len(nodes)
+
+    def _release_near_duplicates(
+        self,
+        pipeline: IngestionPipeline,
+        collection_name: str,
+        source_index: SourceIndex,
+        source: str,
+        documents: list[Document],
+        replace: bool,
+    ) -> None:
+        """
+        Forgets the signatures of the chunks a run is about to delete: those of changed pages, whose vectors
+        the docstore upsert replaces, and with `replace` those of pages the source no longer has. Otherwise
+        the unchanged chunks of a changed page would be dropped as near-duplicates of their own deleted vectors.
+        """
+        docstore = pipeline.docstore
+        if docstore is None or not self._near_duplicates_enabled(collection_name):
+            return
+        previous_nodes = source_index.sources.get(source, {})
+        hashes = {document.id_: document.hash for document in documents}
+        released = [
+            doc_id
+            for doc_id in previous_nodes
+            if (doc_id not in hashes and replace)
+            or (doc_id in hashes and docstore.get_document_hash(doc_id) not in (None, hashes[doc_id]))
+        ]
+        if released:
+            self._get_near_duplicate_index(collection_name).remove(
+                node_id for doc_id in released for node_id in previous_nodes[doc_id]
+            )
+
+    @staticmethod
+    @contextmanager
+    def _near_duplicates_staged(pipeline: IngestionPipeline) -> Iterator[None]:
+        """Commits the signatures a run staged once its vectors are upserted, discarding them if it fails."""
+        filters = [t for t in pipeline.transformations if isinstance(t, NearDuplicateFilter)]
+        try:
+            yield
+        except BaseException:
+            for near_duplicate_filter in filters:
+                near_duplicate_filter.discard()
+            raise
+        for near_duplicate_filter in filters:
+            near_duplicate_filter.commit()
+
+    def _report_near_duplicates(self, pipeline: IngestionPipeline, collection_name: str) -> None:
+        for transformation in pipeline.transformations:
+            if isinstance(transformation, NearDuplicateFilter):
+                self._get_near_duplicate_index(collection_name).save()
+                self.logger.info(
+                    f"Near-duplicate filter skipped {transformation.skipped} chunks, "
+                    f"saving {transformation.skipped} embeddings and vectors in {collection_name}"
+                )
+
+    def _remove_documents(
+        self,
+        pipeline: IngestionPipeline,
+        collection_name: str,
+        source_index: SourceIndex,
+        source: str,
+        doc_ids: Optional[list[str]] = None,
+    ) -> dict[str, list[str]]:
+        """Removes documents of a source from the vector store, the docstore and the source index."""
+        removed = source_index.remove(source, doc_ids)
+        if not removed:
+            return removed
+
+        self.vector_store_repo.delete_documents(collection_name, list(removed))
+        self._invalidate_answers(node_id for node_ids in removed.values() for node_id in node_ids)
+        if self._near_duplicates_enabled(collection_name):
+            near_duplicate_index = self._get_near_duplicate_index(collection_name)
+            near_duplicate_index.remove(node_id for node_ids in removed.values() for node_id in node_ids)
+            near_duplicate_index.save()
+        docstore = pipeline.docstore
+        if docstore is not None:
+            for doc_id in removed:
+                docstore.delete_ref_doc(doc_id, raise_error=False)
+                docstore.delete_document(doc_id, raise_error=False)
+        self.logger.info(f"Removed {len(removed)} documents of {source} from {collection_name}")
+        return removed
+
+    def _invalidate_answers(self, node_ids: Iterable[str]) -> None:
+        if self.answer_cache is None:
+            return
+        invalidated = self.answer_cache.invalidate_nodes(node_ids)
+        if invalidated:
+            self.logger.info(f"Invalidated {invalidated} cached answers citing replaced or removed nodes")
+
+    def delete_document(self, source: str) -> int:
+        """Deletes every chunk of a source document, returning the number of removed nodes."""
+        persist_path = self.config.get("documentStores.bookstore.props.path", "data")
+        collection_name = self.config.get("collections.book-library", "book-library")
+
+        with self._pipeline_lock, log_context(file=source):
+            pipeline = self._build_pipeline(collection_name)
+            self._load_pipeline(pipeline, persist_path)
+            source_index = self._get_source_index(persist_path)
+            removed = self._remove_documents(pipeline, collection_name, source_index, source)
+            if removed:
+                pipeline.persist(persist_path)
+                source_index.save()
+
+        if not removed:
+            self.logger.warn(f"No documents indexed for {source}")
+        return sum(len(node_ids) for node_ids in removed.values())
+
+    def _require_ingestion_collection(self, collection_name: str, action: str) -> None:
+        """Rejects collections other than the ingestion one, whose docstore and source index are the only ones."""
+        ingestion_collection = self.config.get("collections.book-library", "book-library")
+        if collection_name != ingestion_collection:
+            raise ValueError(  # noqa: TRY003
+                f"Only the ingestion collection {ingestion_collection} can be {action}, not {collection_name}"
+            )
+
+    def _get_embeddings(self, config_key: Optional[str]) -> Optional[EmbeddingModelPort]:
+        if config_key is None:
+            return None
+        if self.embedding_factory is None:
+            raise ValueError(f"No embedding factory to build {config_key} with")  # noqa: TRY003
+        return self.embedding_factory(config_key)
+
+    def migrate_collection(
+        self,
+        collection_name: str,
+        embeddings: Optional[EmbeddingModelPort] = None,
+        max_pages_per_second: Optional[float] = None,
+        drop_old: bool = False,
+        replace_collection: bool = False,
+    ) -> int:
+        """
+        Re-embeds the indexed pages into a new versioned collection with `embeddings` (the current model by
+        default), then points the `collection_name` alias at it. Returns the number of pages embedded.
+
+        Ingestion and retrieval keep using the live collection meanwhile. Pages are read from the docstore, or
+        extracted again (from the text cache when it has them) if it holds no text for them. Further passes
+        catch up with what was ingested or deleted since; the last one holds the pipeline lock until the swap,
+        so no write can fall between them.
+
+        Only the ingestion collection can be migrated: the docstore and source index the pages are read
+        from, and repointed at the new nodes, are those of `collections.book-library`.
+
+        A plain collection (created before aliases were used) is deleted right before the alias takes its
+        name, leaving retrieval without a collection for that moment: a one-time cut-over, only done with
+        `replace_collection`. Later migrations move the alias atomically.
+        """
+        self._require_ingestion_collection(collection_name, "migrated")
+        if (
+            not replace_collection
+            and self.vector_store_repo.resolve_collection(collection_name) == collection_name
+            and self.vector_store_repo.collection_exist(collection_name)
+        ):
+            # Checked up front, rather than by the swap once hours of pages are embedded
+            raise ValueError(  # noqa: TRY003
+                f"{collection_name} is a collection, not an alias: its first migration needs replace_collection"
+            )
+        migration_key = f"vectorstore.qdrant.collections.{collection_name}.migration"
+        if max_pages_per_second is None:
+            max_pages_per_second = self.config.get(f"{migration_key}.max_pages_per_second", 20.0)
+        embeddings = embeddings or self.embeddings
+        migration = CollectionMigration(
+            collection_name,
+            CollectionMigration.next_version(collection_name, self.vector_store_repo.get_collections()),
         )
-        nodes = pipeline.run(documents=documents, show_progress=True)
-        self.logger.info(f"Produced {len(nodes)} nodes after processing.")
-        pipeline.persist(persist_path)
+        pipeline, near_duplicate_index = self._build_migration_pipeline(collection_name, migration.target, embeddings)
+        throttle = Throttle(max_pages_per_second)
+        self.logger.info(f"Migrating {collection_name} to {migration.target} at up to {max_pages_per_second} pages/s")
 
-        return nodes
+        for _ in range(self.config.get(f"{migration_key}.catch_up_passes", 3)):
+            with self._pipeline_lock:
+                current, docstore = self._migration_snapshot()
+            if self._migrate_changes(migration, pipeline, near_duplicate_index, throttle, current, docstore) == 0:
+                break
 
-    def ingest_folder(self, folder_path: str) -> int:
-        num_files = 0
+        with self._pipeline_lock:
+            current, docstore = self._migration_snapshot()
+            # Unthrottled: ingestions wait on the lock, and this pass only has the last few changes
+            self._migrate_changes(migration, pipeline, near_duplicate_index, Throttle(0), current, docstore)
+            previous = self.vector_store_repo.swap_alias(collection_name, migration.target, replace_collection)
+            if self.on_alias_swapped is not None:
+                self.on_alias_swapped(collection_name)
+            self._adopt_migration(migration, near_duplicate_index)
+            if embeddings is not self.embeddings:
+                # Later ingestions and questions must embed with the model of the collection they now use
+                self.embeddings = embeddings
+                if self.on_embeddings_changed is not None:
+                    self.on_embeddings_changed(embeddings)
+                model_name = embeddings.get_model().model_name
+                self.logger.warn(f"{collection_name} now holds {model_name} vectors, update the embeddings config")
+            if self.answer_cache is not None:
+                # Cached answers cite the nodes of the previous collection
+                self.answer_cache.clear()
+
+        if drop_old and previous is not None and previous != collection_name:
+            self.vector_store_repo.delete_collection(previous)
+        self.logger.info(f"Migrated {migration.pages} pages of {collection_name} to {migration.target}")
+        return migration.pages
+
+    def _build_migration_pipeline(
+        self, collection_name: str, target: str, embeddings: EmbeddingModelPort
+    ) -> tuple[IngestionPipeline, Optional[SimHashIndex]]:
+        """Creates the target collection and the pipeline embedding into it, without docstore deduplication."""
+        encoding = VectorEncoding.from_config(self.config, collection_name)
+        embed_model = encode_embed_model(embeddings.get_model(), encoding)
+        vector_size = encoding.dimensions or len(embed_model.get_text_embedding("vector size probe"))
+        self.vector_store_repo.create_collection(target, vector_size, encoding.datatype)
+        self._create_payload_indexes(collection_name, target)
+
+        transformations = [self._get_splitter(collection_name), embed_model, ProgressCounter()]
+        near_duplicate_index = None
+        if self._near_duplicates_enabled(collection_name):
+            # A fresh index: chunks of the live collection must not count as duplicates of themselves
+            live_index = self._get_near_duplicate_index(collection_name)
+            near_duplicate_index = SimHashIndex(live_index.path, live_index.max_distance)
+            mode = self.config.get(f"vectorstore.qdrant.collections.{collection_name}.near_duplicates.mode", "drop")
+            transformations.insert(1, NearDuplicateFilter(index=near_duplicate_index, mode=mode))
+        pipeline = IngestionPipeline(
+            transformations=transformations, vector_store=self.vector_store_repo.get_vector_store(target)
+        )
+        return pipeline, near_duplicate_index
+
+    def _migration_snapshot(self) -> tuple[dict[str, tuple[str, str]], SimpleDocumentStore]:
+        """Reads the indexed pages as (source, hash) by doc id and the docstore, with the pipeline lock held."""
+        persist_path = self.config.get("documentStores.bookstore.props.path", "data")
+        doc_store_name = self.config.get("documentStores.bookstore.name", "")
+        docstore_path = os.path.join(persist_path, "docstore.json")
+        docstore = (
+            SimpleDocumentStore.from_persist_path(docstore_path, namespace=doc_store_name)
+            if os.path.exists(docstore_path)
+            else SimpleDocumentStore(namespace=doc_store_name)
+        )
+        source_index = self._get_source_index(persist_path)
+        current = {
+            doc_id: (source, docstore.get_document_hash(doc_id) or "")
+            for source in list(source_index.sources)
+            for doc_id in source_index.doc_ids(source)
+        }
+        return current, docstore
+
+    def _migrate_changes(
+        self,
+        migration: CollectionMigration,
+        pipeline: IngestionPipeline,
+        near_duplicate_index: Optional[SimHashIndex],
+        throttle: Throttle,
+        current: dict[str, tuple[str, str]],
+        docstore: SimpleDocumentStore,
+    ) -> int:
+        """Brings the target up to date with the indexed pages, returning the number of pages embedded."""
+        stale, to_embed = migration.plan(current)
+        if stale:
+            self.vector_store_repo.delete_documents(migration.target, stale)
+            stale_node_ids = migration.forget(stale)
+            if near_duplicate_index is not None:
+                near_duplicate_index.remove(stale_node_ids)
+
+        num_pages = 0
+        for source, doc_ids in to_embed.items():
+            try:
+                documents = self._migration_documents(source, doc_ids, docstore)
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Failed to read {source} for migration", e)  # noqa: TRY400
+                ProgressTracker.add(files_failed=1)
+                continue
+            throttle.wait(len(documents))
+            with self._near_duplicates_staged(pipeline):
+                nodes = pipeline.run(documents=documents)
+            nodes_by_doc: dict[str, list[str]] = {}
+            for node in nodes:
+                nodes_by_doc.setdefault(node.ref_doc_id or node.node_id, []).append(node.node_id)
+            for document in documents:
+                migration.record(document.id_, current[document.id_][1], nodes_by_doc.get(document.id_, []))
+            ProgressTracker.add(files_done=1, pages=len(documents), vectors_upserted=len(nodes))
+            num_pages += len(documents)
+        return num_pages
+
+    def _migration_documents(self, source: str, doc_ids: list[str], docstore: SimpleDocumentStore) -> list[Document]:
+        stored = [docstore.get_document(doc_id, raise_error=False) for doc_id in doc_ids]
+        documents = [document for document in stored if isinstance(document, Document) and document.get_content()]
+        if len(documents) == len(doc_ids):
+            return documents
+
+        wanted = set(doc_ids)
+        if "://" not in source:
+            langchain_documents = self._load_pdf(source)
+        else:
+            storage = self._get_storage_adapter(source)
+            local_path = storage.local_path(source)
+            langchain_documents = (
+                self._load_pdf(local_path)
+                if local_path is not None
+                else self._parse_pdf_bytes(storage.read_bytes(source), source)
+            )
+        return [document for document in self._to_documents(langchain_documents, source) if document.id_ in wanted]
+
+    def _adopt_migration(self, migration: CollectionMigration, near_duplicate_index: Optional[SimHashIndex]) -> None:
+        """Points the source index (and near-duplicate index) at the nodes of the new collection."""
+        persist_path = self.config.get("documentStores.bookstore.props.path", "data")
+        source_index = self._get_source_index(persist_path)
+        for source in list(source_index.sources):
+            doc_ids = source_index.doc_ids(source)
+            nodes_by_doc = {doc_id: migration.node_ids[doc_id] for doc_id in doc_ids if doc_id in migration.node_ids}
+            source_index.update(source, doc_ids, nodes_by_doc)
+        source_index.save()
+        if near_duplicate_index is not None:
+            near_duplicate_index.save()
+            self._near_duplicate_indexes[migration.collection_name] = near_duplicate_index
+
+    def _snapshot_files(self, collection_name: str) -> dict[str, str]:
+        """Paths of the docstore files of the ingestion collection, by their name in snapshot bundles."""
+        persist_path = self.config.get("documentStores.bookstore.props.path", "data")
+        return {
+            "docstore.json": os.path.join(persist_path, "docstore.json"),
+            SourceIndex.FILE_NAME: os.path.join(persist_path, SourceIndex.FILE_NAME),
+            "near_duplicates.json": os.path.join(persist_path, "near_duplicates", f"{collection_name}.json"),
+        }
+
+    def _persist_empty_pipeline_cache(self) -> None:
+        """Creates the pipeline cache a restored store lacks, so IngestionPipeline.load accepts it."""
+        persist_path = self.config.get("documentStores.bookstore.props.path", "data")
+        cache_path = os.path.join(persist_path, DEFAULT_CACHE_NAME)
+        if not os.path.exists(cache_path):
+            IngestionCache().persist(cache_path)
+
+    def export_snapshot(self, path: str, collection_name: Optional[str] = None) -> int:
+        """
+        Writes a bundle of a collection's points with their vectors, its docstore, source index and
+        near-duplicate index, and the identity of the embedding model. Returns the number of points.
+
+        The pipeline lock is held throughout, so no ingestion can leave the parts out of step; ingestions
+        wait for the export to finish. Only the ingestion collection can be exported: the docstore and the
+        source index are those of `collections.book-library`.
+        """
+        collection_name = collection_name or self.config.get("collections.book-library", "book-library")
+        self._require_ingestion_collection(collection_name, "exported")
+        with self._pipeline_lock:
+            vector_size = self.vector_store_repo.get_vector_size(collection_name)
+            if vector_size is None:
+                raise ValueError(f"Collection {collection_name} does not exist")  # noqa: TRY003
+            manifest = SnapshotManifest(
+                collection_name=collection_name,
+                embedding_model=self.embeddings.get_model().model_name,
+                vector_size=vector_size,
+                datatype=VectorEncoding.from_config(self.config, collection_name).datatype,
+            )
+            with SnapshotWriter(path) as writer:
+                for points in self.vector_store_repo.scroll_points(collection_name):
+                    writer.add_points(points)
+                for name, local_path in self._snapshot_files(collection_name).items():
+                    if os.path.exists(local_path):
+                        writer.add_file(name, local_path)
+                writer.finish(manifest)
+        self.logger.info(f"Exported {manifest.points} points of {collection_name} to {path}")
+        return manifest.points
+
+    def import_snapshot(self, path: str, collection_name: Optional[str] = None, replace: bool = False) -> int:
+        """
+        Restores a bundle written by `export_snapshot` into `collection_name` (the exported one by default)
+        without embedding anything again. Returns the number of points.
+
+        Points are loaded into a new version of the collection; then, under the pipeline lock, the docstore
+        files are restored and the collection alias pointed at it, as at the end of a migration. An existing
+        collection is only replaced with `replace`, and deleted after the swap. Only the ingestion collection
+        can be restored, since the docstore files it overwrites are those of `collections.book-library`.
+        """
+        with SnapshotReader(path) as bundle:
+            manifest = bundle.manifest
+            collection_name = collection_name or manifest.collection_name
+            self._require_ingestion_collection(collection_name, "imported into")
+            model_name = self.embeddings.get_model().model_name
+            if manifest.embedding_model != model_name:
+                raise ValueError(  # noqa: TRY003
+                    f"Snapshot {path} holds {manifest.embedding_model} vectors, "
+                    f"but queries are embedded with {model_name}"
+                )
+            if not replace and self.vector_store_repo.collection_exist(collection_name):
+                raise ValueError(f"Collection {collection_name} already exists, import with replace")  # noqa: TRY003
+
+            target = CollectionMigration.next_version(collection_name, self.vector_store_repo.get_collections())
+            self.vector_store_repo.create_collection(target, manifest.vector_size, manifest.datatype)
+            for points in bundle.points():
+                self.vector_store_repo.upsert_points(target, points)
+                ProgressTracker.add(vectors_upserted=len(points))
+            self._create_payload_indexes(collection_name, target)
+
+            with self._pipeline_lock:
+                for name, local_path in self._snapshot_files(collection_name).items():
+                    if name in manifest.files:
+                        bundle.extract_file(name, local_path)
+                    elif os.path.exists(local_path):
+                        # Left over from the replaced collection, it would not match the restored one
+                        os.remove(local_path)
+                self._persist_empty_pipeline_cache()
+                self._source_index = None
+                self._near_duplicate_indexes.pop(collection_name, None)
+                previous = self.vector_store_repo.swap_alias(collection_name, target, replace_collection=replace)
+                if self.on_alias_swapped is not None:
+                    self.on_alias_swapped(collection_name)
+                if self.answer_cache is not None:
+                    self.answer_cache.clear()
+
+        if previous is not None and previous != collection_name:
+            self.vector_store_repo.delete_collection(previous)
+        self.logger.info(f"Imported {manifest.points} points of {manifest.collection_name} into {target}")
+        return manifest.points
+
+    def ingest_folder(self, folder_path: str, shard: Optional[Shard] = None) -> int:
+        """Ingests the PDFs of a folder; with a `shard`, only those whose relative path hashes to it."""
+        shard = shard or Shard()
+        pdf_filepaths = []
         for root, _, files in os.walk(folder_path):
             for file in files:
                 if file.endswith(".pdf"):
-                    self.logger.info(f"Ingesting {file} from {folder_path}")
                     pdf_filepath = os.path.join(root, file)
-                    self.ingest_pdf(pdf_filepath)
-                    num_files += 1
+                    # Relative paths keep the assignment stable across nodes mounting the folder elsewhere
+                    if shard.owns(os.path.relpath(pdf_filepath, folder_path)):
+                        pdf_filepaths.append(pdf_filepath)
                 else:
-                    self.logger.warn(f"Skipping non-pdf file: {file}")
+                    # Hot per-file message, sampled by structured loggers
+                    self.logger.debug(f"Skipping non-pdf file: {file}")
+
+        # Listing first gives the progress report a total to compute the ETA from
+        progress = ProgressTracker.current()
+        if progress is not None:
+            progress.set_total(len(pdf_filepaths))
+        num_files = 0
+        for pdf_filepath in pdf_filepaths:
+            self.logger.info(f"Ingesting {os.path.basename(pdf_filepath)} from {folder_path}")
+            self.ingest_pdf(pdf_filepath)
+            num_files += 1
+
+        shard_suffix = "" if shard.is_whole else f" as {shard}"
+        self.logger.info(f"Ingested {num_files} files from folder {folder_path}{shard_suffix}")
+        return num_files
 
-        self.logger.info(f"Ingested {num_files} files from folder {folder_path}")
+    def watch_folder(
+        self,
+        folder_path: str,
+        recursive: bool = True,
+        debounce_seconds: float = 2.0,
+        poll_interval: float = 5.0,
+        workers: int = 4,
+        stop_event: Optional[threading.Event] = None,
+    ) -> int:
+        """Ingests the PDFs created or modified in a folder until `stop_event` is set."""
+        url = f"file://{os.path.abspath(folder_path)}"
+        num_files = 0
+
+        changes = self.local_storage.watch(
+            url,
+            recursive=recursive,
+            suffix=".pdf",
+            debounce_seconds=debounce_seconds,
+            poll_interval=poll_interval,
+            stop_event=stop_event,
+        )
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="watch-ingest") as pool:
+            for batch in changes:
+                # Each batch is drained before taking the next one, so work queued in the pool stays bounded
+                futures = {
+                    pool.submit(contextvars.copy_context().run, self._apply_change, change): change for change in batch
+                }
+                for future in as_completed(futures):
+                    try:
+                        num_files += future.result()
+                    except Exception as e:
+                        self.logger.error(f"Failed to process {futures[future].url}", e)  # noqa: TRY400
+                        ProgressTracker.add(files_failed=1)
+
+        self.logger.info(f"Stopped watching {folder_path} after ingesting {num_files} files")
         return num_files
+
+    def _apply_change(self, change: FileChange) -> int:
+        path = change.url.removeprefix("file://")
+        if change.deleted:
+            self.logger.info(f"{path} was removed, deleting its chunks")
+            self.delete_document(path)
+            return 0
+
+        self.logger.info(f"Ingesting {change.kind} file {path}")
+        self.ingest_pdf(path, replace=True)
+        return 1
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class Reservation:
+    """Bytes of a budget held by one unit of work (a file being fetched, parsed and embedded)."""
+
+    def __init__(self, budget: MemoryBudget, size: int):
+        self.budget = budget
+        self.size = size
+
+    def resize(self, size: int) -> None:
+        """
+        Adjusts the reservation to a better estimate once the work is under way.
+
+        Never blocks: the memory is already in use by then, and waiting while holding it could deadlock
+        with other reservations. Only admission (`MemoryBudget.reserve`) applies backpressure.
+        """
+        self.budget._adjust(size - self.size)
+        self.size = size
+
+
+class MemoryBudget:
+    """
+    Process-wide cap on the bytes held by concurrent ingestions (fetched data, extracted text and
+    pending vectors).
+
+    New work waits in `reserve` while the budget is exhausted. A single reservation larger than the
+    whole budget is admitted when nothing else is held, so big files are slowed down, never stuck.
+    Reservations are reentrant within a thread or task: nested calls (a cloud download handing its
+    bytes to the PDF parser) share the outer reservation.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._used = 0
+        self._condition = threading.Condition()
+        self._current: ContextVar[Reservation | None] = ContextVar(f"memory_budget_{id(self)}", default=None)
+
+    @property
+    def used(self) -> int:
+        return self._used
+
+    def _acquire(self, size: int) -> None:
+        with self._condition:
+            self._condition.wait_for(lambda: self._used == 0 or self._used + size <= self.max_bytes)
+            self._used += size
+
+    def _adjust(self, delta: int) -> None:
+        with self._condition:
+            self._used += delta
+            if delta < 0:
+                self._condition.notify_all()
+
+    @contextmanager
+    def reserve(self, size: int) -> Iterator[Reservation]:
+        """Holds `size` bytes for the duration of the block, waiting for them if needed."""
+        current = self._current.get()
+        if current is not None:
+            if size > current.size:
+                current.resize(size)
+            yield current
+            return
+
+        self._acquire(size)
+        reservation = Reservation(self, size)
+        token = self._current.set(reservation)
+        try:
+            yield reservation
+        finally:
+            self._current.reset(token)
+            self._adjust(-reservation.size)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from llama_index.core.schema import NodeWithScore
+
+from files_ingestor.domain.model.vector_encoding import VectorEncoding
+from files_ingestor.domain.ports.config import ConfigPort
+from files_ingestor.domain.ports.logger_port import LoggerPort
+from files_ingestor.domain.ports.vectorstore import VectorStorePort
+
+# rrf only looks at ranks, so it is robust to collections scoring on different scales; score keeps
+# the similarity values, min-max normalized per collection
+FUSION_METHODS = ("rrf", "score")
+
+
+def fuse_results(
+    results: dict[str, list[NodeWithScore]], top_k: int, method: str = "rrf", rrf_k: int = 60
+) -> list[NodeWithScore]:
+    """
+    Merges the ranked nodes of several collections into one ranking of at most `top_k` nodes.
+
+    "rrf" (reciprocal rank fusion) scores a node with the sum of `1 / (rrf_k + rank)` over the collections
+    returning it. "score" rescales each collection's scores to [0, 1] and keeps the best one of a node.
+    The fused score replaces the score of the returned nodes.
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"Unknown fusion method: {method}")  # noqa: TRY003
+    fused: dict[str, float] = {}
+    nodes: dict[str, NodeWithScore] = {}
+    for ranked in results.values():
+        scores = [node.score or 0.0 for node in ranked]
+        low, high = min(scores, default=0.0), max(scores, default=0.0)
+        for rank, (node, score) in enumerate(zip(ranked, scores), start=1):
+            node_id = node.node.node_id
+            nodes.setdefault(node_id, node)
+            if method == "rrf":
+                fused[node_id] = fused.get(node_id, 0.0) + 1.0 / (rrf_k + rank)
+            else:
+                normalized = (score - low) / (high - low) if high > low else 1.0
+                fused[node_id] = max(fused.get(node_id, 0.0), normalized)
+
+    # sorted() is stable: ties keep the order of the collections
+    best = sorted(fused, key=lambda node_id: fused[node_id], reverse=True)[:top_k]
+    for node_id in best:
+        nodes[node_id].score = fused[node_id]
+    return [nodes[node_id] for node_id in best]
+
+
+class MultiCollectionSearch:
+    """
+    Searches one query vector in several collections at once through the async vector store client,
+    then fuses the per-collection rankings.
+
+    Each collection gets `timeout_seconds`; one that is slower or fails is logged and left out of the
+    results, so the latency of a search is that of the slowest collection, never the sum.
+
+    The vector size of each collection is read once, then cached until `invalidate_vector_sizes` (called
+    when a collection alias is swapped) or until a search in the collection fails.
+    """
+
+    def __init__(
+        self,
+        vector_store: VectorStorePort,
+        logger: LoggerPort,
+        timeout_seconds: float = 5.0,
+        fusion: str = "rrf",
+        rrf_k: int = 60,
+    ):
+        if fusion not in FUSION_METHODS:
+            raise ValueError(f"Unknown fusion method: {fusion}")  # noqa: TRY003
+        self.vector_store = vector_store
+        self.logger = logger
+        self.timeout_seconds = timeout_seconds
+        self.fusion = fusion
+        self.rrf_k = rrf_k
+        self._vector_sizes: dict[str, int] = {}
+
+    @classmethod
+    def from_config(
+        cls, config: ConfigPort, vector_store: VectorStorePort, logger: LoggerPort, key: str = "query.multi_collection"
+    ) -> MultiCollectionSearch:
+        return cls(
+            vector_store,
+            logger,
+            timeout_seconds=config.get(f"{key}.timeout_seconds", 5.0),
+            fusion=config.get(f"{key}.fusion", "rrf"),
+            rrf_k=config.get(f"{key}.rrf_k", 60),
+        )
+
+    def invalidate_vector_sizes(self, collection_name: str | None = None) -> None:
+        """Forgets the cached vector size of a collection (of all of them with None), e.g. once its alias moved."""
+        if collection_name is None:
+            self._vector_sizes.clear()
+        else:
+            self._vector_sizes.pop(collection_name, None)
+
+    async def search(
+        self,
+        vector: list[float],
+        collection_names: list[str],
+        top_k: int,
+        filters: dict[str, Any] | None = None,
+        fusion: str | None = None,
+    ) -> list[NodeWithScore]:
+        """
+        Searches the `top_k` nodes closest to a full model embedding in every collection, truncated to the
+        dimensions of each, and returns the `top_k` best after fusion. Nodes carry their collection in
+        the "collection" metadata key.
+        """
+        rankings = await asyncio.gather(
+            *(self._search_collection(name, vector, top_k, filters) for name in collection_names)
+        )
+        return fuse_results(dict(zip(collection_names, rankings)), top_k, fusion or self.fusion, self.rrf_k)
+
+    async def _search_collection(
+        self, collection_name: str, vector: list[float], top_k: int, filters: dict[str, Any] | None
+    ) -> list[NodeWithScore]:
+        try:
+            nodes = await asyncio.wait_for(
+                self._search(collection_name, vector, top_k, filters), timeout=self.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            self.logger.warn(f"Search in {collection_name} timed out after {self.timeout_seconds}s, skipping it")
+            return []
+        except Exception as e:
+            self.logger.error(f"Search in {collection_name} failed, skipping it", e)  # noqa: TRY400
+            # The collection may have been replaced behind its alias, with another size
+            self.invalidate_vector_sizes(collection_name)
+            return []
+        for node in nodes:
+            node.node.metadata["collection"] = collection_name
+        return nodes
+
+    async def _search(
+        self, collection_name: str, vector: list[float], top_k: int, filters: dict[str, Any] | None
+    ) -> list[NodeWithScore]:
+        # Collections may be truncated to fewer dimensions than the model produces (see VectorEncoding)
+        dimensions = self._vector_sizes.get(collection_name)
+        if dimensions is None:
+            dimensions = await asyncio.to_thread(self.vector_store.get_vector_size, collection_name)
+            if dimensions is not None:
+                self._vector_sizes[collection_name] = dimensions
+        query = VectorEncoding(dimensions=dimensions).truncate(vector)
+        (nodes,) = await self.vector_store.asearch_batch(collection_name, [query], top_k, filters)
+        return nodes
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.schema import BaseNode, MetadataMode, TransformComponent
+
+SIGNATURE_BITS = 64
+_WORD_RE = re.compile(r"\w+")
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """64-bit SimHash of the word shingles of a text; similar texts get signatures a few bits apart."""
+    words = _WORD_RE.findall(text.lower())
+    shingles = [" ".join(words[i : i + shingle_size]) for i in range(max(len(words) - shingle_size + 1, 1))]
+    weights = [0] * SIGNATURE_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        for bit in range(SIGNATURE_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+class SimHashIndex:
+    """
+    Persistent LSH index of chunk signatures for one collection.
+
+    Signatures are split in `max_distance + 1` bands, so by the pigeonhole principle any two
+    signatures within `max_distance` bits share at least one band and are always found.
+    """
+
+    def __init__(self, path: str, max_distance: int = 3):
+        self.path = path
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self.band_bits = SIGNATURE_BITS // self.bands
+        self.signatures: dict[str, int] = {}
+        self.links: dict[str, str] = {}
+        self._buckets: dict[tuple[int, int], set[str]] = {}
+
+    @classmethod
+    def load(cls, path: str, max_distance: int = 3) -> SimHashIndex:
+        index = cls(path, max_distance)
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            index.links = data.get("links", {})
+            for node_id, signature in data.get("signatures", {}).items():
+                index.add(node_id, int(signature, 16))
+        return index
+
+    def _band_keys(self, signature: int) -> Iterable[tuple[int, int]]:
+        mask = (1 << self.band_bits) - 1
+        for band in range(self.bands):
+            yield band, signature >> (band * self.band_bits) & mask
+
+    def find(self, signature: int) -> str | None:
+        """Returns the ID of an indexed chunk within `max_distance` bits, if any."""
+        for key in self._band_keys(signature):
+            for node_id in self._buckets.get(key, ()):
+                if (self.signatures[node_id] ^ signature).bit_count() <= self.max_distance:
+                    return node_id
+        return None
+
+    def add(self, node_id: str, signature: int) -> None:
+        self.signatures[node_id] = signature
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, set()).add(node_id)
+
+    def remove(self, node_ids: Iterable[str]) -> None:
+        removed = set(node_ids)
+        for node_id in removed:
+            signature = self.signatures.pop(node_id, None)
+            if signature is None:
+                continue
+            for key in self._band_keys(signature):
+                self._buckets.get(key, set()).discard(node_id)
+        self.links = {dup: canonical for dup, canonical in self.links.items() if canonical not in removed}
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "signatures": {node_id: f"{signature:016x}" for node_id, signature in self.signatures.items()},
+                    "links": self.links,
+                },
+                f,
+            )
+        os.replace(tmp_path, self.path)
+
+
+class NearDuplicateFilter(TransformComponent):
+    """
+    Pipeline stage between the splitter and the embedding model that suppresses near-duplicate chunks.
+
+    In "drop" mode duplicates are discarded; in "link" mode they are discarded as well but the
+    index keeps which chunk (source and page) duplicated which stored node, for provenance.
+    Either way no embedding is computed and no vector is stored for them.
+
+    The signatures of kept chunks are staged until `commit`, called once their vectors are stored:
+    a run failing later (embedding, upsert) must not leave chunks matching vectors that do not exist.
+    """
+
+    mode: str = "drop"
+    _index: SimHashIndex = PrivateAttr()
+    _staged: SimHashIndex = PrivateAttr()
+    _skipped: int = PrivateAttr(default=0)
+    _staged_skipped: int = PrivateAttr(default=0)
+
+    def __init__(self, index: SimHashIndex, mode: str = "drop", **kwargs: Any):
+        if mode not in ("drop", "link"):
+            raise ValueError(f"Unknown near-duplicate mode: {mode}")  # noqa: TRY003
+        super().__init__(**kwargs)
+        self.mode = mode
+        self._index = index
+        self._staged = SimHashIndex(index.path, index.max_distance)
+
+    @property
+    def skipped(self) -> int:
+        """Chunks suppressed by committed runs, i.e. embeddings computed and vectors stored less."""
+        return self._skipped
+
+    def commit(self) -> None:
+        """Adds the staged signatures and links to the index, once the kept chunks are stored."""
+        for node_id, signature in self._staged.signatures.items():
+            self._index.add(node_id, signature)
+        self._index.links.update(self._staged.links)
+        self._skipped += self._staged_skipped
+        self.discard()
+
+    def discard(self) -> None:
+        """Drops what was staged by a failed run, so a retry stores its chunks."""
+        self._staged = SimHashIndex(self._index.path, self._index.max_distance)
+        self._staged_skipped = 0
+
+    def __call__(self, nodes: Sequence[BaseNode], **kwargs: Any) -> list[BaseNode]:
+        kept = []
+        for node in nodes:
+            signature = simhash(node.get_content(metadata_mode=MetadataMode.NONE))
+            duplicate_of = self._index.find(signature) or self._staged.find(signature)
+            if duplicate_of is None:
+                self._staged.add(node.node_id, signature)
+                kept.append(node)
+                continue
+
+            self._staged_skipped += 1
+            if self.mode == "link":
+                page = node.metadata.get("page", "")
+                self._staged.links[f"{node.metadata.get('source', node.ref_doc_id)}#page={page}"] = duplicate_of
+        return kept
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from llama_index.core.schema import BaseNode, TransformComponent
+
+COUNTERS = ("files_done", "files_failed", "pages", "chunks_embedded", "vectors_upserted", "bytes_downloaded")
+RATE_COUNTERS = {
+    "files_per_second": "files_done",
+    "chunks_per_second": "chunks_embedded",
+    "vectors_per_second": "vectors_upserted",
+    "bytes_per_second": "bytes_downloaded",
+}
+
+
+class IngestionProgress:
+    """
+    Live counters of one ingestion job, with rates over a sliding window and an ETA.
+
+    Rates are computed over the last `window_seconds`, so they reflect the current throughput rather
+    than the average since the start; `seconds_since_progress` growing while the job runs is a stall.
+    """
+
+    def __init__(self, job_id: str, command: str, window_seconds: float = 30.0):
+        self.job_id = job_id
+        self.command = command
+        self.window_seconds = window_seconds
+        self.status = "running"
+        self.error: str | None = None
+        self.files_total: int | None = None
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.started_at = time.time()
+        self.updated_at = self.started_at
+        self._samples: deque[tuple[float, dict[str, int]]] = deque([(time.monotonic(), dict(self.counters))])
+        self._lock = threading.Lock()
+
+    def add(self, **increments: int) -> None:
+        """Adds to the counters, e.g. `add(files_done=1, bytes_downloaded=size)`."""
+        now = time.monotonic()
+        with self._lock:
+            for counter, increment in increments.items():
+                self.counters[counter] += increment
+            self.updated_at = time.time()
+            self._samples.append((now, dict(self.counters)))
+            while len(self._samples) > 2 and now - self._samples[1][0] > self.window_seconds:
+                self._samples.popleft()
+
+    def set_total(self, files_total: int) -> None:
+        with self._lock:
+            self.files_total = files_total
+
+    def finish(self, error: BaseException | None = None) -> None:
+        with self._lock:
+            self.status = "failed" if error is not None else "succeeded"
+            self.error = str(error) if error is not None else None
+            self.updated_at = time.time()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def snapshot(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            (first_at, first), (last_at, last) = self._samples[0], self._samples[-1]
+            # While running, the window extends to now so rates decay when nothing happens
+            elapsed = max((last_at if self.finished else now) - first_at, 1e-9)
+            rates = {rate: (last[counter] - first[counter]) / elapsed for rate, counter in RATE_COUNTERS.items()}
+            eta = None
+            if self.files_total is not None and rates["files_per_second"] > 0:
+                remaining = self.files_total - self.counters["files_done"] - self.counters["files_failed"]
+                eta = max(remaining, 0) / rates["files_per_second"]
+            return {
+                "job_id": self.job_id,
+                "command": self.command,
+                "status": self.status,
+                "error": self.error,
+                "started_at": self.started_at,
+                "updated_at": self.updated_at,
+                "elapsed_seconds": time.time() - self.started_at,
+                "seconds_since_progress": time.time() - self.updated_at,
+                "files_total": self.files_total,
+                **self.counters,
+                "rates": rates,
+                "eta_seconds": eta,
+            }
+
+
+_current: ContextVar[IngestionProgress | None] = ContextVar("ingestion_progress", default=None)
+
+
+class ProgressTracker:
+    """Registry of the progress of running and recently finished ingestions, by job id."""
+
+    def __init__(self, max_finished: int = 100):
+        self.max_finished = max_finished
+        self._jobs: OrderedDict[str, IngestionProgress] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def expect(self, job_id: str, command: str) -> IngestionProgress:
+        """Registers a job that will start soon (e.g. in a background thread), so it can be polled right away."""
+        progress = IngestionProgress(job_id, command)
+        progress.status = "queued"
+        with self._lock:
+            self._jobs[job_id] = progress
+            finished = [job for job, job_progress in self._jobs.items() if job_progress.finished]
+            for job in finished[: max(len(finished) - self.max_finished, 0)]:
+                del self._jobs[job]
+        return progress
+
+    @contextmanager
+    def track(self, job_id: str, command: str) -> Iterator[IngestionProgress]:
+        """Runs a job, registered if it was not expected, as the current one of the calling thread or task."""
+        progress = self._jobs.get(job_id)
+        if progress is None or progress.status != "queued":
+            progress = self.expect(job_id, command)
+        progress.status = "running"
+        token = _current.set(progress)
+        try:
+            yield progress
+        except BaseException as e:
+            progress.finish(e)
+            raise
+        else:
+            progress.finish()
+        finally:
+            _current.reset(token)
+
+    def get(self, job_id: str) -> IngestionProgress | None:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> list[IngestionProgress]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    @staticmethod
+    def current() -> IngestionProgress | None:
+        return _current.get()
+
+    @staticmethod
+    def add(**increments: int) -> None:
+        """Adds to the counters of the current job, if any."""
+        progress = _current.get()
+        if progress is not None:
+            progress.add(**increments)
+
+
+class ProgressCounter(TransformComponent):
+    """Last pipeline stage before the vector store, counting the chunks embedded as batches go through."""
+
+    def __call__(self, nodes: Sequence[BaseNode], **kwargs: Any) -> Sequence[BaseNode]:
+        ProgressTracker.add(chunks_embedded=len(nodes))
+        return nodes
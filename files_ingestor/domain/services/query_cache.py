@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from llama_index.core.bridge.pydantic import PrivateAttr
+
+from files_ingestor.domain.ports.config import ConfigPort
+
+
+class QueryEmbeddingCache:
+    """
+    In-process LRU of query vectors keyed by (model, normalized query).
+
+    With a `path`, entries are also kept in a SQLite file that processes on the same host can share,
+    so a restarted or new worker starts warm. Both tiers evict their least recently used entries
+    beyond their limit. Vectors are stored as float32, the precision of the vector store.
+    """
+
+    def __init__(self, max_entries: int = 10000, path: str | None = None, max_disk_entries: int = 100000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._puts = 0
+        if path is not None:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS query_embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL, used_at REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS query_embeddings_used_at ON query_embeddings (used_at)")
+
+    @classmethod
+    def from_config(cls, config: ConfigPort, key: str = "query.embedding_cache") -> QueryEmbeddingCache | None:
+        if not config.get(f"{key}.enabled", False):
+            return None
+        return cls(
+            max_entries=config.get(f"{key}.max_entries", 10000),
+            path=config.get(f"{key}.path", "") or None,
+            max_disk_entries=config.get(f"{key}.max_disk_entries", 100000),
+        )
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Folds case, Unicode forms and whitespace, so trivially different spellings share a vector."""
+        return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+
+    @classmethod
+    def key(cls, model: str, query: str) -> str:
+        return hashlib.sha1(f"{model}\0{cls.normalize(query)}".encode(), usedforsecurity=False).hexdigest()
+
+    def get(self, model: str, query: str) -> list[float] | None:
+        key = self.key(model, query)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+            if self._db is not None:
+                row = self._db.execute("SELECT vector FROM query_embeddings WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE query_embeddings SET used_at = ? WHERE key = ?", (time.time(), key))
+                    vector = array("f", row[0]).tolist()
+                    self._remember(key, vector)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return vector
+            self.misses += 1
+            return None
+
+    def put(self, model: str, query: str, vector: list[float]) -> None:
+        key = self.key(model, query)
+        with self._lock:
+            self._remember(key, vector)
+            if self._db is None:
+                return
+            self._db.execute(
+                "INSERT OR REPLACE INTO query_embeddings (key, vector, used_at) VALUES (?, ?, ?)",
+                (key, array("f", vector).tobytes(), time.time()),
+            )
+            self._puts += 1
+            # Counting rows on every write would be wasteful; the file may overshoot by a hundred entries
+            if self._puts % 100 == 0:
+                self._evict_disk()
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        (count,) = self._db.execute("SELECT COUNT(*) FROM query_embeddings").fetchone()  # type: ignore  # noqa: PGH003
+        if count > self.max_disk_entries:
+            self._db.execute(  # type: ignore  # noqa: PGH003
+                "DELETE FROM query_embeddings WHERE key IN (SELECT key FROM query_embeddings ORDER BY used_at LIMIT ?)",
+                (count - self.max_disk_entries,),
+            )
+
+    def metrics(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+class CachedQueryEmbedding(BaseEmbedding):
+    """
+    Embedding model answering repeated queries from a QueryEmbeddingCache; texts (ingestion) pass through.
+
+    It wraps the raw model, below any truncation to a collection's dimensions, so one entry serves
+    every collection embedded with the same model.
+    """
+
+    _embed_model: BaseEmbedding = PrivateAttr()
+    _cache: QueryEmbeddingCache = PrivateAttr()
+
+    def __init__(self, embed_model: BaseEmbedding, cache: QueryEmbeddingCache, **kwargs: Any):
+        super().__init__(model_name=embed_model.model_name, embed_batch_size=embed_model.embed_batch_size, **kwargs)
+        self._embed_model = embed_model
+        self._cache = cache
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedQueryEmbedding"
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        vector = self._cache.get(self.model_name, query)
+        if vector is None:
+            vector = self._embed_model._get_query_embedding(query)
+            self._cache.put(self.model_name, query, vector)
+        return vector
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        vector = self._cache.get(self.model_name, query)
+        if vector is None:
+            vector = await self._embed_model._aget_query_embedding(query)
+            self._cache.put(self.model_name, query, vector)
+        return vector
+
+    def get_query_embeddings(self, queries: list[str]) -> list[Embedding]:
+        """
+        Embeds a batch of queries, sending only the cache misses to the model, concurrently and through
+        the same query path as single queries, so both get (and cache) the same vectors.
+        """
+        vectors = [self._cache.get(self.model_name, query) for query in queries]
+        misses = [i for i, vector in enumerate(vectors) if vector is None]
+        for i, vector in zip(misses, embed_queries(self, [queries[i] for i in misses])):
+            vectors[i] = vector
+        return vectors  # type: ignore  # noqa: PGH003
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._embed_model._get_text_embedding(text)
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[Embedding]:
+        return self._embed_model._get_text_embeddings(texts)
+
+    async def _aget_text_embeddings(self, texts: list[str]) -> list[Embedding]:
+        return await self._embed_model._aget_text_embeddings(texts)
+
+
+def embed_queries(embed_model: BaseEmbedding, queries: list[str], max_concurrency: int = 8) -> list[Embedding]:
+    """
+    Embeds queries through the public query path of the model, so a batch gets the same vectors as
+    single questions (query instructions included), with up to `max_concurrency` requests in flight.
+    """
+    if len(queries) <= 1:
+        return [embed_model.get_query_embedding(query) for query in queries]
+    with ThreadPoolExecutor(
+        max_workers=min(len(queries), max_concurrency), thread_name_prefix="query-embedding"
+    ) as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, embed_model.get_query_embedding, query) for query in queries
+        ]
+        return [future.result() for future in futures]
+
+
+def cache_query_embeddings(embed_model: BaseEmbedding, cache: QueryEmbeddingCache | None) -> BaseEmbedding:
+    """Wraps a model with the query cache, when there is one."""
+    return embed_model if cache is None else CachedQueryEmbedding(embed_model, cache)
@@ -0,0 +1,239 @@
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from llama_index.core import get_response_synthesizer
+from llama_index.core.postprocessor.types import BaseNodePostprocessor
+from llama_index.core.response_synthesizers import BaseSynthesizer, ResponseMode
+from llama_index.core.schema import NodeWithScore, QueryBundle
+from llama_index.core.utils import get_tokenizer
+
+from files_ingestor.domain.model.answer import QuestionAnswer, RetrievedNode
+from files_ingestor.domain.model.query_settings import QuerySettings
+from files_ingestor.domain.model.vector_encoding import VectorEncoding
+from files_ingestor.domain.ports.config import ConfigPort
+from files_ingestor.domain.ports.embedding_model import EmbeddingModelPort
+from files_ingestor.domain.ports.llm import FunctionCallingLLMPort
+from files_ingestor.domain.ports.logger_port import LoggerPort, log_context
+from files_ingestor.domain.ports.vectorstore import VectorStorePort
+from files_ingestor.domain.services.answer_cache import AnswerCache
+from files_ingestor.domain.services.multi_collection import MultiCollectionSearch
+from files_ingestor.domain.services.query_cache import CachedQueryEmbedding, QueryEmbeddingCache, embed_queries
+
+
+def limit_context_tokens(
+    nodes: list[NodeWithScore], max_tokens: Optional[int], tokenizer: Optional[Callable[[str], list]] = None
+) -> list[NodeWithScore]:
+    """Keeps the leading (best scored) nodes whose text fits in `max_tokens`; the first one is always kept."""
+    if max_tokens is None:
+        return nodes
+    tokenizer = tokenizer or get_tokenizer()
+    kept: list[NodeWithScore] = []
+    used = 0
+    for node in nodes:
+        tokens = len(tokenizer(node.node.get_content()))
+        if kept and used + tokens > max_tokens:
+            break
+        kept.append(node)
+        used += tokens
+    return kept
+
+
+class ContextTokenLimit(BaseNodePostprocessor):
+    """Query engine stage capping the retrieved text passed to the LLM, see `limit_context_tokens`."""
+
+    max_tokens: int
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "ContextTokenLimit"
+
+    def _postprocess_nodes(
+        self, nodes: list[NodeWithScore], query_bundle: Optional[QueryBundle] = None
+    ) -> list[NodeWithScore]:
+        return limit_context_tokens(nodes, self.max_tokens)
+
+
+class QuestionService:
+    """Answers questions over a collection: retrieval from the vector store, then synthesis by the LLM."""
+
+    def __init__(
+        self,
+        logger: LoggerPort,
+        config: ConfigPort,
+        vector_store_repo: VectorStorePort,
+        embeddings_port: EmbeddingModelPort,
+        llm: FunctionCallingLLMPort,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+        answer_cache: Optional[AnswerCache] = None,
+    ):
+        self.logger = logger
+        self.config = config
+        self.vector_store_repo = vector_store_repo
+        self.embeddings = embeddings_port
+        self.llm = llm
+        self.query_cache = query_cache
+        # Sits between retrieval and synthesis: the same question over the same nodes is answered once
+        self.answer_cache = answer_cache
+        self.multi_collection = MultiCollectionSearch.from_config(config, vector_store_repo, logger)
+
+    def use_embeddings(self, embeddings_port: EmbeddingModelPort) -> None:
+        """Embeds questions with another model from now on, e.g. once a migration moved the collection to it."""
+        self.embeddings = embeddings_port
+        self.logger.info(f"Embedding questions with {embeddings_port.get_model().model_name}")
+
+    def _collection_name(self, collection_name: Optional[str]) -> str:
+        return collection_name or self.config.get("collections.book-library", "book-library")
+
+    def _get_synthesizer(self, response_mode: str) -> BaseSynthesizer:
+        return get_response_synthesizer(response_mode=ResponseMode(response_mode), llm=self.llm.get_model("llamaindex"))
+
+    def embed_questions(self, collection_name: str, questions: list[str]) -> list[list[float]]:
+        """Embeds all the questions concurrently, in the (possibly truncated) space of the collection."""
+        encoding = VectorEncoding(dimensions=self.vector_store_repo.get_vector_size(collection_name))
+        return [encoding.truncate(vector) for vector in self._embed(questions)]
+
+    def _embed(self, questions: list[str]) -> list[list[float]]:
+        """Embeds the questions at the full dimensions of the model, as queries, like single questions are."""
+        if self.query_cache is not None:
+            # Only the questions missing from the cache reach the backend
+            return CachedQueryEmbedding(self.embeddings.get_model(), self.query_cache).get_query_embeddings(questions)
+        return embed_queries(self.embeddings.get_model(), questions)
+
+    def ask_batch(
+        self,
+        questions: list[str],
+        collection_name: Optional[str] = None,
+        top_k: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        filters: Optional[dict[str, Any]] = None,
+        response_mode: Optional[str] = None,
+        max_context_tokens: Optional[int] = None,
+    ) -> list[QuestionAnswer]:
+        """
+        Answers several questions with concurrent query embeddings and one batched search, then synthesizes the
+        answers concurrently, at most `max_concurrency` at a time so the LLM backend is not flooded.
+        `filters` scope the search to nodes with the given metadata values, e.g. {"source": "moby-dick.pdf"}.
+        `top_k`, `response_mode` and `max_context_tokens` override the collection's query settings.
+        """
+        if not questions:
+            return []
+        collection_name = self._collection_name(collection_name)
+        settings = QuerySettings.from_config(self.config, collection_name).override(
+            top_k, response_mode, max_context_tokens
+        )
+        max_concurrency = max_concurrency or self.config.get("query.batch.max_concurrency", 4)
+
+        start = time.perf_counter()
+        vectors = self.embed_questions(collection_name, questions)
+        embedded_at = time.perf_counter()
+        results = self.vector_store_repo.search_batch(collection_name, vectors, settings.similarity_top_k, filters)
+        searched_at = time.perf_counter()
+        shared = {"embed_seconds": embedded_at - start, "search_seconds": searched_at - embedded_at}
+        self.logger.info(
+            f"Embedded and searched {len(questions)} questions in {collection_name} in {searched_at - start:.3f}s"
+        )
+
+        synthesizer = self._get_synthesizer(settings.response_mode)
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="synthesis") as pool:
+            futures = [
+                pool.submit(
+                    contextvars.copy_context().run,
+                    self._synthesize,
+                    synthesizer,
+                    settings.response_mode,
+                    question,
+                    limit_context_tokens(nodes, settings.max_context_tokens),
+                    start,
+                    searched_at,
+                )
+                for question, nodes in zip(questions, results)
+            ]
+            answers = [future.result() for future in futures]
+        for answer in answers:
+            answer.timings = {**shared, **answer.timings}
+        return answers
+
+    def retrieve(
+        self,
+        query: str,
+        collection_name: Optional[str] = None,
+        top_k: Optional[int] = None,
+        filters: Optional[dict[str, Any]] = None,
+    ) -> list[RetrievedNode]:
+        """Returns the chunks closest to a query with their scores, without involving the LLM."""
+        collection_name = self._collection_name(collection_name)
+        settings = QuerySettings.from_config(self.config, collection_name).override(similarity_top_k=top_k)
+        vectors = self.embed_questions(collection_name, [query])
+        (nodes,) = self.vector_store_repo.search_batch(collection_name, vectors, settings.similarity_top_k, filters)
+        return [self._retrieved(node) for node in nodes]
+
+    async def aretrieve_collections(
+        self,
+        query: str,
+        collection_names: Optional[list[str]] = None,
+        top_k: Optional[int] = None,
+        filters: Optional[dict[str, Any]] = None,
+        fusion: Optional[str] = None,
+    ) -> list[RetrievedNode]:
+        """
+        Returns the chunks closest to a query across several collections (the agent's `useCollections` by
+        default), searched concurrently and fused into one ranking of `top_k` chunks.
+        """
+        collection_names = collection_names or self.config.get("agent.useCollections", [])
+        if not collection_names:
+            raise ValueError("No collections to retrieve from")  # noqa: TRY003
+        top_k = top_k or self.config.get("query.similarity_top_k", 5)
+        # Embedded once at full dimensions, each collection truncates it to its own
+        (vector,) = await asyncio.to_thread(self._embed, [query])
+        nodes = await self.multi_collection.search(vector, collection_names, top_k, filters, fusion)
+        return [self._retrieved(node) for node in nodes]
+
+    @staticmethod
+    def _retrieved(node: NodeWithScore) -> RetrievedNode:
+        return RetrievedNode(node.node.node_id, node.score, node.node.get_content(), dict(node.node.metadata))
+
+    def _synthesize(
+        self,
+        synthesizer: BaseSynthesizer,
+        response_mode: str,
+        question: str,
+        nodes: list[NodeWithScore],
+        batch_start: float,
+        searched_at: float,
+    ) -> QuestionAnswer:
+        synthesis_start = time.perf_counter()
+        answer = QuestionAnswer(question=question, answer=None, sources=[self._source(node) for node in nodes])
+        node_ids = [node.node.node_id for node in nodes]
+        model_name = str(self.llm.model_name)
+        with log_context(question=question[:80]):
+            try:
+                if self.answer_cache is not None:
+                    answer.answer = self.answer_cache.get(question, node_ids, model_name, response_mode)
+                    answer.cached = answer.answer is not None
+                if answer.answer is None:
+                    answer.answer = str(synthesizer.synthesize(question, nodes=nodes))
+                    if self.answer_cache is not None:
+                        self.answer_cache.put(question, node_ids, model_name, response_mode, answer.answer)
+            except Exception as e:
+                # One failed synthesis must not fail the rest of the batch
+                self.logger.error("Error synthesizing an answer", e)  # noqa: TRY400
+                answer.error = str(e)
+        end = time.perf_counter()
+        answer.timings = {
+            "queue_seconds": synthesis_start - searched_at,
+            "synthesis_seconds": end - synthesis_start,
+            "total_seconds": end - batch_start,
+        }
+        return answer
+
+    @staticmethod
+    def _source(node: NodeWithScore) -> dict[str, Any]:
+        return {
+            "node_id": node.node.node_id,
+            "score": node.score,
+            "source": node.node.metadata.get("source"),
+            "page": node.node.metadata.get("page"),
+        }
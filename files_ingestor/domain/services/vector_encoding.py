@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import heapq
+import operator
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from llama_index.core.base.embeddings.base import BaseEmbedding, Embedding
+from llama_index.core.bridge.pydantic import PrivateAttr
+
+from files_ingestor.domain.model.vector_encoding import VectorEncoding
+
+
+class EncodedEmbedding(BaseEmbedding):
+    """
+    Embedding model that truncates the vectors of a wrapped model to the dimensions of a collection.
+
+    The same wrapper is used to embed chunks at ingestion time and questions at query time, so both
+    sides always live in the same (truncated) space. Precision is left to the vector store.
+    """
+
+    _embed_model: BaseEmbedding = PrivateAttr()
+    _encoding: VectorEncoding = PrivateAttr()
+
+    def __init__(self, embed_model: BaseEmbedding, encoding: VectorEncoding, **kwargs: Any):
+        super().__init__(model_name=embed_model.model_name, embed_batch_size=embed_model.embed_batch_size, **kwargs)
+        self._embed_model = embed_model
+        self._encoding = encoding
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "EncodedEmbedding"
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        return self._encoding.truncate(self._embed_model._get_query_embedding(query))
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        return self._encoding.truncate(await self._embed_model._aget_query_embedding(query))
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._encoding.truncate(self._embed_model._get_text_embedding(text))
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[Embedding]:
+        return [self._encoding.truncate(vector) for vector in self._embed_model._get_text_embeddings(texts)]
+
+    async def _aget_text_embeddings(self, texts: list[str]) -> list[Embedding]:
+        return [self._encoding.truncate(vector) for vector in await self._embed_model._aget_text_embeddings(texts)]
+
+
+def encode_embed_model(embed_model: BaseEmbedding, encoding: VectorEncoding) -> BaseEmbedding:
+    """Wraps a model only when the encoding truncates its vectors."""
+    return embed_model if encoding.dimensions is None else EncodedEmbedding(embed_model, encoding)
+
+
+@dataclass(frozen=True)
+class EncodingReportRow:
+    encoding: VectorEncoding
+    bytes_per_vector: int
+    recall: float
+
+
+def _top_k(query: Sequence[float], corpus: Sequence[Sequence[float]], k: int) -> set[int]:
+    # Vectors are unit length (or close to it after quantization), so the dot product ranks like cosine
+    scores = ((sum(map(operator.mul, query, vector)), i) for i, vector in enumerate(corpus))
+    return {i for _, i in heapq.nlargest(k, scores)}
+
+
+def encoding_report(
+    corpus_vectors: Sequence[Sequence[float]],
+    query_vectors: Sequence[Sequence[float]],
+    encodings: Sequence[VectorEncoding],
+    k: int = 10,
+) -> list[EncodingReportRow]:
+    """
+    Measures recall@k of each encoding against exact float32 search at full dimensions.
+
+    Both the corpus and the held-out queries must be full model embeddings; each encoding is applied
+    to both sides, as it would be at ingestion and query time.
+    """
+    if not corpus_vectors or not query_vectors:
+        raise ValueError("The report needs at least one corpus vector and one query")  # noqa: TRY003
+
+    model_dimensions = len(corpus_vectors[0])
+    exact = [_top_k(query, corpus_vectors, k) for query in query_vectors]
+    rows = []
+    for encoding in encodings:
+        encoded_corpus = [encoding.encode(vector) for vector in corpus_vectors]
+        hits = sum(
+            len(_top_k(encoding.encode(query), encoded_corpus, k) & expected)
+            for query, expected in zip(query_vectors, exact)
+        )
+        rows.append(
+            EncodingReportRow(
+                encoding=encoding,
+                bytes_per_vector=encoding.bytes_per_vector(model_dimensions),
+                recall=hits / sum(len(expected) for expected in exact),
+            )
+        )
+    return rows
@@ -0,0 +1,69 @@
+"""
+Compares vector encodings on a held-out query set before choosing one for a collection.
+
+Chunks are sampled from the ingested pages in the docstore and embedded at full precision together
+with the queries; every encoding is then scored by its recall@k against exact float32 search:
+
+    encoding_report --queries heldout.txt --encodings full/float16 full/int8 512d/float16 256d/int8
+"""
+
+import argparse
+import os
+import random
+
+from llama_index.core.storage.docstore.simple_docstore import SimpleDocumentStore
+
+from files_ingestor.adapters.config import ConfigConfig
+from files_ingestor.adapters.embedding_models.ollama import OllamaEmbeddingModel
+from files_ingestor.domain.model.vector_encoding import VectorEncoding
+from files_ingestor.domain.ports.config import ConfigPort
+from files_ingestor.domain.services.chunking import get_splitter
+from files_ingestor.domain.services.vector_encoding import encoding_report
+
+DEFAULT_ENCODINGS = ["full/float16", "full/int8", "512d/float32", "512d/float16", "512d/int8", "256d/int8"]
+
+
+def sample_chunks(config: ConfigPort, collection_name: str, max_chunks: int, seed: int = 0) -> list[str]:
+    """Splits the ingested pages like the collection does and samples up to `max_chunks` of them."""
+    persist_path = config.get("documentStores.bookstore.props.path", "data")
+    docstore = SimpleDocumentStore.from_persist_path(
+        os.path.join(persist_path, "docstore.json"), namespace=config.get("documentStores.bookstore.name", "")
+    )
+    chunking_key = f"vectorstore.qdrant.collections.{collection_name}.chunking"
+    splitter = get_splitter(
+        config.get(f"{chunking_key}.strategy", "sentence"),
+        config.get(f"{chunking_key}.chunk_size", 512),
+        config.get(f"{chunking_key}.chunk_overlap", 128),
+    )
+    chunks = [node.get_content() for node in splitter(list(docstore.docs.values()))]
+    # A seeded, reproducible sample of the chunks to measure recall on, nothing security related
+    return random.Random(seed).sample(chunks, min(max_chunks, len(chunks)))  # noqa: S311
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", required=True, help="Held-out questions, one per line")
+    parser.add_argument("--collection", default="book-library")
+    parser.add_argument("--encodings", nargs="+", default=DEFAULT_ENCODINGS, help="<dimensions|full>d/<datatype>")
+    parser.add_argument("--max-chunks", type=int, default=2000)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    config: ConfigPort = ConfigConfig()
+    embed_model = OllamaEmbeddingModel().get_model()
+    with open(args.queries) as f:
+        queries = [line.strip() for line in f if line.strip()]
+    chunks = sample_chunks(config, args.collection, args.max_chunks)
+
+    corpus_vectors = embed_model.get_text_embedding_batch(chunks, show_progress=True)
+    query_vectors = [embed_model.get_query_embedding(query) for query in queries]
+    encodings = [VectorEncoding(), *(VectorEncoding.parse(encoding) for encoding in args.encodings)]
+
+    print(f"recall@{args.k} over {len(queries)} queries and {len(chunks)} chunks of {args.collection}")
+    print(f"{'encoding':<16}{'bytes/vector':>14}{'recall':>10}")
+    for row in encoding_report(corpus_vectors, query_vectors, encodings, k=args.k):
+        print(f"{row.encoding!s:<16}{row.bytes_per_vector:>14}{row.recall:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,52 +2,97 @@ import logging
 
 from files_ingestor.adapters.config import ConfigConfig
 from files_ingestor.adapters.default_logger import DefaultLoggerAdapter
+from files_ingestor.adapters.embedding_models.adaptive import AdaptiveEmbeddingModel
 from files_ingestor.adapters.embedding_models.ollama import OllamaEmbeddingModel
 from files_ingestor.adapters.http_app import create_http_app
+from files_ingestor.adapters.json_logger import QueueJsonLoggerAdapter
 from files_ingestor.adapters.llms.anthropic import AnthropicAdapter
 from files_ingestor.adapters.llms.ollama import OllamaAdapter
+from files_ingestor.adapters.ollama_http import warm_up_in_background
 from files_ingestor.adapters.qdrant import QdrantRepository
 from files_ingestor.adapters.repositories.file_reader import FileReaderAdapter
 from files_ingestor.adapters.repositories.local_storage import LocalStorageAdapter
 from files_ingestor.adapters.repositories.s3_storage import S3StorageAdapter
 from files_ingestor.application.handlers.ingestion_handler import IngestionHandler
+from files_ingestor.application.handlers.question_handler import QuestionHandler
 from files_ingestor.domain.ports.cloud_storage_port import CloudStoragePort
 from files_ingestor.domain.ports.embedding_model import EmbeddingModelPort
 from files_ingestor.domain.ports.file_reader_port import FileReaderPort
 from files_ingestor.domain.ports.logger_port import LoggerPort
 from files_ingestor.domain.ports.vectorstore import VectorStorePort
+from files_ingestor.domain.services.answer_cache import AnswerCache
 from files_ingestor.domain.services.file_processor_service import FileProcessorService
+from files_ingestor.domain.services.progress import ProgressTracker
+from files_ingestor.domain.services.query_cache import QueryEmbeddingCache
+from files_ingestor.domain.services.question_service import QuestionService
 
 # Instantiate adaptres for cross application concerns
-logger: LoggerPort = DefaultLoggerAdapter(log_level=logging.DEBUG)
 config: ConfigConfig = ConfigConfig()
+logger: LoggerPort = (
+    QueueJsonLoggerAdapter.from_config(config)
+    if config.get("logging.format", "text") == "json"
+    else DefaultLoggerAdapter(log_level=logging.DEBUG)
+)
 
 # Instantiate infrastructure
 file_reader_adapter: FileReaderPort = FileReaderAdapter()
 s3_storage: CloudStoragePort = S3StorageAdapter(logger=logger, config=config)
 local_storage: CloudStoragePort = LocalStorageAdapter(logger=logger)
 
-embedding_model: EmbeddingModelPort = OllamaEmbeddingModel()
-# ollama_model_name: str = config.get("llm.mistralsmall24b.name")
-ollama_model_name: str = config.get("llm.gemma2_tools.name")
-ollama_llm: OllamaAdapter = OllamaAdapter(ollama_model_name, logger=logger)
+ollama_embedding_model = OllamaEmbeddingModel.from_config(config, "embeddings.bgem3")
+embedding_model: EmbeddingModelPort = AdaptiveEmbeddingModel(ollama_embedding_model, config, backend="ollama")
+# Load the embedding model while the server starts, so the first ingestion does not wait for it
+warm_up_in_background("bge-m3", ollama_embedding_model.warm_up, logger)
+# ollama_llm: OllamaAdapter = OllamaAdapter.from_config(config, "llm.mistralsmall24b", logger=logger)
+ollama_llm: OllamaAdapter = OllamaAdapter.from_config(config, "llm.gemma2_tools", logger=logger)
 anthropic_llm = AnthropicAdapter(config=config, logger=logger)
 llm = anthropic_llm
 qdrant_url: str = config.get("vectorstore.qdrant.url")
 vector_repository: VectorStorePort = QdrantRepository(qdrant_url, logger=logger)
 
 # Instantiate the FileProcessorService (business logic)
+progress = ProgressTracker()
+# Shared by both services: answers are cached by the question service and invalidated by reingestion
+answer_cache = AnswerCache.from_config(config)
+query_cache = QueryEmbeddingCache.from_config(config)
+question_service = QuestionService(
+    logger, config, vector_repository, embedding_model, llm, query_cache=query_cache, answer_cache=answer_cache
+)
 file_processor_service = FileProcessorService(
-    logger, config, vector_repository, embedding_model, file_reader_adapter, s3_storage, local_storage
+    logger,
+    config,
+    vector_repository,
+    embedding_model,
+    file_reader_adapter,
+    s3_storage,
+    local_storage,
+    progress,
+    embedding_factory=lambda key: AdaptiveEmbeddingModel(
+        OllamaEmbeddingModel.from_config(config, key), config, backend="ollama"
+    ),
+    answer_cache=answer_cache,
+    # A migration to another model switches the questions to it as well
+    on_embeddings_changed=question_service.use_embeddings,
+    # The collection behind the alias may have another vector size
+    on_alias_swapped=question_service.multi_collection.invalidate_vector_sizes,
 )
 
 logger.info(f"Creating react agent with llm {llm.model_name}")
 # CQS commands and queries handlers
 ingestion_handler = IngestionHandler(file_processor_service)
+question_handler = QuestionHandler(question_service)
 # ingestion_handler = IngestionFolderHandler(file_processor_service)
 
 # Run HTTP interface
-app = create_http_app(logger, ingestor_handler=ingestion_handler)
+app = create_http_app(
+    logger,
+    ingestor_handler=ingestion_handler,
+    max_in_memory_bytes=config.get("ingestion.in_memory.max_bytes", 32 * 1024 * 1024),
+    progress=progress,
+    question_handler=question_handler,
+    query_cache=query_cache,
+    answer_cache=answer_cache,
+)
 
 
 def start() -> None:
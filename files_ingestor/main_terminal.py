@@ -1,8 +1,12 @@
 import logging
+import sys
 
 from files_ingestor.adapters.config import ConfigConfig
 from files_ingestor.adapters.default_logger import DefaultLoggerAdapter
+from files_ingestor.adapters.embedding_models.adaptive import AdaptiveEmbeddingModel
 from files_ingestor.adapters.embedding_models.ollama import OllamaEmbeddingModel
+from files_ingestor.adapters.json_logger import QueueJsonLoggerAdapter
+from files_ingestor.adapters.ollama_http import warm_up_in_background
 from files_ingestor.adapters.qdrant import QdrantRepository
 from files_ingestor.adapters.repositories.file_reader import FileReaderAdapter
 from files_ingestor.adapters.repositories.local_storage import LocalStorageAdapter
@@ -19,27 +23,43 @@ from files_ingestor.domain.services.file_processor_service import FileProcessorS
 
 def main() -> None:
     print("Starting terminal app...")
-    logger: LoggerPort = DefaultLoggerAdapter(log_level=logging.DEBUG)
     config: ConfigPort = ConfigConfig()
+    logger: LoggerPort = (
+        QueueJsonLoggerAdapter.from_config(config)
+        if config.get("logging.format", "text") == "json"
+        else DefaultLoggerAdapter(log_level=logging.DEBUG)
+    )
     print(f"from config {config.get('llm.anthropic.name')}")  # type: ignore  # noqa: PGH003
     # Instantiate the FileReaderAdapter (driven adapter)
     file_reader_adapter = FileReaderAdapter()
     s3_storage: CloudStoragePort = S3StorageAdapter(logger=logger, config=config)
     local_storage: CloudStoragePort = LocalStorageAdapter(logger=logger)
-    embedding_model: EmbeddingModelPort = OllamaEmbeddingModel()
+    ollama_embedding_model = OllamaEmbeddingModel.from_config(config, "embeddings.bgem3")
+    embedding_model: EmbeddingModelPort = AdaptiveEmbeddingModel(ollama_embedding_model, config, backend="ollama")
+    # The model loads while the files are listed and downloaded
+    warm_up_in_background("bge-m3", ollama_embedding_model.warm_up, logger)
     qdrant_url: str = config.get("vectorstore.qdrant.url")  # type: ignore  # noqa: PGH003
     vector_repository: VectorStorePort = QdrantRepository(qdrant_url, logger=logger)
 
     # Instantiate the FileProcessorService (business logic)
     file_processor_service = FileProcessorService(
-        logger, config, vector_repository, embedding_model, file_reader_adapter, s3_storage, local_storage
+        logger,
+        config,
+        vector_repository,
+        embedding_model,
+        file_reader_adapter,
+        s3_storage,
+        local_storage,
+        embedding_factory=lambda key: AdaptiveEmbeddingModel(
+            OllamaEmbeddingModel.from_config(config, key), config, backend="ollama"
+        ),
     )
 
     # Instantiate the Query Handler
     ingestion_handler = IngestionHandler(file_processor_service)
 
     terminal_adapter = TerminalAdapter(logger, ingestion_handler)
-    terminal_adapter.run()
+    terminal_adapter.run(sys.argv[1:])
 
 
 if __name__ == "__main__":
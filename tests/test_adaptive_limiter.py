@@ -0,0 +1,125 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httpx
+from llama_index.core import MockEmbedding
+
+from files_ingestor.adapters.embedding_models.adaptive import LimitedEmbedding
+from files_ingestor.domain.services.adaptive_limiter import AIMDLimiter, RetryPolicy, is_overload, shared_limiter
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class TestAdaptiveLimiter(unittest.TestCase):
+    def test_additive_increase_on_fast_calls(self):
+        """Test that calls at the baseline latency grow the limit by about one per limit-many calls."""
+        limiter = AIMDLimiter(initial_limit=4, max_limit=8)
+
+        for _ in range(12):
+            limiter.acquire()
+            limiter.release(latency=0.1)
+
+        self.assertEqual(limiter.limit, 6)
+
+    def test_multiplicative_decrease(self):
+        """Test that slow calls shrink the limit and overload responses halve it, down to the minimum."""
+        limiter = AIMDLimiter(initial_limit=10, min_limit=2)
+        limiter.acquire()
+        limiter.release(latency=0.1)
+
+        limiter.acquire()
+        limiter.release(latency=1.0)
+        self.assertEqual(limiter.limit, 9)
+
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(overloaded=True)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_callers_beyond_limit_wait(self):
+        """Test that a caller blocks until a slot frees up."""
+        limiter = AIMDLimiter(initial_limit=1)
+        limiter.acquire()
+        acquired = threading.Event()
+
+        waiter = threading.Thread(target=lambda: (limiter.acquire(), acquired.set()))
+        waiter.start()
+        self.assertFalse(acquired.wait(0.1))
+
+        limiter.release(latency=0.1)
+        self.assertTrue(acquired.wait(1))
+        waiter.join()
+        self.assertEqual(limiter.in_flight, 1)
+
+    def test_shared_limiter_per_backend(self):
+        """Test that every job of a process gets the same limiter for a backend."""
+        first = shared_limiter("test-backend", AIMDLimiter)
+        self.assertIs(shared_limiter("test-backend", AIMDLimiter), first)
+        self.assertIsNot(shared_limiter("other-backend", AIMDLimiter), first)
+
+    def test_is_overload(self):
+        """Test the classification of failures that should back off."""
+        self.assertTrue(is_overload(HTTPError(429)))
+        self.assertTrue(is_overload(HTTPError(503)))
+        self.assertTrue(is_overload(TimeoutError()))
+        self.assertTrue(is_overload(MagicMock(spec=Exception, status_code=None, response=MagicMock(status_code=502))))
+        self.assertFalse(is_overload(HTTPError(400)))
+        self.assertFalse(is_overload(ValueError("bad input")))
+
+    @patch("files_ingestor.domain.services.adaptive_limiter.time.sleep")
+    def test_retry_overloads_with_backoff(self, mock_sleep):
+        """Test that overload failures are retried with growing delays and shrink the limit."""
+        limiter = AIMDLimiter(initial_limit=8)
+        fn = MagicMock(side_effect=[HTTPError(429), HTTPError(503), [0.1, 0.2]])
+
+        result = RetryPolicy(max_retries=3, backoff_base=1.0).call(limiter, fn, "text")
+
+        self.assertEqual(result, [0.1, 0.2])
+        self.assertEqual(fn.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertLessEqual(mock_sleep.call_args_list[1].args[0], 2.0)
+        self.assertEqual(limiter.limit, 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    @patch("files_ingestor.domain.services.adaptive_limiter.time.sleep")
+    def test_retry_gives_up(self, mock_sleep):
+        """Test that client errors are not retried and overloads stop after max_retries."""
+        limiter = AIMDLimiter()
+
+        with self.assertRaises(HTTPError):
+            RetryPolicy().call(limiter, MagicMock(side_effect=HTTPError(400)))
+        mock_sleep.assert_not_called()
+
+        with self.assertRaises(HTTPError):
+            RetryPolicy(max_retries=2).call(limiter, MagicMock(side_effect=HTTPError(500)))
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch("files_ingestor.domain.services.adaptive_limiter.time.sleep")
+    def test_httpx_timeouts_are_retried(self, mock_sleep):
+        """Test that timeouts and dropped connections of the httpx client back off like overload responses."""
+        limiter = AIMDLimiter(initial_limit=8)
+        embed_model = MockEmbedding(embed_dim=2)
+        model = LimitedEmbedding(embed_model, limiter, RetryPolicy(max_retries=3))
+        failures = [httpx.ReadTimeout("timed out"), httpx.ConnectError("connection refused")]
+
+        with patch.object(
+            MockEmbedding, "_get_text_embeddings", side_effect=[*failures, [[0.5, 0.5]]], autospec=True
+        ) as embed:
+            result = model.get_text_embedding_batch(["text"])
+
+        self.assertEqual(result, [[0.5, 0.5]])
+        self.assertEqual(embed.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(limiter.limit, 2)
+        self.assertFalse(
+            is_overload(httpx.HTTPStatusError("bad request", request=None, response=MagicMock(status_code=400)))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
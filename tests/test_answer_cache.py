@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from files_ingestor.domain.services.answer_cache import AnswerCache
+
+MONOTONIC = "files_ingestor.domain.services.answer_cache.time.monotonic"
+
+
+class TestAnswerCache(unittest.TestCase):
+    def test_key_ignores_node_order_and_question_case(self):
+        """Test that the key is the same for reordered nodes and normalized questions, not for other models or modes."""
+        key = AnswerCache.key("Who is Ahab?", ["n1", "n2"], "claude", "compact")
+
+        self.assertEqual(AnswerCache.key(" who is  AHAB? ", ["n2", "n1"], "claude", "compact"), key)
+        self.assertNotEqual(AnswerCache.key("Who is Ahab?", ["n1", "n2"], "gemma2", "compact"), key)
+        self.assertNotEqual(AnswerCache.key("Who is Ahab?", ["n1", "n2"], "claude", "refine"), key)
+        self.assertNotEqual(AnswerCache.key("Who is Ahab?", ["n1"], "claude", "compact"), key)
+
+    def test_entries_expire(self):
+        cache = AnswerCache(ttl_seconds=60)
+        with patch(MONOTONIC, return_value=100.0):
+            cache.put("q", ["n1"], "m", "compact", "a")
+        with patch(MONOTONIC, return_value=159.0):
+            self.assertEqual(cache.get("q", ["n1"], "m", "compact"), "a")
+        with patch(MONOTONIC, return_value=161.0):
+            self.assertIsNone(cache.get("q", ["n1"], "m", "compact"))
+
+        self.assertEqual(cache.metrics()["entries"], 0)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = AnswerCache(max_entries=2)
+        cache.put("a", ["n1"], "m", "compact", "A")
+        cache.put("b", ["n2"], "m", "compact", "B")
+        cache.get("a", ["n1"], "m", "compact")
+        cache.put("c", ["n3"], "m", "compact", "C")
+
+        self.assertIsNone(cache.get("b", ["n2"], "m", "compact"))
+        self.assertEqual(cache.get("a", ["n1"], "m", "compact"), "A")
+        # The evicted entry no longer holds its nodes
+        self.assertEqual(cache.invalidate_nodes(["n2"]), 0)
+
+    def test_invalidating_a_node_drops_the_answers_citing_it(self):
+        cache = AnswerCache()
+        cache.put("a", ["n1", "n2"], "m", "compact", "A")
+        cache.put("b", ["n2", "n3"], "m", "compact", "B")
+        cache.put("c", ["n4"], "m", "compact", "C")
+
+        self.assertEqual(cache.invalidate_nodes(["n2"]), 2)
+
+        self.assertIsNone(cache.get("a", ["n1", "n2"], "m", "compact"))
+        self.assertEqual(cache.get("c", ["n4"], "m", "compact"), "C")
+        self.assertEqual(cache.metrics()["invalidations"], 2)
+
+    def test_from_config(self):
+        values = {"query.answer_cache.enabled": True, "query.answer_cache.ttl_seconds": 60}
+        config = MagicMock()
+        config.get.side_effect = lambda key, default: values.get(key, default)
+
+        cache = AnswerCache.from_config(config)
+
+        self.assertEqual((cache.max_entries, cache.ttl_seconds), (1000, 60))
+        self.assertIsNone(AnswerCache.from_config(config, key="other"))
+
+
+if __name__ == "__main__":
+    unittest.main()
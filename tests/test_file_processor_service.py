@@ -1,11 +1,33 @@
 import os
+import shutil
 import tempfile
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
-from files_ingestor.application.commands.ingest_pdf import IngestCloudStorageCmd
+from langchain_core.documents import Document as LCDocument
+from llama_index.core import Document, MockEmbedding
+from llama_index.core.ingestion import IngestionPipeline
+from llama_index.core.vector_stores import SimpleVectorStore
+
+from files_ingestor.application.commands.delete_document import DeleteDocumentCmd
+from files_ingestor.application.commands.ingest_pdf import (
+    IngestBytesCmd,
+    IngestCloudStorageCmd,
+    IngestFolderCmd,
+    WatchFolderCmd,
+)
+from files_ingestor.application.commands.snapshot import ExportSnapshotCmd, ImportSnapshotCmd
+from files_ingestor.domain.model.checkpoint import IngestionCheckpoint
+from files_ingestor.domain.model.shard import Shard
+from files_ingestor.domain.model.source_index import SourceIndex
+from files_ingestor.domain.model.storage_entry import FileChange, StorageEntry
+from files_ingestor.domain.model.vector_encoding import VectorEncoding
+from files_ingestor.domain.services.answer_cache import AnswerCache
+from files_ingestor.domain.services.chunking import get_splitter
 from files_ingestor.domain.services.file_processor_service import FileProcessorService
 
+LARGE_OBJECT = 10 * 1024 * 1024
+
 
 class TestFileProcessorService(unittest.TestCase):
     def setUp(self):
@@ -15,6 +37,7 @@ class TestFileProcessorService(unittest.TestCase):
         self.embeddings = MagicMock()
         self.file_reader = MagicMock()
         self.s3_storage = MagicMock()
+        self.s3_storage.local_path.return_value = None
         self.local_storage = MagicMock()
 
         # Mock embeddings model
@@ -23,10 +46,18 @@ class TestFileProcessorService(unittest.TestCase):
         self.embeddings.get_model.return_value = embeddings_model
 
         # Mock config values
+        self.checkpoint_dir = tempfile.mkdtemp()
         self.config.get.side_effect = lambda key, default: {
             "documentStores.bookstore.name": "test-store",
-            "documentStores.bookstore.props.path": "test-path",
+            "documentStores.bookstore.props.path": self.checkpoint_dir,
             "collections.book-library": "test-collection",
+            "ingestion.checkpoint.path": self.checkpoint_dir,
+            "ingestion.checkpoint.every": 1,
+            "ingestion.in_memory.max_bytes": 4096,
+            "vectorstore.qdrant.collections.test-collection.chunking.strategy": "token",
+            "vectorstore.qdrant.collections.test-collection.chunking.chunk_size": 256,
+            "vectorstore.qdrant.collections.test-collection.chunking.chunk_overlap": 32,
+            "ingestion.chunking.num_workers": 4,
         }.get(key, default)
 
         self.service = FileProcessorService(
@@ -39,6 +70,9 @@ class TestFileProcessorService(unittest.TestCase):
             local_storage=self.local_storage,
         )
 
+    def tearDown(self):
+        shutil.rmtree(self.checkpoint_dir, ignore_errors=True)
+
     def test_ingest_cloud_storage_s3(self):
         # Arrange
         url = "s3://bucket/folder/"
@@ -46,7 +80,7 @@ class TestFileProcessorService(unittest.TestCase):
             "s3://bucket/folder/doc1.pdf",
             "s3://bucket/folder/doc2.pdf",
         ]
-        self.s3_storage.list_files.return_value = pdf_files
+        self.s3_storage.iter_files.return_value = iter(StorageEntry(url=f, size=LARGE_OBJECT) for f in pdf_files)
 
         # Create temp dir for downloads
         temp_dir = tempfile.mkdtemp()
@@ -70,10 +104,12 @@ class TestFileProcessorService(unittest.TestCase):
 
                 # Assert
                 self.assertEqual(result, 2)  # Processed 2 files
-                self.s3_storage.list_files.assert_called_once_with(url, recursive=True)
+                self.s3_storage.iter_files.assert_called_once_with(
+                    url, recursive=True, suffix=".pdf", continuation_token=None
+                )
                 self.assertEqual(self.s3_storage.download_file.call_count, 2)
                 self.assertEqual(mock_ingest_pdf.call_count, 2)
-                self.local_storage.list_files.assert_not_called()
+                self.local_storage.iter_files.assert_not_called()
                 self.local_storage.download_file.assert_not_called()
 
         finally:
@@ -100,9 +136,11 @@ class TestFileProcessorService(unittest.TestCase):
             with open(txt_path, "w") as f:
                 f.write("dummy txt")
 
-            self.local_storage.list_files.return_value = [f"file://{pdf_path}"]
+            self.local_storage.iter_files.return_value = iter([StorageEntry(url=f"file://{pdf_path}", size=13)])
 
-            # Mock ingest_pdf method
+            self.local_storage.local_path.return_value = pdf_path
+
+            # Mock ingest_pdf method, the local file is read in place
             with patch.object(self.service, "ingest_pdf") as mock_ingest_pdf:
                 mock_ingest_pdf.return_value = []  # Return empty list of nodes
 
@@ -112,10 +150,13 @@ class TestFileProcessorService(unittest.TestCase):
 
                 # Assert
                 self.assertEqual(result, 1)  # Processed 1 PDF file
-                self.local_storage.list_files.assert_called_once_with(url, recursive=False)
-                self.local_storage.download_file.assert_called_once()
-                mock_ingest_pdf.assert_called_once()
-                self.s3_storage.list_files.assert_not_called()
+                self.local_storage.iter_files.assert_called_once_with(
+                    url, recursive=False, suffix=".pdf", continuation_token=None
+                )
+                mock_ingest_pdf.assert_called_once_with(pdf_path)
+                self.local_storage.download_file.assert_not_called()
+                self.local_storage.read_bytes.assert_not_called()
+                self.s3_storage.iter_files.assert_not_called()
                 self.s3_storage.download_file.assert_not_called()
 
         finally:
@@ -126,10 +167,584 @@ class TestFileProcessorService(unittest.TestCase):
                 os.unlink(txt_path)
             os.rmdir(temp_dir)
 
+    def test_ingest_cloud_storage_small_objects_in_memory(self):
+        # Arrange
+        url = "s3://bucket/folder/"
+        self.s3_storage.iter_files.return_value = iter([
+            StorageEntry(url="s3://bucket/folder/small.pdf", size=200),
+            StorageEntry(url="s3://bucket/folder/large.pdf", size=LARGE_OBJECT),
+        ])
+        self.s3_storage.read_bytes.return_value = b"%PDF-1.7"
+
+        with (
+            patch.object(self.service, "ingest_pdf") as mock_ingest_pdf,
+            patch.object(self.service, "ingest_pdf_bytes") as mock_ingest_pdf_bytes,
+        ):
+            # Act
+            result = self.service.process(IngestCloudStorageCmd(url=url, recursive=True))
+
+            # Assert: only the large object goes through the temp directory
+            self.assertEqual(result, 2)
+            self.s3_storage.read_bytes.assert_called_once_with("s3://bucket/folder/small.pdf")
+            mock_ingest_pdf_bytes.assert_called_once_with(b"%PDF-1.7", source="s3://bucket/folder/small.pdf")
+            self.s3_storage.download_file.assert_called_once()
+            self.assertEqual(self.s3_storage.download_file.call_args[0][0], "s3://bucket/folder/large.pdf")
+            mock_ingest_pdf.assert_called_once()
+
+    def test_ingest_bytes_command(self):
+        # Arrange
+        data = memoryview(b"%PDF-1.7")
+        page = LCDocument(page_content="Call me Ishmael.", metadata={"source": "upload.pdf", "page": 0})
+
+        with (
+            patch("files_ingestor.domain.services.file_processor_service.PyPDFParser") as mock_parser,
+            patch("files_ingestor.domain.services.file_processor_service.Blob") as mock_blob,
+            patch.object(self.service, "_run_pipeline") as mock_run_pipeline,
+        ):
+            mock_parser.return_value.lazy_parse.return_value = iter([page])
+
+            # Act
+            self.service.process(IngestBytesCmd(data=data, source="upload.pdf", metadata={"tenant": "library"}))
+
+            # Assert: parsed from the buffer, with the source metadata attached
+            mock_blob.from_data.assert_called_once_with(b"%PDF-1.7", path="upload.pdf", mime_type="application/pdf")
+            self.assertEqual(page.metadata, {"source": "upload.pdf", "page": 0, "tenant": "library"})
+            mock_run_pipeline.assert_called_once()
+
+    def test_ingest_bytes_returns_node_count_within_memory_budget(self):
+        # Arrange
+        pipeline = MagicMock()
+        budget_used = []
+
+        def run(documents):
+            budget_used.append(self.service.memory_budget.used)
+            return [MagicMock(ref_doc_id="upload.pdf#page=0", node_id=f"node-{i}") for i in range(3)]
+
+        pipeline.run.side_effect = run
+
+        with (
+            patch("files_ingestor.domain.services.file_processor_service.PyPDFParser") as mock_parser,
+            patch.object(self.service, "_build_pipeline", return_value=pipeline),
+        ):
+            mock_parser.return_value.lazy_parse.return_value = iter([
+                LCDocument(page_content="Call me Ishmael.", metadata={"page": 0})
+            ])
+
+            # Act
+            result = self.service.ingest_pdf_bytes(b"%PDF-1.7", source="upload.pdf")
+
+        # Assert: only the count goes back, and the reservation is held while embedding, then released
+        self.assertEqual(result, 3)
+        self.assertGreaterEqual(budget_used[0], len(b"%PDF-1.7"))
+        self.assertEqual(self.service.memory_budget.used, 0)
+
+    def test_progress_reported_per_job(self):
+        # Arrange
+        pipeline = MagicMock()
+        pipeline.run.return_value = [MagicMock(ref_doc_id="upload.pdf#page=0", node_id=f"node-{i}") for i in range(3)]
+        cmd = IngestBytesCmd(data=b"%PDF-1.7", source="upload.pdf")
+        cmd.job_id = "job-1"
+
+        with (
+            patch("files_ingestor.domain.services.file_processor_service.PyPDFParser") as mock_parser,
+            patch.object(self.service, "_build_pipeline", return_value=pipeline),
+        ):
+            mock_parser.return_value.lazy_parse.return_value = iter([
+                LCDocument(page_content=f"Page {i}", metadata={"page": i}) for i in range(2)
+            ])
+
+            # Act
+            self.service.process(cmd)
+
+        # Assert
+        snapshot = self.service.progress.get("job-1").snapshot()
+        self.assertEqual(snapshot["status"], "succeeded")
+        self.assertEqual((snapshot["files_done"], snapshot["pages"], snapshot["vectors_upserted"]), (1, 2, 3))
+        pipeline.run.assert_called_once()
+        self.assertNotIn("show_progress", pipeline.run.call_args.kwargs)
+
+    def test_text_cache_skips_parsing_on_reingest(self):
+        # Arrange: a service with the extracted-text cache enabled
+        config_values = {"ingestion.text_cache.enabled": True, "ingestion.text_cache.path": self.checkpoint_dir}
+        get_config = self.config.get.side_effect
+        self.config.get.side_effect = lambda key, default: config_values.get(key, get_config(key, default))
+        service = FileProcessorService(
+            self.logger,
+            self.config,
+            self.vector_store,
+            self.embeddings,
+            self.file_reader,
+            self.s3_storage,
+            self.local_storage,
+        )
+        page = LCDocument(page_content="Call me Ishmael.", metadata={"page": 0})
+
+        with (
+            patch("files_ingestor.domain.services.file_processor_service.PyPDFParser") as mock_parser,
+            patch.object(service, "_run_pipeline", return_value=1) as mock_run_pipeline,
+        ):
+            mock_parser.return_value.lazy_parse.return_value = iter([page])
+
+            # Act
+            service.ingest_pdf_bytes(b"%PDF-1.7", source="upload.pdf")
+            service.ingest_pdf_bytes(b"%PDF-1.7", source="copy.pdf")
+
+        # Assert: parsed once, the second ingestion gets the cached page
+        mock_parser.return_value.lazy_parse.assert_called_once()
+        self.assertEqual(mock_run_pipeline.call_count, 2)
+        (cached_page,) = mock_run_pipeline.call_args.args[0]
+        self.assertEqual((cached_page.text, cached_page.id_), ("Call me Ishmael.", "copy.pdf#page=0"))
+        self.assertEqual((service.text_cache.hits, service.text_cache.misses), (1, 1))
+
+    def test_warm_text_cache_parses_without_embedding(self):
+        # Arrange: two local PDFs, one of them owned by another shard
+        config_values = {"ingestion.text_cache.enabled": True, "ingestion.text_cache.path": self.checkpoint_dir}
+        get_config = self.config.get.side_effect
+        self.config.get.side_effect = lambda key, default: config_values.get(key, get_config(key, default))
+        service = FileProcessorService(
+            self.logger,
+            self.config,
+            self.vector_store,
+            self.embeddings,
+            self.file_reader,
+            self.s3_storage,
+            self.local_storage,
+        )
+        pdf_paths = []
+        for name in ("a.pdf", "b.pdf"):
+            pdf_paths.append(os.path.join(self.checkpoint_dir, name))
+            with open(pdf_paths[-1], "wb") as f:
+                f.write(f"%PDF-1.7 {name}".encode())
+        entries = [StorageEntry(url=f"file://{path}", size=16) for path in pdf_paths]
+        self.local_storage.iter_files.return_value = iter(entries)
+        self.local_storage.local_path.side_effect = lambda url: url.removeprefix("file://")
+        shard = Shard(0, 2)
+
+        with (
+            patch("files_ingestor.domain.services.file_processor_service.PyPDFLoader") as mock_loader,
+            patch.object(service, "_run_pipeline") as mock_run_pipeline,
+        ):
+            mock_loader.return_value.load.return_value = [MagicMock(page_content="text", metadata={"page": 0})]
+
+            # Act
+            num_files = service.warm_text_cache(self.checkpoint_dir, shard=shard)
+
+        # Assert
+        owned = [path for path in pdf_paths if shard.owns(f"file://{path}")]
+        self.assertEqual(num_files, len(owned))
+        self.assertEqual(mock_loader.call_count, len(owned))
+        self.assertEqual(service.text_cache.misses, len(owned))
+        mock_run_pipeline.assert_not_called()
+
+    def test_warm_text_cache_requires_enabled_cache(self):
+        with self.assertRaises(ValueError):
+            self.service.warm_text_cache("s3://bucket/books/")
+
+    def test_migrate_collection_catches_up_and_swaps_alias(self):
+        # Arrange: page b changes and page c is ingested while the first pass runs, page a is deleted
+        self.vector_store.get_collections.return_value = ["test-collection"]
+        self.vector_store.swap_alias.return_value = "test-collection"
+        docstore = MagicMock()
+        docstore.get_document.side_effect = lambda doc_id, raise_error: Document(id_=doc_id, text=f"text of {doc_id}")
+        snapshots = iter(
+            [{"a#page=0": ("a.pdf", "h1"), "b#page=0": ("b.pdf", "h2")}]
+            + [{"b#page=0": ("b.pdf", "h2-new"), "c#page=0": ("c.pdf", "h3")}] * 3
+        )
+        pipeline = MagicMock()
+        pipeline.run.side_effect = lambda documents: [
+            MagicMock(ref_doc_id=document.id_, node_id=f"new-{document.id_}") for document in documents
+        ]
+        source_index = self.service._get_source_index(self.checkpoint_dir)
+        source_index.update("b.pdf", ["b#page=0"], {"b#page=0": ["old-b"]})
+        source_index.update("c.pdf", ["c#page=0"], {"c#page=0": ["old-c"]})
+
+        with (
+            patch.object(self.service, "_migration_snapshot", side_effect=lambda: (next(snapshots), docstore)),
+            patch("files_ingestor.domain.services.file_processor_service.IngestionPipeline", return_value=pipeline),
+        ):
+            # Act
+            num_pages = self.service.migrate_collection("test-collection", max_pages_per_second=0)
+
+        # Assert: embedded into the next version, stale pages removed from it, then the alias swapped
+        self.assertEqual(num_pages, 4)
+        self.vector_store.create_collection.assert_called_once()
+        self.assertEqual(self.vector_store.create_collection.call_args[0][0], "test-collection-v1")
+        self.vector_store.delete_documents.assert_called_once()
+        self.assertEqual(sorted(self.vector_store.delete_documents.call_args[0][1]), ["a#page=0", "b#page=0"])
+        self.vector_store.swap_alias.assert_called_once_with("test-collection", "test-collection-v1", False)
+        self.vector_store.delete_collection.assert_not_called()
+        self.assertEqual(source_index.node_ids("b.pdf"), ["new-b#page=0"])
+
+    def test_migrate_collection_to_another_model_switches_questions(self):
+        """Test that questions are embedded with the model of the migrated collection, and answers forgotten."""
+        # Arrange
+        on_embeddings_changed = MagicMock()
+        self.service.on_embeddings_changed = on_embeddings_changed
+        self.service.on_alias_swapped = MagicMock()
+        self.service.answer_cache = MagicMock()
+        new_embeddings = MagicMock()
+        self.vector_store.get_collections.return_value = ["test-collection"]
+
+        with (
+            patch.object(self.service, "_migration_snapshot", return_value=({}, MagicMock())),
+            patch("files_ingestor.domain.services.file_processor_service.IngestionPipeline"),
+        ):
+            # Act
+            self.service.migrate_collection("test-collection", new_embeddings, max_pages_per_second=0)
+
+        # Assert
+        self.assertIs(self.service.embeddings, new_embeddings)
+        on_embeddings_changed.assert_called_once_with(new_embeddings)
+        self.service.on_alias_swapped.assert_called_once_with("test-collection")
+        self.service.answer_cache.clear.assert_called_once()
+
+    def test_migrate_collection_refuses_other_collections(self):
+        """Test that only the ingestion collection, whose docstore holds the pages, can be migrated."""
+        with self.assertRaises(ValueError):
+            self.service.migrate_collection("other-collection")
+
+        self.vector_store.create_collection.assert_not_called()
+        self.vector_store.swap_alias.assert_not_called()
+
+    def test_first_migration_of_a_plain_collection_needs_replace_collection(self):
+        """Test that a collection created before aliases is only replaced by an alias on explicit request."""
+        self.vector_store.resolve_collection.side_effect = lambda name: name
+        self.vector_store.collection_exist.return_value = True
+
+        with self.assertRaisesRegex(ValueError, "replace_collection"):
+            self.service.migrate_collection("test-collection")
+
+        self.vector_store.create_collection.assert_not_called()
+
+    def test_snapshot_export_then_import_on_a_new_node(self):
+        # Arrange: an indexed collection with its docstore files
+        points = [{"id": f"node-{i}", "vector": [0.5, float(i)], "payload": {"source": "book.pdf"}} for i in range(3)]
+        self.vector_store.get_vector_size.return_value = 2
+        self.vector_store.scroll_points.return_value = iter([points[:2], points[2:]])
+        source_index = self.service._get_source_index(self.checkpoint_dir)
+        source_index.update("book.pdf", ["book.pdf#page=0"], {"book.pdf#page=0": ["node-0", "node-1", "node-2"]})
+        source_index.save()
+        with open(os.path.join(self.checkpoint_dir, "docstore.json"), "w") as f:
+            f.write("{}")
+        bundle_path = os.path.join(self.checkpoint_dir, "snapshots", "books.snapshot")
+
+        # Act
+        exported = self.service.process(ExportSnapshotCmd(bundle_path))
+
+        # Arrange: a new node with an empty store and no collection
+        os.remove(os.path.join(self.checkpoint_dir, SourceIndex.FILE_NAME))
+        os.remove(os.path.join(self.checkpoint_dir, "docstore.json"))
+        self.service._source_index = None
+        self.vector_store.collection_exist.return_value = False
+        self.vector_store.get_collections.return_value = []
+        self.vector_store.swap_alias.return_value = None
+
+        # Act
+        imported = self.service.process(ImportSnapshotCmd(bundle_path))
+
+        # Assert: the vectors are loaded into a new version as they were, with the docstore and source index
+        self.assertEqual((exported, imported), (3, 3))
+        self.vector_store.create_collection.assert_called_once_with("test-collection-v1", 2, "float32")
+        upserted = [point for args in self.vector_store.upsert_points.call_args_list for point in args[0][1]]
+        self.assertEqual(upserted, points)
+        self.vector_store.swap_alias.assert_called_once_with(
+            "test-collection", "test-collection-v1", replace_collection=False
+        )
+        self.vector_store.delete_collection.assert_not_called()
+        restored_index = self.service._get_source_index(self.checkpoint_dir)
+        self.assertEqual(restored_index.node_ids("book.pdf"), ["node-0", "node-1", "node-2"])
+        self.assertTrue(os.path.exists(os.path.join(self.checkpoint_dir, "docstore.json")))
+        # The restored store loads like one written by a pipeline run
+        IngestionPipeline(transformations=[]).load(self.checkpoint_dir)
+
+    def test_snapshot_refuses_collections_other_than_the_ingestion_one(self):
+        """Test that snapshots never pair the global docstore files with the points of another collection."""
+        # Arrange
+        self.vector_store.get_vector_size.return_value = 2
+        self.vector_store.scroll_points.return_value = iter([])
+        docstore_path = os.path.join(self.checkpoint_dir, "docstore.json")
+        with open(docstore_path, "w") as f:
+            f.write("{}")
+        bundle_path = os.path.join(self.checkpoint_dir, "books.snapshot")
+        self.service.export_snapshot(bundle_path)
+        self.vector_store.collection_exist.return_value = False
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            self.service.export_snapshot(os.path.join(self.checkpoint_dir, "news.snapshot"), "news")
+        with self.assertRaises(ValueError):
+            self.service.import_snapshot(bundle_path, "news")
+        self.vector_store.create_collection.assert_not_called()
+        self.assertTrue(os.path.exists(docstore_path))
+
+    def test_snapshot_import_refuses_other_model_or_existing_collection(self):
+        # Arrange
+        self.vector_store.get_vector_size.return_value = 2
+        self.vector_store.scroll_points.return_value = iter([])
+        bundle_path = os.path.join(self.checkpoint_dir, "books.snapshot")
+        self.service.export_snapshot(bundle_path)
+
+        # Act / Assert
+        with self.assertRaisesRegex(ValueError, "already exists"):
+            self.service.import_snapshot(bundle_path)
+        self.embeddings.get_model.return_value.model_name = "other-model"
+        with self.assertRaisesRegex(ValueError, "test-model vectors"):
+            self.service.import_snapshot(bundle_path, replace=True)
+        self.vector_store.create_collection.assert_not_called()
+
+    def test_ingest_cloud_storage_local_staging_opt_in(self):
+        # Arrange
+        url = "file:///data/books"
+        self.local_storage.iter_files.return_value = iter([
+            StorageEntry(url="file:///data/books/large.pdf", size=LARGE_OBJECT)
+        ])
+
+        with patch.object(self.service, "ingest_pdf") as mock_ingest_pdf:
+            # Act
+            result = self.service.process(IngestCloudStorageCmd(url=url, recursive=True, stage_local=True))
+
+            # Assert: the file is linked into the temp dir before ingestion
+            self.assertEqual(result, 1)
+            self.local_storage.local_path.assert_not_called()
+            self.local_storage.download_file.assert_called_once()
+            staged_path = self.local_storage.download_file.call_args[0][1]
+            mock_ingest_pdf.assert_called_once_with(staged_path, source="file:///data/books/large.pdf")
+
+    def test_watch_folder_ingests_changed_files(self):
+        # Arrange
+        self.local_storage.watch.return_value = iter([
+            [
+                FileChange(url="file:///data/books/new.pdf", kind="created"),
+                FileChange(url="file:///data/books/old.pdf", kind="deleted"),
+            ],
+            [FileChange(url="file:///data/books/new.pdf", kind="modified")],
+        ])
+
+        with (
+            patch.object(self.service, "ingest_pdf") as mock_ingest_pdf,
+            patch.object(self.service, "delete_document") as mock_delete_document,
+        ):
+            # Act
+            result = self.service.process(WatchFolderCmd(folder_path="/data/books", debounce_seconds=0.5))
+
+            # Assert: only created or modified files are ingested
+            self.assertEqual(result, 2)
+            self.assertEqual(mock_ingest_pdf.call_args_list, [call("/data/books/new.pdf", replace=True)] * 2)
+            mock_delete_document.assert_called_once_with("/data/books/old.pdf")
+            self.assertEqual(self.local_storage.watch.call_args.kwargs["debounce_seconds"], 0.5)
+
+    def test_reingest_with_replace_removes_stale_pages(self):
+        # Arrange
+        pipeline = MagicMock()
+        pipeline.run.return_value = [MagicMock(ref_doc_id="book.pdf#page=0", node_id="node-1")]
+        page_0, page_1 = MagicMock(id_="book.pdf#page=0"), MagicMock(id_="book.pdf#page=1")
+
+        with patch.object(self.service, "_build_pipeline", return_value=pipeline):
+            self.service._run_pipeline([page_0, page_1], "book.pdf")
+
+            # Act: the new edition lost its second page and the first one changed
+            pipeline.run.return_value = [MagicMock(ref_doc_id="book.pdf#page=0", node_id="node-2")]
+            self.service._run_pipeline([page_0], "book.pdf", replace=True)
+
+        # Assert
+        self.vector_store.delete_documents.assert_called_once_with("test-collection", ["book.pdf#page=1"])
+        pipeline.docstore.delete_document.assert_called_once_with("book.pdf#page=1", raise_error=False)
+        self.assertEqual(SourceIndex.load(self.checkpoint_dir).sources, {"book.pdf": {"book.pdf#page=0": ["node-2"]}})
+
+    def test_reingest_invalidates_answers_citing_replaced_nodes(self):
+        # Arrange
+        self.service.answer_cache = AnswerCache()
+        pipeline = MagicMock()
+        pipeline.run.return_value = [
+            MagicMock(ref_doc_id="book.pdf#page=0", node_id="node-1"),
+            MagicMock(ref_doc_id="book.pdf#page=1", node_id="node-2"),
+            MagicMock(ref_doc_id="book.pdf#page=2", node_id="node-3"),
+        ]
+        pages = [MagicMock(id_=f"book.pdf#page={i}") for i in range(3)]
+        for i in range(1, 4):
+            self.service.answer_cache.put(f"q{i}", [f"node-{i}"], "m", "compact", f"a{i}")
+
+        with patch.object(self.service, "_build_pipeline", return_value=pipeline):
+            self.service._run_pipeline(pages, "book.pdf")
+
+            # Act: page 0 changed, page 1 is unchanged and skipped by the pipeline, page 2 was dropped
+            pipeline.run.return_value = [MagicMock(ref_doc_id="book.pdf#page=0", node_id="node-4")]
+            self.service._run_pipeline(pages[:2], "book.pdf", replace=True)
+
+        # Assert: only the answer citing the unchanged page survives
+        self.assertEqual(self.service.answer_cache.metrics()["invalidations"], 2)
+        self.assertEqual(self.service.answer_cache.get("q2", ["node-2"], "m", "compact"), "a2")
+
+    def test_reingest_changed_page_with_near_duplicate_filter(self):
+        """Test that the unchanged chunks of a changed page are not dropped as duplicates of the vectors they replace."""
+        # Arrange: a real pipeline into an in-memory vector store
+        persist_path = os.path.join(self.checkpoint_dir, "store")
+        settings = self.config.get.side_effect
+        self.config.get.side_effect = lambda key, default: {
+            "documentStores.bookstore.props.path": persist_path,
+            "vectorstore.qdrant.collections.test-collection.near_duplicates.enabled": True,
+        }.get(key, settings(key, default))
+        vector_store = SimpleVectorStore()
+        self.vector_store.get_vector_store.return_value = vector_store
+        self.embeddings.get_model.return_value = MockEmbedding(embed_dim=8)
+        opening = " ".join(f"whale{i}" for i in range(300))
+        first_edition = f"{opening} " + " ".join(f"sea{i}" for i in range(300))
+        second_edition = f"{opening} " + " ".join(f"sky{i}" for i in range(300))
+
+        stored = self.service._run_pipeline([Document(text=first_edition, id_="book.pdf#page=0")], "book.pdf")
+
+        # Act
+        restored = self.service._run_pipeline([Document(text=second_edition, id_="book.pdf#page=0")], "book.pdf")
+
+        # Assert
+        self.assertEqual(restored, stored)
+        self.assertEqual(len(vector_store.data.embedding_dict), stored)
+
+    def test_retry_after_failed_embedding_with_near_duplicate_filter(self):
+        """Test that the chunks of a run failing to embed are not dropped as duplicates of themselves on retry."""
+        # Arrange: a real pipeline into an in-memory vector store, whose first embedding call fails
+        persist_path = os.path.join(self.checkpoint_dir, "store")
+        settings = self.config.get.side_effect
+        self.config.get.side_effect = lambda key, default: {
+            "documentStores.bookstore.props.path": persist_path,
+            "vectorstore.qdrant.collections.test-collection.near_duplicates.enabled": True,
+        }.get(key, settings(key, default))
+        vector_store = SimpleVectorStore()
+        self.vector_store.get_vector_store.return_value = vector_store
+        self.embeddings.get_model.return_value = MockEmbedding(embed_dim=8)
+        document = Document(text=" ".join(f"whale{i}" for i in range(600)), id_="book.pdf#page=0")
+
+        failing = patch.object(MockEmbedding, "_get_text_embeddings", side_effect=RuntimeError("rate limited"))
+        with failing, self.assertRaises(RuntimeError):
+            self.service._run_pipeline([document], "book.pdf")
+
+        # Act
+        stored = self.service._run_pipeline([document], "book.pdf")
+
+        # Assert
+        self.assertGreater(stored, 0)
+        self.assertEqual(len(vector_store.data.embedding_dict), stored)
+
+    def test_delete_document(self):
+        # Arrange
+        pipeline = MagicMock()
+        pipeline.run.return_value = [
+            MagicMock(ref_doc_id="book.pdf#page=0", node_id="node-1"),
+            MagicMock(ref_doc_id="book.pdf#page=0", node_id="node-2"),
+        ]
+
+        with patch.object(self.service, "_build_pipeline", return_value=pipeline):
+            self.service._run_pipeline([MagicMock(id_="book.pdf#page=0")], "book.pdf")
+
+            # Act
+            result = self.service.process(DeleteDocumentCmd(source="book.pdf"))
+
+        # Assert: all points of the source go in one filtered delete
+        self.assertEqual(result, 2)
+        self.vector_store.delete_documents.assert_called_once_with("test-collection", ["book.pdf#page=0"])
+        self.assertEqual(SourceIndex.load(self.checkpoint_dir).sources, {})
+
+    def test_payload_indexes_created_once_collection_exists(self):
+        # Arrange
+        fields = {"source": "keyword", "page": "integer"}
+        overrides = {"vectorstore.qdrant.collections.test-collection.payload_indexes": fields}
+        get_config = self.config.get.side_effect
+        self.config.get.side_effect = lambda key, default: overrides.get(key, get_config(key, default))
+        self.vector_store.collection_exist.side_effect = [False, True, True]
+        pipeline = MagicMock()
+        pipeline.run.return_value = [MagicMock(ref_doc_id="book.pdf#page=0", node_id="node-1")]
+
+        # Act: the first run wrote nothing, so the vector store has not created the collection yet
+        with patch.object(self.service, "_build_pipeline", return_value=pipeline):
+            for _ in range(3):
+                self.service._run_pipeline([MagicMock(id_="book.pdf#page=0")], "book.pdf")
+
+        # Assert
+        self.vector_store.create_payload_indexes.assert_called_once_with("test-collection", fields)
+
+    def test_chunking_from_collection_config(self):
+        # Act
+        first = self.service._get_splitter("test-collection")
+        second = self.service._get_splitter("test-collection")
+
+        # Assert: settings come from the collection config and the splitter is built once
+        self.assertIs(first.splitter, second.splitter)
+        self.assertIs(first.splitter, get_splitter("token", 256, 32))
+        self.assertEqual(first.num_workers, 4)
+        self.assertEqual(first.min_parallel_documents, 64)
+
+    def test_vector_encoding_creates_collection(self):
+        # Arrange
+        overrides = {
+            "vectorstore.qdrant.collections.test-collection.vectors.dimensions": 256,
+            "vectorstore.qdrant.collections.test-collection.vectors.datatype": "int8",
+        }
+        get_config = self.config.get.side_effect
+        self.config.get.side_effect = lambda key, default: overrides.get(key, get_config(key, default))
+        self.vector_store.get_vector_size.return_value = None
+
+        # Act
+        with patch("files_ingestor.domain.services.file_processor_service.encode_embed_model") as mock_encode:
+            embed_model = self.service._get_embed_model("test-collection")
+
+        # Assert: vectors are truncated for the collection, which is created with the configured encoding
+        self.assertIs(embed_model, mock_encode.return_value)
+        self.assertEqual(mock_encode.call_args.args[1], VectorEncoding(dimensions=256, datatype="int8"))
+        self.vector_store.create_collection.assert_called_once_with("test-collection", 256, "int8")
+
+    def test_default_vector_encoding_leaves_collection_to_vector_store(self):
+        # Act
+        embed_model = self.service._get_embed_model("test-collection")
+
+        # Assert
+        self.assertIs(embed_model, self.embeddings.get_model.return_value)
+        self.vector_store.create_collection.assert_not_called()
+
+    def test_ingest_cloud_storage_shards_are_disjoint(self):
+        # Arrange
+        urls = [f"s3://bucket/books/book-{i}.pdf" for i in range(40)]
+        ingested = []
+
+        with patch.object(self.service, "ingest_pdf_bytes") as mock_ingest_pdf_bytes:
+            mock_ingest_pdf_bytes.side_effect = lambda data, source: ingested.append(source)
+
+            # Act: every node of a 3-node deployment lists the same prefix
+            for shard_index in range(3):
+                self.s3_storage.iter_files.return_value = iter(StorageEntry(url=url, size=10) for url in urls)
+                self.service.process(
+                    IngestCloudStorageCmd(url="s3://bucket/books/", shard_index=shard_index, shard_count=3)
+                )
+
+        # Assert: each object is ingested by exactly one node
+        self.assertEqual(sorted(ingested), sorted(urls))
+        self.assertEqual(
+            len({IngestionCheckpoint.default_path("d", "s3://bucket/books/", True, Shard(i, 3)) for i in range(3)}),
+            3,
+        )
+
+    def test_ingest_folder_shard_uses_relative_paths(self):
+        # Arrange
+        folder = os.path.join(self.checkpoint_dir, "books")
+        os.makedirs(os.path.join(folder, "sub"))
+        for name in ["a.pdf", "b.pdf", "sub/c.pdf", "sub/d.pdf"]:
+            open(os.path.join(folder, name), "w").close()
+        shard = Shard(0, 2)
+
+        with patch.object(self.service, "ingest_pdf") as mock_ingest_pdf:
+            # Act
+            result = self.service.process(IngestFolderCmd(folder, shard_index=0, shard_count=2))
+
+        # Assert
+        expected = [name for name in ["a.pdf", "b.pdf", "sub/c.pdf", "sub/d.pdf"] if shard.owns(name)]
+        self.assertEqual(result, len(expected))
+        self.assertEqual(
+            sorted(c.args[0] for c in mock_ingest_pdf.call_args_list), [os.path.join(folder, n) for n in expected]
+        )
+
     def test_ingest_cloud_storage_no_pdfs(self):
         # Arrange
         url = "s3://bucket/empty/"
-        self.s3_storage.list_files.return_value = ["s3://bucket/empty/doc.txt"]
+        self.s3_storage.iter_files.return_value = iter([])
 
         # Act
         cmd = IngestCloudStorageCmd(url=url, recursive=True)
@@ -138,12 +753,14 @@ class TestFileProcessorService(unittest.TestCase):
         # Assert
         self.assertEqual(result, 0)  # No PDFs processed
         self.logger.warn.assert_called_once_with(f"No PDF files found at {url}")
-        self.local_storage.list_files.assert_not_called()
+        self.local_storage.iter_files.assert_not_called()
 
     def test_ingest_cloud_storage_error_handling(self):
         # Arrange
         url = "s3://bucket/error/"
-        self.s3_storage.list_files.return_value = ["s3://bucket/error/doc.pdf"]
+        self.s3_storage.iter_files.return_value = iter([
+            StorageEntry(url="s3://bucket/error/doc.pdf", size=LARGE_OBJECT)
+        ])
         self.s3_storage.download_file.side_effect = OSError("Network error")
 
         # Act
@@ -153,7 +770,45 @@ class TestFileProcessorService(unittest.TestCase):
         # Assert
         self.assertEqual(result, 0)  # No files processed due to error
         self.logger.error.assert_called_once()
-        self.local_storage.list_files.assert_not_called()
+        self.local_storage.iter_files.assert_not_called()
+
+    def test_ingest_cloud_storage_resume_from_checkpoint(self):
+        # Arrange: the first run crashes on the second page
+        url = "s3://bucket/folder/"
+        second_page = "token-2"
+        pages = [
+            [StorageEntry(url=f"s3://bucket/folder/doc{i}.pdf", size=LARGE_OBJECT) for i in (1, 2)],
+            [
+                StorageEntry(url=f"s3://bucket/folder/doc{i}.pdf", size=LARGE_OBJECT, page_token=second_page)
+                for i in (3, 4)
+            ],
+        ]
+
+        def mock_iter_files(url, recursive, suffix, continuation_token):
+            start = 0 if continuation_token is None else 1
+            return (entry for page in pages[start:] for entry in page)
+
+        self.s3_storage.iter_files.side_effect = mock_iter_files
+
+        with patch.object(self.service, "ingest_pdf") as mock_ingest_pdf:
+            mock_ingest_pdf.side_effect = [[], [], [], RuntimeError("Ollama went away")]
+            with self.assertRaises(RuntimeError):
+                self.service.process(IngestCloudStorageCmd(url=url, recursive=True))
+
+        # Act: resume only lists the pending page and skips completed objects
+        self.s3_storage.iter_files.reset_mock()
+        self.s3_storage.download_file.reset_mock()
+        with patch.object(self.service, "ingest_pdf") as mock_ingest_pdf:
+            mock_ingest_pdf.return_value = []
+            result = self.service.process(IngestCloudStorageCmd(url=url, recursive=True, resume=True))
+
+        # Assert
+        self.assertEqual(result, 1)
+        self.s3_storage.iter_files.assert_called_once_with(
+            url, recursive=True, suffix=".pdf", continuation_token=second_page
+        )
+        self.s3_storage.download_file.assert_called_once()
+        self.assertEqual(self.s3_storage.download_file.call_args[0][0], "s3://bucket/folder/doc4.pdf")
 
     def test_ingest_cloud_storage_unsupported_scheme(self):
         # Arrange
@@ -1,13 +1,21 @@
 import os
 import unittest
 import unittest.mock
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 from fastapi.testclient import TestClient
 
 from files_ingestor.adapters.http_app import create_http_app
+from files_ingestor.application.commands.ingest_pdf import IngestBytesCmd, IngestPDFCmd
+from files_ingestor.application.commands.migrate_collection import MigrateCollectionCmd
+from files_ingestor.application.commands.snapshot import ExportSnapshotCmd, ImportSnapshotCmd
+from files_ingestor.application.commands.warm_text_cache import WarmTextCacheCmd
 from files_ingestor.application.handlers.ingestion_handler import IngestionHandler
+from files_ingestor.domain.model.answer import QuestionAnswer, RetrievedNode
 from files_ingestor.domain.ports.logger_port import LoggerPort
+from files_ingestor.domain.services.answer_cache import AnswerCache
+from files_ingestor.domain.services.progress import ProgressTracker
+from files_ingestor.domain.services.query_cache import QueryEmbeddingCache
 
 
 class TestHttpAdapter(unittest.TestCase):
@@ -38,6 +46,26 @@ class TestHttpAdapter(unittest.TestCase):
         self.assertEqual(response.json()["status"], "success")
         self.assertEqual(response.json()["filename"], "test.pdf")
 
+        # Small uploads are ingested from memory, without a temp file
+        command = self.mock_ingestor_handler.handle.call_args[0][0]
+        self.assertIsInstance(command, IngestBytesCmd)
+        self.assertEqual(command.data, test_content)
+        self.assertEqual(command.source, "test.pdf")
+
+    def test_ingest_pdf_endpoint_large_upload_spools_to_disk(self) -> None:
+        """Test that uploads above the in-memory limit are written to the uploads folder."""
+        app = create_http_app(self.mock_logger, self.mock_ingestor_handler, max_in_memory_bytes=4)
+        self.mock_ingestor_handler.handle.return_value = []
+
+        response = TestClient(app).post("/ingest-pdf", files={"file": ("large.pdf", b"Large PDF", "application/pdf")})
+
+        self.assertEqual(response.json()["status"], "success")
+        command = self.mock_ingestor_handler.handle.call_args[0][0]
+        self.assertIsInstance(command, IngestPDFCmd)
+        with open(command.file_name, "rb") as f:
+            self.assertEqual(f.read(), b"Large PDF")
+        os.unlink(command.file_name)
+
     def test_ingest_folder_endpoint(self) -> None:
         """Test the folder ingestion endpoint."""
         # Setup mock to return number of processed files
@@ -90,6 +118,164 @@ class TestHttpAdapter(unittest.TestCase):
         self.assertEqual(command.url, "s3://test-bucket/pdfs/")
         self.assertEqual(command.recursive, True)
 
+    def test_ingest_cloud_storage_endpoint_shard(self) -> None:
+        """Test that the shard of the request is passed on to the command."""
+        self.mock_ingestor_handler.handle.return_value = 1
+
+        response = self.client.post(
+            "/ingest-cloud", json={"url": "s3://test-bucket/pdfs/", "shard_index": 2, "shard_count": 4}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        command = self.mock_ingestor_handler.handle.call_args[0][0]
+        self.assertEqual((command.shard_index, command.shard_count), (2, 4))
+
+    def test_warm_text_cache_endpoint(self) -> None:
+        """Test that warming the text cache sends a warm-up command for the URL, not an ingestion."""
+        self.mock_ingestor_handler.handle.return_value = 5
+
+        response = self.client.post("/text-cache/warm", json={"url": "s3://test-bucket/pdfs/"})
+
+        self.assertEqual(response.json(), {"status": "success", "num_files": 5})
+        command = self.mock_ingestor_handler.handle.call_args[0][0]
+        self.assertIsInstance(command, WarmTextCacheCmd)
+        self.assertEqual(command.url, "s3://test-bucket/pdfs/")
+
+    def test_migrate_collection_endpoint(self) -> None:
+        """Test that a migration runs synchronously on request and reports the pages embedded."""
+        self.mock_ingestor_handler.handle.return_value = 120
+
+        response = self.client.post(
+            "/collections/book-library/migrate", json={"embeddings": "embeddings.bgem3", "background": False}
+        )
+
+        self.assertEqual(response.json(), {"status": "success", "num_pages": 120})
+        command = self.mock_ingestor_handler.handle.call_args[0][0]
+        self.assertIsInstance(command, MigrateCollectionCmd)
+        self.assertEqual((command.collection_name, command.embeddings), ("book-library", "embeddings.bgem3"))
+
+    def test_snapshot_endpoints(self) -> None:
+        """Test that snapshot bundles are exported and imported through the ingestion handler."""
+        self.mock_ingestor_handler.handle.return_value = 42
+
+        export_response = self.client.post("/snapshots/export", json={"path": "/backups/books.snapshot"})
+        import_response = self.client.post(
+            "/snapshots/import", json={"path": "/backups/books.snapshot", "collection": "books", "replace": True}
+        )
+
+        self.assertEqual(export_response.json(), {"status": "success", "num_points": 42})
+        self.assertEqual(import_response.json(), {"status": "success", "num_points": 42})
+        export_cmd, import_cmd = (args[0][0] for args in self.mock_ingestor_handler.handle.call_args_list)
+        self.assertIsInstance(export_cmd, ExportSnapshotCmd)
+        self.assertIsInstance(import_cmd, ImportSnapshotCmd)
+        self.assertEqual((import_cmd.collection_name, import_cmd.replace), ("books", True))
+
+    def test_question_batch_endpoint(self) -> None:
+        """Test that a batch of questions is answered through the question handler."""
+        question_handler = Mock()
+        answer = QuestionAnswer("Who is Ahab?", "The captain", timings={"total_seconds": 1.5})
+        question_handler.handle.return_value = [answer]
+        app = create_http_app(self.mock_logger, self.mock_ingestor_handler, question_handler=question_handler)
+        client = TestClient(app)
+
+        response = client.post(
+            "/questions/batch",
+            json={
+                "questions": ["Who is Ahab?"],
+                "top_k": 3,
+                "filters": {"source": "moby-dick.pdf"},
+                "response_mode": "compact",
+            },
+        )
+
+        self.assertEqual(response.json()["answers"][0]["answer"], "The captain")
+        self.assertEqual(response.json()["answers"][0]["timings"], {"total_seconds": 1.5})
+        query = question_handler.handle.call_args[0][0]
+        self.assertEqual((query.questions, query.top_k), (["Who is Ahab?"], 3))
+        self.assertEqual((query.filters, query.response_mode), ({"source": "moby-dick.pdf"}, "compact"))
+        self.assertEqual(self.client.post("/questions/batch", json={"questions": ["q"]}).status_code, 501)
+
+    def test_retrieve_endpoint(self) -> None:
+        """Test that retrieval returns the scored nodes from the question handler."""
+        question_handler = Mock()
+        question_handler.handle.return_value = [RetrievedNode("n1", 0.9, "Call me Ishmael.", {"page": 1})]
+        client = TestClient(
+            create_http_app(self.mock_logger, self.mock_ingestor_handler, question_handler=question_handler)
+        )
+
+        response = client.post("/retrieve", json={"query": "Who is Ishmael?", "top_k": 1})
+
+        self.assertEqual(
+            response.json(),
+            {
+                "status": "success",
+                "nodes": [{"node_id": "n1", "score": 0.9, "text": "Call me Ishmael.", "metadata": {"page": 1}}],
+            },
+        )
+        query = question_handler.handle.call_args[0][0]
+        self.assertEqual((query.query, query.top_k), ("Who is Ishmael?", 1))
+
+    def test_retrieve_collections_endpoint(self) -> None:
+        """Test that multi-collection retrieval is awaited on the handler with the requested fusion."""
+        question_handler = Mock()
+        question_handler.ahandle = AsyncMock(
+            return_value=[RetrievedNode("n1", 0.03, "Call me Ishmael.", {"collection": "books"})]
+        )
+        client = TestClient(
+            create_http_app(self.mock_logger, self.mock_ingestor_handler, question_handler=question_handler)
+        )
+
+        request = {"query": "Who is Ishmael?", "collections": ["books", "news"], "fusion": "rrf"}
+        response = client.post("/retrieve/collections", json=request)
+
+        self.assertEqual(response.json()["nodes"][0]["metadata"], {"collection": "books"})
+        query = question_handler.ahandle.call_args[0][0]
+        self.assertEqual((query.collection_names, query.fusion), (["books", "news"], "rrf"))
+        self.assertEqual(client.post("/retrieve/collections", json={"query": "q", "fusion": "max"}).status_code, 422)
+
+    def test_metrics_endpoint(self) -> None:
+        """Test that the query embedding and answer cache hit rates are exposed as metrics."""
+        query_cache = QueryEmbeddingCache()
+        query_cache.put("bge-m3", "Who is Ahab?", [1.0])
+        query_cache.get("bge-m3", "who is ahab?")
+        answer_cache = AnswerCache()
+        answer_cache.get("Who is Ahab?", ["n1"], "claude", "compact")
+        client = TestClient(
+            create_http_app(
+                self.mock_logger, self.mock_ingestor_handler, query_cache=query_cache, answer_cache=answer_cache
+            )
+        )
+
+        response = client.get("/metrics")
+
+        self.assertEqual(response.json()["query_embedding_cache"]["hit_rate"], 1.0)
+        self.assertEqual(response.json()["answer_cache"]["misses"], 1)
+        self.assertEqual(self.client.get("/metrics").json(), {})
+
+    def test_ingest_cloud_storage_background_progress(self) -> None:
+        """Test that background ingestions return a job id whose progress can be polled and streamed."""
+        progress = ProgressTracker()
+        client = TestClient(create_http_app(self.mock_logger, self.mock_ingestor_handler, progress=progress))
+
+        def handle(cmd):
+            with progress.track(cmd.job_id, cmd.name()):
+                ProgressTracker.add(files_done=2, vectors_upserted=40)
+            return 2
+
+        self.mock_ingestor_handler.handle.side_effect = handle
+
+        response = client.post(
+            "/ingest-cloud", json={"url": "s3://test-bucket/pdfs/", "background": True, "job_id": "j1"}
+        )
+        self.assertEqual(response.json(), {"status": "accepted", "job_id": "j1"})
+
+        events = client.get("/ingestions/j1/events", params={"interval": 0.01}).text
+        self.assertIn('"status": "succeeded"', events.strip().split("\n\n")[-1])
+
+        snapshot = client.get("/ingestions/j1").json()
+        self.assertEqual((snapshot["files_done"], snapshot["vectors_upserted"]), (2, 40))
+        self.assertEqual(client.get("/ingestions/unknown").status_code, 404)
+
     def test_ingest_cloud_storage_endpoint_invalid_url(self) -> None:
         """Test cloud storage ingestion with invalid URL."""
         # Setup mock handler to raise ValueError
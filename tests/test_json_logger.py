@@ -0,0 +1,121 @@
+import io
+import json
+import logging
+import threading
+import unittest
+
+from files_ingestor.adapters.json_logger import QueueJsonLoggerAdapter
+from files_ingestor.domain.ports.logger_port import log_context
+
+
+class BlockedStream(io.StringIO):
+    """Stream whose writes wait for `release`, like a collector that stopped reading."""
+
+    def __init__(self):
+        super().__init__()
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def write(self, s: str) -> int:
+        self.writing.set()
+        self.release.wait(5)
+        return super().write(s)
+
+
+class TestQueueJsonLoggerAdapter(unittest.TestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+
+    def mk_logger(self, **kwargs) -> QueueJsonLoggerAdapter:
+        logger = QueueJsonLoggerAdapter(
+            logger_name=f"test.{self.id()}", log_level=logging.DEBUG, stream=self.stream, **kwargs
+        )
+        self.addCleanup(logger.close)
+        return logger
+
+    def records(self) -> list[dict]:
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_json_with_context_flushed_on_close(self):
+        """Test that queued records are written as JSON lines with their context once closed."""
+        logger = self.mk_logger()
+
+        with log_context(job="job-1"):
+            logger.info("Started")
+            with log_context(file="book.pdf"):
+                logger.warn("Slow page")
+        logger.info("Done")
+        logger.close()
+
+        records = self.records()
+        self.assertEqual([record["msg"] for record in records], ["Started", "Slow page", "Done"])
+        self.assertEqual(records[0]["job"], "job-1")
+        self.assertEqual((records[1]["job"], records[1]["file"], records[1]["level"]), ("job-1", "book.pdf", "WARNING"))
+        self.assertNotIn("job", records[2])
+
+    def test_error_includes_traceback(self):
+        """Test that errors carry the rendered traceback."""
+        logger = self.mk_logger()
+
+        def parse_pdf() -> None:
+            raise ValueError("broken pdf")  # noqa: TRY003
+
+        try:
+            parse_pdf()
+        except ValueError as e:
+            logger.error("Failed to process book.pdf", e)  # noqa: TRY400
+        logger.close()
+
+        (record,) = self.records()
+        self.assertEqual(record["msg"], "Failed to process book.pdf: broken pdf")
+        self.assertIn("ValueError: broken pdf", record["error"])
+
+    def test_sampling_per_level(self):
+        """Test that sampled levels keep one record in 1 / rate and other levels keep them all."""
+        logger = self.mk_logger(sample_rates={logging.DEBUG: 0.1})
+
+        for i in range(25):
+            logger.debug(f"Skipping non-pdf file: {i}.txt")
+        logger.info("Ingested 0 files")
+        logger.close()
+
+        records = self.records()
+        self.assertEqual(
+            [record["msg"] for record in records if record["level"] == "DEBUG"],
+            ["Skipping non-pdf file: 0.txt", "Skipping non-pdf file: 10.txt", "Skipping non-pdf file: 20.txt"],
+        )
+        self.assertEqual(records[0]["sampled"], 10)
+        self.assertEqual(records[-1]["msg"], "Ingested 0 files")
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test that records logged while the queue is full are dropped, counted and reported on close."""
+        self.stream = BlockedStream()
+        logger = self.mk_logger(max_queue_size=1)
+        logger.info("Started")
+        self.stream.writing.wait(5)
+
+        # Act: the writer is stuck on the first record, the second fills the queue
+        logger.info("Page 1")
+        logger.info("Page 2")
+
+        # Assert
+        self.assertEqual(logger.dropped, 1)
+        self.stream.release.set()
+        logger.close()
+        records = self.records()
+        self.assertEqual([record["msg"] for record in records[:2]], ["Started", "Page 1"])
+        self.assertEqual(records[-1]["level"], "WARNING")
+        self.assertIn("Dropped 1 log records", records[-1]["msg"])
+
+    def test_logging_after_close_is_synchronous(self):
+        """Test that nothing is lost when logging after shutdown."""
+        logger = self.mk_logger()
+        logger.close()
+
+        logger.info("Late message")
+
+        self.assertEqual(self.records()[0]["msg"], "Late message")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,15 @@
+import contextlib
+import errno
 import os
+import queue
 import tempfile
+import threading
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from files_ingestor.adapters.repositories.local_storage import LocalStorageAdapter
+from files_ingestor.adapters.repositories.local_watcher import NativeWatcher, PollingWatcher
+from files_ingestor.domain.model.storage_entry import FileChange
 from files_ingestor.domain.ports.logger_port import LoggerPort
 
 
@@ -68,6 +74,44 @@ class TestLocalStorageAdapter(unittest.TestCase):
         expected = {f"file://{os.path.join(self.temp_dir, path)}" for path in self.test_files}
         self.assertEqual(set(files), expected)
 
+    def test_iter_files_with_filters(self):
+        """Test streaming entries with their size and mtime, filtered by suffix and pattern."""
+        url = f"file://{self.temp_dir}"
+
+        entries = list(self.storage.iter_files(url, recursive=True, suffix=".PDF"))
+        self.assertEqual(
+            {entry.url for entry in entries},
+            {f"file://{os.path.join(self.temp_dir, path)}" for path in ("file1.pdf", "subfolder/file3.pdf")},
+        )
+        for entry in entries:
+            self.assertEqual(entry.size, len("test content 1"))
+            self.assertIsNotNone(entry.mtime)
+
+        entries = list(self.storage.iter_files(url, recursive=True, pattern="subfolder/*.txt"))
+        expected_url = f"file://{os.path.join(self.temp_dir, 'subfolder/file4.txt')}"
+        self.assertEqual([entry.url for entry in entries], [expected_url])
+
+    def test_iter_files_skips_files_removed_while_listing(self):
+        """Test that a file deleted between the listing and its stat only drops that file, not its siblings."""
+        url = f"file://{self.temp_dir}"
+        scandir = os.scandir
+
+        @contextlib.contextmanager
+        def scandir_then_delete(path):
+            with scandir(path) as entries:
+                listed = sorted(entries, key=lambda entry: entry.name)
+            if path == self.temp_dir:
+                os.unlink(os.path.join(self.temp_dir, "file1.pdf"))
+            yield iter(listed)
+
+        with patch("files_ingestor.adapters.repositories.local_storage.os.scandir", side_effect=scandir_then_delete):
+            entries = list(self.storage.iter_files(url, recursive=True))
+
+        self.assertEqual(
+            {entry.url for entry in entries},
+            {f"file://{os.path.join(self.temp_dir, path)}" for path in self.test_files if path != "file1.pdf"},
+        )
+
     def test_list_files_nonexistent_path(self):
         """Test listing files from a nonexistent path."""
         url = "file:///nonexistent/path"
@@ -111,6 +155,68 @@ class TestLocalStorageAdapter(unittest.TestCase):
         # Clean up
         os.unlink(target)
 
+    def test_download_file_across_filesystems_copies(self):
+        """Test falling back to a copy when a hard link cannot cross filesystems."""
+        source = os.path.join(self.temp_dir, "file1.pdf")
+        target = os.path.join(self.temp_dir, "copied.pdf")
+
+        with patch("os.link", side_effect=OSError(errno.EXDEV, "Invalid cross-device link")):
+            result = self.storage.download_file(f"file://{source}", target)
+
+        self.assertEqual(result, target)
+        with open(target) as f:
+            self.assertEqual(f.read(), "test content 1")
+        os.unlink(target)
+
+    def test_local_path_reads_in_place(self):
+        """Test that local files are exposed for in-place reads."""
+        source = os.path.join(self.temp_dir, "file1.pdf")
+        self.assertEqual(self.storage.local_path(f"file://{source}"), source)
+
+    def test_watch_reports_debounced_changes(self):
+        """Test that a new PDF is reported once its writes settle, with the polling fallback."""
+        new_pdf = os.path.join(self.temp_dir, "new.pdf")
+
+        def write_files():
+            with open(new_pdf, "w") as f:
+                f.write("new content")
+            with open(os.path.join(self.temp_dir, "file2.txt"), "a") as f:
+                f.write("ignored, not a pdf")
+
+        with patch.object(NativeWatcher, "available", return_value=False):
+            changes = self.storage.watch(
+                f"file://{self.temp_dir}", suffix=".pdf", debounce_seconds=0.1, poll_interval=0.05
+            )
+            threading.Timer(0.2, write_files).start()
+            batch = next(changes)
+            changes.close()
+
+        self.assertEqual(batch, [FileChange(url=f"file://{new_pdf}", kind="created")])
+
+        # Clean up
+        os.unlink(new_pdf)
+
+    def test_polling_scan_keeps_siblings_of_a_file_deleted_mid_scan(self):
+        """Test that a file removed while scanning is the only one missing from the snapshot."""
+        scandir = os.scandir
+
+        @contextlib.contextmanager
+        def scandir_then_delete(path):
+            with scandir(path) as entries:
+                listed = sorted(entries, key=lambda entry: entry.name)
+            if path == self.temp_dir:
+                os.unlink(os.path.join(self.temp_dir, "file1.pdf"))
+            yield iter(listed)
+
+        watcher = PollingWatcher(self.temp_dir, recursive=True, changes=queue.Queue())
+        with patch("files_ingestor.adapters.repositories.local_watcher.os.scandir", side_effect=scandir_then_delete):
+            snapshot = watcher._scan()
+
+        self.assertEqual(
+            set(snapshot),
+            {os.path.join(self.temp_dir, path) for path in self.test_files if path != "file1.pdf"},
+        )
+
     def test_download_file_nonexistent(self):
         """Test downloading a nonexistent file."""
         url = f"file://{self.temp_dir}/nonexistent.pdf"
@@ -0,0 +1,50 @@
+import threading
+import unittest
+
+from files_ingestor.domain.services.memory_budget import MemoryBudget
+
+
+class TestMemoryBudget(unittest.TestCase):
+    def test_reserve_waits_for_budget(self):
+        """Test that a reservation beyond the remaining budget waits until memory is released."""
+        budget = MemoryBudget(max_bytes=100)
+        admitted = threading.Event()
+
+        def reserve():
+            with budget.reserve(60):
+                admitted.set()
+
+        with budget.reserve(60):
+            waiter = threading.Thread(target=reserve)
+            waiter.start()
+            self.assertFalse(admitted.wait(0.1))
+            self.assertEqual(budget.used, 60)
+
+        self.assertTrue(admitted.wait(1))
+        waiter.join()
+        self.assertEqual(budget.used, 0)
+
+    def test_oversized_reservation_admitted_alone(self):
+        """Test that a file larger than the whole budget still gets through when nothing else is held."""
+        budget = MemoryBudget(max_bytes=100)
+
+        with budget.reserve(500) as reservation:
+            self.assertEqual(budget.used, 500)
+            reservation.resize(50)
+            self.assertEqual(budget.used, 50)
+
+        self.assertEqual(budget.used, 0)
+
+    def test_nested_reservations_are_shared(self):
+        """Test that nested reservations of a thread reuse the outer one instead of deadlocking."""
+        budget = MemoryBudget(max_bytes=100)
+
+        with budget.reserve(80) as outer, budget.reserve(90) as inner:
+            self.assertIs(inner, outer)
+            self.assertEqual(budget.used, 90)
+
+        self.assertEqual(budget.used, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import patch
+
+from files_ingestor.domain.model.migration import CollectionMigration
+from files_ingestor.domain.services.adaptive_limiter import Throttle
+
+
+class TestCollectionMigration(unittest.TestCase):
+    def test_next_version(self):
+        """Test that versions count up from the highest existing one, a plain collection being v0."""
+        self.assertEqual(CollectionMigration.next_version("books", ["books", "other-v7"]), "books-v1")
+        self.assertEqual(CollectionMigration.next_version("books", ["books-v1", "books-v3", "books-v2x"]), "books-v4")
+
+    def test_plan_catches_up_with_changes(self):
+        """Test that a pass embeds new and changed pages and removes deleted and changed ones."""
+        migration = CollectionMigration("books", "books-v1")
+        stale, to_embed = migration.plan({"a#page=0": ("a.pdf", "h1"), "b#page=0": ("b.pdf", "h2")})
+        self.assertEqual((stale, to_embed), ([], {"a.pdf": ["a#page=0"], "b.pdf": ["b#page=0"]}))
+        migration.record("a#page=0", "h1", ["n1"])
+        migration.record("b#page=0", "h2", ["n2"])
+
+        stale, to_embed = migration.plan({"b#page=0": ("b.pdf", "h2-new"), "c#page=0": ("c.pdf", "h3")})
+
+        self.assertEqual(sorted(stale), ["a#page=0", "b#page=0"])
+        self.assertEqual(to_embed, {"b.pdf": ["b#page=0"], "c.pdf": ["c#page=0"]})
+        self.assertEqual(migration.forget(stale), ["n1", "n2"])
+        self.assertEqual(migration.plan({}), ([], {}))
+
+
+class TestThrottle(unittest.TestCase):
+    def test_paces_to_rate(self):
+        """Test that work beyond the rate waits for the time booked by the previous work."""
+        clock = [100.0]
+        with (
+            patch("files_ingestor.domain.services.adaptive_limiter.time.monotonic", side_effect=lambda: clock[0]),
+            patch("files_ingestor.domain.services.adaptive_limiter.time.sleep") as sleep,
+        ):
+            throttle = Throttle(rate=10)
+            throttle.wait(5)
+            sleep.assert_not_called()
+            throttle.wait(5)
+            sleep.assert_called_once_with(0.5)
+
+            Throttle(rate=0).wait(1000)
+            sleep.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
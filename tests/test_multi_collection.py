@@ -0,0 +1,109 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from files_ingestor.domain.services.multi_collection import MultiCollectionSearch, fuse_results
+
+
+def mk_node(node_id: str, score: float) -> MagicMock:
+    node = MagicMock(score=score)
+    node.node.node_id = node_id
+    node.node.metadata = {}
+    return node
+
+
+class TestFuseResults(unittest.TestCase):
+    def test_reciprocal_rank_fusion(self):
+        """Test that nodes ranked well in several collections come first, whatever the scales of the scores."""
+        results = {
+            "news": [mk_node("a", 0.91), mk_node("b", 0.90), mk_node("c", 0.89)],
+            "descriptions": [mk_node("c", 12.0), mk_node("d", 3.0)],
+        }
+
+        fused = fuse_results(results, top_k=4, method="rrf", rrf_k=60)
+
+        # b and d tie as second in their collection: the order of the collections decides
+        self.assertEqual([node.node.node_id for node in fused], ["c", "a", "b", "d"])
+        self.assertAlmostEqual(fused[0].score, 1 / 63 + 1 / 61)
+
+    def test_normalized_scores(self):
+        """Test that scores are rescaled per collection, so one scoring higher overall does not dominate."""
+        results = {
+            "news": [mk_node("a", 0.9), mk_node("b", 0.5), mk_node("c", 0.1)],
+            "descriptions": [mk_node("d", 40.0), mk_node("e", 30.0), mk_node("f", 20.0)],
+        }
+
+        fused = fuse_results(results, top_k=4, method="score")
+
+        self.assertEqual([node.node.node_id for node in fused], ["a", "d", "b", "e"])
+        self.assertEqual([node.score for node in fused], [1.0, 1.0, 0.5, 0.5])
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            fuse_results({}, top_k=3, method="borda")
+
+
+class TestMultiCollectionSearch(unittest.TestCase):
+    def setUp(self):
+        self.logger = MagicMock()
+        self.vector_store = MagicMock()
+        self.vector_store.get_vector_size.side_effect = lambda name: {"news": 2}.get(name)
+
+    def test_collections_are_searched_concurrently_and_slow_ones_skipped(self):
+        """Test that latency is bounded by the per-collection timeout, and a slow or failing collection is left out."""
+        delays = {"news": 0.1, "descriptions": 0.1, "archive": 5.0}
+        searched = {}
+
+        async def asearch_batch(collection_name, vectors, top_k, filters):
+            searched[collection_name] = vectors[0]
+            if collection_name == "broken":
+                raise ConnectionError("collection unavailable")  # noqa: TRY003
+            await asyncio.sleep(delays[collection_name])
+            return [[mk_node(f"{collection_name}-{i}", 1.0 - i / 10) for i in range(top_k)]]
+
+        self.vector_store.asearch_batch.side_effect = asearch_batch
+        search = MultiCollectionSearch(self.vector_store, self.logger, timeout_seconds=0.3)
+
+        start = time.perf_counter()
+        nodes = asyncio.run(search.search([3.0, 4.0, 1.0], ["news", "descriptions", "archive", "broken"], top_k=2))
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual([node.node.node_id for node in nodes], ["news-0", "descriptions-0"])
+        self.assertEqual(nodes[1].node.metadata["collection"], "descriptions")
+        # Each collection is queried in its own (possibly truncated) space
+        self.assertEqual(searched["news"], [0.6, 0.8])
+        self.assertEqual(searched["descriptions"], [3.0, 4.0, 1.0])
+        self.logger.warn.assert_called_once()
+        self.logger.error.assert_called_once()
+
+    def test_vector_sizes_are_cached_until_invalidated(self):
+        """Test that each collection's vector size is read once, and again after its alias was swapped."""
+
+        async def asearch_batch(collection_name, vectors, top_k, filters):
+            return [[mk_node(f"{collection_name}-0", 0.9)]]
+
+        self.vector_store.asearch_batch.side_effect = asearch_batch
+        search = MultiCollectionSearch(self.vector_store, self.logger)
+
+        for _ in range(3):
+            asyncio.run(search.search([3.0, 4.0, 1.0], ["news"], top_k=1))
+        self.vector_store.get_vector_size.side_effect = lambda name: 3
+        search.invalidate_vector_sizes("news")
+        asyncio.run(search.search([3.0, 4.0, 1.0], ["news"], top_k=1))
+
+        self.assertEqual(self.vector_store.get_vector_size.call_count, 2)
+        self.assertEqual(self.vector_store.asearch_batch.call_args[0][1], [[3.0, 4.0, 1.0]])
+
+    def test_from_config(self):
+        config = MagicMock()
+        config.get.side_effect = lambda key, default: {"query.multi_collection.fusion": "score"}.get(key, default)
+
+        search = MultiCollectionSearch.from_config(config, self.vector_store, self.logger)
+
+        self.assertEqual((search.fusion, search.rrf_k, search.timeout_seconds), ("score", 60, 5.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from files_ingestor.domain.services.near_duplicates import NearDuplicateFilter, SimHashIndex, simhash
+
+TEXT = (
+    "It was the best of times, it was the worst of times, it was the age of wisdom, it was the age of "
+    "foolishness, it was the epoch of belief, it was the epoch of incredulity, it was the season of Light"
+)
+
+
+def mk_node(node_id: str, text: str, page: int = 0) -> MagicMock:
+    node = MagicMock(node_id=node_id, ref_doc_id=f"book.pdf#page={page}")
+    node.get_content.return_value = text
+    node.metadata = {"source": "book.pdf", "page": page}
+    return node
+
+
+class TestNearDuplicates(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_path = os.path.join(self.temp_dir, "book-library.json")
+
+    def tearDown(self):
+        if os.path.exists(self.index_path):
+            os.unlink(self.index_path)
+        os.rmdir(self.temp_dir)
+
+    def test_simhash_is_close_for_reprints(self):
+        """Test that a reprint with a small change stays within a few bits of the original."""
+        reprint = TEXT.replace("season of Light", "season of light.")
+        self.assertLessEqual((simhash(TEXT) ^ simhash(reprint)).bit_count(), 3)
+        self.assertGreater((simhash(TEXT) ^ simhash("A completely different chunk about cloud storage")).bit_count(), 3)
+
+    def test_filter_drops_duplicates_and_counts_savings(self):
+        """Test that duplicates are dropped, counted and linked to the stored chunk."""
+        index = SimHashIndex(self.index_path, max_distance=3)
+        near_duplicate_filter = NearDuplicateFilter(index=index, mode="link")
+
+        kept = near_duplicate_filter([mk_node("n1", TEXT), mk_node("n2", TEXT, page=7), mk_node("n3", "Other text")])
+        near_duplicate_filter.commit()
+
+        self.assertEqual([node.node_id for node in kept], ["n1", "n3"])
+        self.assertEqual(near_duplicate_filter.skipped, 1)
+        self.assertEqual(index.links, {"book.pdf#page=7": "n1"})
+
+    def test_discarded_run_leaves_the_index_untouched(self):
+        """Test that chunks of a failed run are only staged, so its retry keeps them."""
+        index = SimHashIndex(self.index_path)
+        near_duplicate_filter = NearDuplicateFilter(index=index)
+
+        near_duplicate_filter([mk_node("n1", TEXT)])
+        near_duplicate_filter.discard()
+        kept = near_duplicate_filter([mk_node("n2", TEXT)])
+
+        self.assertEqual([node.node_id for node in kept], ["n2"])
+        self.assertEqual(index.signatures, {})
+        near_duplicate_filter.commit()
+        self.assertEqual(list(index.signatures), ["n2"])
+
+    def test_index_persists_and_forgets_removed_nodes(self):
+        """Test that signatures survive a reload and removed nodes stop matching."""
+        index = SimHashIndex(self.index_path)
+        index.add("n1", simhash(TEXT))
+        index.save()
+
+        reloaded = SimHashIndex.load(self.index_path)
+        self.assertEqual(reloaded.find(simhash(TEXT)), "n1")
+
+        reloaded.remove(["n1"])
+        self.assertIsNone(reloaded.find(simhash(TEXT)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+from files_ingestor.adapters import ollama_http
+from files_ingestor.adapters.ollama_http import (
+    OllamaHttpSettings,
+    ollama_client,
+    shared_transport,
+    use_shared_clients,
+    warm_up_in_background,
+)
+
+
+class TestOllamaHttp(unittest.TestCase):
+    def setUp(self):
+        ollama_http._transports.clear()
+
+    def test_settings_from_config(self):
+        """Test that settings are read from the model's config entry, with defaults for missing keys."""
+        values = {
+            "embeddings.bgem3.base_url": "http://ollama:11434",
+            "embeddings.bgem3.pool.max_connections": 4,
+            "embeddings.bgem3.keep_alive": "1h",
+        }
+        config = MagicMock()
+        config.get.side_effect = lambda key, default: values.get(key, default)
+
+        settings = OllamaHttpSettings.from_config(config, "embeddings.bgem3")
+
+        self.assertEqual(settings.base_url, "http://ollama:11434")
+        self.assertEqual(settings.max_connections, 4)
+        self.assertEqual(settings.model_keep_alive, "1h")
+        self.assertEqual(settings.max_keepalive_connections, 8)
+        self.assertEqual(settings.timeout, 300.0)
+
+    def test_transport_shared_per_host(self):
+        """Test that clients of the same host share one connection pool and other hosts get their own."""
+        with patch.object(ollama_http.httpx, "HTTPTransport", side_effect=lambda **kwargs: object()):
+            first = shared_transport(OllamaHttpSettings("http://a:11434"))
+            second = shared_transport(OllamaHttpSettings("http://a:11434", max_connections=2))
+            other = shared_transport(OllamaHttpSettings("http://b:11434"))
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    def test_clients_use_shared_transport(self):
+        """Test that sync clients are built on the shared transport and models get both clients replaced."""
+        settings = OllamaHttpSettings("http://a:11434")
+        with patch.object(ollama_http.ollama, "Client") as client_cls:
+            ollama_client(settings)
+        self.assertIs(client_cls.call_args.kwargs["transport"], shared_transport(settings))
+        self.assertEqual(client_cls.call_args.kwargs["host"], "http://a:11434")
+
+        model = MagicMock()
+        use_shared_clients(model, settings)
+        self.assertIsNotNone(model._client)
+        self.assertIsNotNone(model._async_client)
+
+    def test_warm_up_failure_is_logged(self):
+        """Test that a failing warm-up only logs a warning."""
+        logger = MagicMock()
+
+        warm_up_in_background("bge-m3", MagicMock(side_effect=ConnectionError("refused")), logger).join()
+
+        logger.warn.assert_called_once()
+        logger.info.assert_not_called()
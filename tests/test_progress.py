@@ -0,0 +1,67 @@
+import unittest
+from unittest.mock import patch
+
+from files_ingestor.domain.services.progress import ProgressCounter, ProgressTracker
+
+
+class TestProgressTracker(unittest.TestCase):
+    def test_counters_rates_and_eta(self):
+        """Test that counters add up and rates and ETA come from the sliding window."""
+        tracker = ProgressTracker()
+
+        with (
+            patch("files_ingestor.domain.services.progress.time.monotonic", return_value=100.0) as mock_monotonic,
+            tracker.track("job-1", "Ingest Folder Command") as progress,
+        ):
+            progress.set_total(10)
+            for second in range(1, 5):
+                mock_monotonic.return_value = 100.0 + second
+                ProgressTracker.add(files_done=1, pages=3, bytes_downloaded=1000)
+
+            snapshot = progress.snapshot()
+
+        self.assertEqual(snapshot["status"], "running")
+        self.assertEqual((snapshot["files_done"], snapshot["pages"], snapshot["bytes_downloaded"]), (4, 12, 4000))
+        self.assertAlmostEqual(snapshot["rates"]["files_per_second"], 1.0)
+        self.assertAlmostEqual(snapshot["rates"]["bytes_per_second"], 1000.0)
+        self.assertAlmostEqual(snapshot["eta_seconds"], 6.0)
+        self.assertEqual(tracker.get("job-1").status, "succeeded")
+
+    def test_failed_job_and_no_current_job(self):
+        """Test that failures are recorded and counting outside a job is a no-op."""
+        tracker = ProgressTracker()
+
+        with self.assertRaises(ValueError), tracker.track("job-2", "Ingest PDF Command"):
+            raise ValueError("broken pdf")  # noqa: TRY003
+
+        ProgressTracker.add(files_done=1)
+        self.assertIsNone(ProgressTracker.current())
+        snapshot = tracker.get("job-2").snapshot()
+        self.assertEqual((snapshot["status"], snapshot["error"], snapshot["files_done"]), ("failed", "broken pdf", 0))
+
+    def test_expected_job_is_reused(self):
+        """Test that a job registered before it starts keeps its entry once running."""
+        tracker = ProgressTracker()
+        queued = tracker.expect("job-3", "Ingest Cloud Storage Command")
+        self.assertEqual(queued.snapshot()["status"], "queued")
+
+        with tracker.track("job-3", "Ingest Cloud Storage Command") as progress:
+            ProgressCounter()([object(), object()])
+
+        self.assertIs(progress, queued)
+        self.assertEqual(queued.snapshot()["chunks_embedded"], 2)
+
+    def test_finished_jobs_are_evicted(self):
+        """Test that only the most recent finished jobs are kept."""
+        tracker = ProgressTracker(max_finished=2)
+
+        for i in range(4):
+            with tracker.track(f"job-{i}", "Ingest PDF Command"):
+                pass
+        tracker.expect("job-4", "Ingest PDF Command")
+
+        self.assertEqual([progress.job_id for progress in tracker.jobs()], ["job-2", "job-3", "job-4"])
+
+
+if __name__ == "__main__":
+    unittest.main()
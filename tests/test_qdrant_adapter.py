@@ -0,0 +1,106 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from files_ingestor.adapters.qdrant import QdrantRepository
+from files_ingestor.domain.services.file_processor_service import FileProcessorService
+
+
+def mk_points(count: int) -> list[dict]:
+    return [
+        {
+            "id": f"00000000-0000-0000-0000-{i:012d}",
+            "vector": [1.0, float(i), 0.5, 0.25],
+            "payload": {"source": f"book-{i % 2}.pdf", "page": i},
+        }
+        for i in range(count)
+    ]
+
+
+class TestQdrantRepository(unittest.TestCase):
+    """Runs against Qdrant's local in-memory mode, no server needed."""
+
+    def setUp(self):
+        self.repository = QdrantRepository(":memory:", MagicMock())
+        self.repository.create_collection("books", 4)
+
+    def test_scroll_returns_upserted_points(self):
+        points = mk_points(10)
+        self.repository.upsert_points("books", points)
+
+        batches = list(self.repository.scroll_points("books", batch_size=4))
+
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+        scrolled = sorted((point for batch in batches for point in batch), key=lambda point: point["id"])
+        self.assertEqual([point["payload"] for point in scrolled], [point["payload"] for point in points])
+        self.assertEqual(len(scrolled[3]["vector"]), 4)
+
+    def test_search_batch_filters_by_metadata(self):
+        self.repository.upsert_points("books", mk_points(10))
+
+        query = [1.0, 9.0, 0.5, 0.25]
+        results = self.repository.search_batch("books", [query], top_k=3, filters={"source": "book-0.pdf"})
+
+        self.assertEqual(len(results[0]), 3)
+        self.assertTrue(all(node.node.metadata["source"] == "book-0.pdf" for node in results[0]))
+
+    def test_swap_alias_replaces_plain_collection_only_on_request(self):
+        self.repository.create_collection("books-v1", 4)
+        self.repository.create_collection("books-v2", 4)
+
+        with self.assertRaises(ValueError):
+            self.repository.swap_alias("books", "books-v1")
+        self.assertEqual(self.repository.resolve_collection("books"), "books")
+
+        first = self.repository.swap_alias("books", "books-v1", replace_collection=True)
+        second = self.repository.swap_alias("books", "books-v2")
+
+        self.assertEqual((first, second), ("books", "books-v1"))
+        self.assertEqual(self.repository.resolve_collection("books"), "books-v2")
+
+
+class TestSnapshotRoundTrip(unittest.TestCase):
+    """Exports a collection from one in-memory Qdrant and restores it into another, as when bootstrapping a node."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def mk_service(self, repository: QdrantRepository, persist_path: str) -> FileProcessorService:
+        config = MagicMock()
+        config.get.side_effect = lambda key, default: {
+            "collections.book-library": "books",
+            "documentStores.bookstore.props.path": persist_path,
+        }.get(key, default)
+        embeddings = MagicMock()
+        embeddings.get_model.return_value.model_name = "bge-m3"
+        return FileProcessorService(MagicMock(), config, repository, embeddings, MagicMock(), MagicMock(), MagicMock())
+
+    def test_export_then_import(self):
+        source_repository = QdrantRepository(":memory:", MagicMock())
+        source_repository.create_collection("books", 4)
+        source_repository.upsert_points("books", mk_points(600))
+        source_dir = os.path.join(self.tmp_dir, "source")
+        os.makedirs(source_dir)
+        with open(os.path.join(source_dir, "docstore.json"), "w") as f:
+            f.write("{}")
+        bundle_path = os.path.join(self.tmp_dir, "books.snapshot")
+
+        exported = self.mk_service(source_repository, source_dir).export_snapshot(bundle_path)
+
+        target_repository = QdrantRepository(":memory:", MagicMock())
+        target_dir = os.path.join(self.tmp_dir, "target")
+        imported = self.mk_service(target_repository, target_dir).import_snapshot(bundle_path)
+
+        self.assertEqual((exported, imported), (600, 600))
+        self.assertEqual(target_repository.resolve_collection("books"), "books-v1")
+        self.assertEqual(sum(len(batch) for batch in target_repository.scroll_points("books-v1")), 600)
+        self.assertTrue(os.path.exists(os.path.join(target_dir, "docstore.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
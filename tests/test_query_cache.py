@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from files_ingestor.domain.services.query_cache import CachedQueryEmbedding, QueryEmbeddingCache
+
+
+def mk_embed_model() -> MagicMock:
+    embed_model = MagicMock(model_name="bge-m3", embed_batch_size=10)
+    embed_model._get_query_embedding.side_effect = lambda query: [float(len(query)), 0.5]
+    embed_model._get_text_embeddings.side_effect = lambda texts: [[float(len(text)), 0.5] for text in texts]
+    return embed_model
+
+
+class TestQueryEmbeddingCache(unittest.TestCase):
+    def test_normalized_queries_share_an_entry_per_model(self):
+        """Test that case and whitespace variants hit the same entry, but other models do not."""
+        cache = QueryEmbeddingCache()
+        cache.put("bge-m3", "Who is  Ishmael?", [1.0, 2.0])
+
+        self.assertEqual(cache.get("bge-m3", " who is ishmael? "), [1.0, 2.0])
+        self.assertIsNone(cache.get("nomic", "Who is Ishmael?"))
+        self.assertEqual(cache.metrics()["hit_rate"], 0.5)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test that the in-memory tier keeps at most max_entries, dropping the least recently used."""
+        cache = QueryEmbeddingCache(max_entries=2)
+        cache.put("m", "a", [1.0])
+        cache.put("m", "b", [2.0])
+        cache.get("m", "a")
+        cache.put("m", "c", [3.0])
+
+        self.assertEqual(cache.get("m", "a"), [1.0])
+        self.assertIsNone(cache.get("m", "b"))
+        self.assertEqual(cache.metrics()["entries"], 2)
+
+    def test_disk_tier_is_shared_across_instances(self):
+        """Test that a second cache on the same file starts warm and the file is bounded."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache", "embeddings.sqlite")
+            first = QueryEmbeddingCache(path=path, max_disk_entries=50)
+            for i in range(120):
+                first.put("m", f"question {i}", [0.25, float(i)])
+            first.close()
+
+            second = QueryEmbeddingCache(path=path, max_disk_entries=50)
+            self.assertEqual(second.get("m", "Question 119"), [0.25, 119.0])
+            self.assertIsNone(second.get("m", "question 0"))
+            self.assertEqual(second.metrics()["disk_hits"], 1)
+            second.close()
+
+    def test_from_config_is_disabled_by_default(self):
+        config = MagicMock()
+        config.get.side_effect = lambda key, default: default
+        self.assertIsNone(QueryEmbeddingCache.from_config(config))
+
+
+class TestCachedQueryEmbedding(unittest.TestCase):
+    def test_repeated_queries_skip_the_model(self):
+        """Test that only the first of repeated queries reaches the embedding model."""
+        embed_model = mk_embed_model()
+        cached = CachedQueryEmbedding(embed_model, QueryEmbeddingCache())
+
+        self.assertEqual(cached.get_query_embedding("Who is Ahab?"), [12.0, 0.5])
+        self.assertEqual(cached.get_query_embedding("who is ahab?"), [12.0, 0.5])
+        embed_model._get_query_embedding.assert_called_once_with("Who is Ahab?")
+
+    def test_batches_only_embed_the_misses(self):
+        """Test that a batch sends only its cache misses to the model, as queries, keeping the order."""
+        embed_model = mk_embed_model()
+        cache = QueryEmbeddingCache()
+        cache.put("bge-m3", "b", [9.0, 9.0])
+        cached = CachedQueryEmbedding(embed_model, cache)
+
+        self.assertEqual(cached.get_query_embeddings(["aa", "b", "cccc"]), [[2.0, 0.5], [9.0, 9.0], [4.0, 0.5]])
+        self.assertEqual(
+            sorted(call.args[0] for call in embed_model._get_query_embedding.call_args_list), ["aa", "cccc"]
+        )
+        embed_model._get_text_embeddings.assert_not_called()
+
+    def test_batch_and_single_queries_share_cached_vectors(self):
+        """Test that a query embedded in a batch is served from the cache as a single query, and vice versa."""
+        embed_model = mk_embed_model()
+        embed_model._get_text_embeddings.side_effect = lambda texts: [[0.0, 0.0] for _ in texts]
+        cached = CachedQueryEmbedding(embed_model, QueryEmbeddingCache())
+
+        batch = cached.get_query_embeddings(["Who is Ahab?", "Who is Ishmael?"])
+        single = cached.get_query_embedding("who is ahab?")
+        cached.get_query_embedding("What is the Pequod?")
+        (pequod,) = cached.get_query_embeddings(["what is the pequod?"])
+
+        self.assertEqual(single, batch[0])
+        self.assertEqual((single, pequod), ([12.0, 0.5], [19.0, 0.5]))
+        self.assertEqual(embed_model._get_query_embedding.call_count, 3)
+
+    def test_texts_are_not_cached(self):
+        embed_model = mk_embed_model()
+        cached = CachedQueryEmbedding(embed_model, QueryEmbeddingCache())
+        cached.get_text_embedding_batch(["chunk", "chunk"])
+        cached.get_text_embedding_batch(["chunk"])
+        self.assertEqual(embed_model._get_text_embeddings.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
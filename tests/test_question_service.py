@@ -0,0 +1,222 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from llama_index.core.response_synthesizers import ResponseMode
+
+from files_ingestor.domain.model.query_settings import QuerySettings
+from files_ingestor.domain.services.answer_cache import AnswerCache
+from files_ingestor.domain.services.query_cache import QueryEmbeddingCache
+from files_ingestor.domain.services.question_service import QuestionService, limit_context_tokens
+
+SYNTHESIZER = "files_ingestor.domain.services.question_service.get_response_synthesizer"
+TOKENIZER = "files_ingestor.domain.services.question_service.get_tokenizer"
+
+
+def mk_node(node_id: str, score: float, text: str = "Call me Ishmael.") -> MagicMock:
+    node = MagicMock(score=score)
+    node.node.node_id = node_id
+    node.node.metadata = {"source": "moby-dick.pdf", "page": 3}
+    node.node.get_content.return_value = text
+    return node
+
+
+class TestQuestionService(unittest.TestCase):
+    def setUp(self):
+        self.config = MagicMock()
+        self.config.get.side_effect = lambda key, default: default
+        self.vector_store = MagicMock()
+        self.vector_store.get_vector_size.return_value = None
+        self.embed_model = MagicMock()
+        self.embed_model.get_query_embedding.side_effect = lambda query: [float(len(query))]
+        self.embeddings = MagicMock()
+        self.embeddings.get_model.return_value = self.embed_model
+        self.service = QuestionService(MagicMock(), self.config, self.vector_store, self.embeddings, MagicMock())
+
+    def test_batch_is_embedded_and_searched_once(self):
+        """Test that all questions are embedded as queries and searched at once, answers in question order."""
+        questions = ["Who is Ishmael?", "What is the Pequod?", "Who is Ahab?"]
+        self.vector_store.search_batch.return_value = [[mk_node(f"n{i}", 0.9)] for i in range(3)]
+        synthesizer = MagicMock()
+        synthesizer.synthesize.side_effect = lambda question, nodes: f"answer to {question}"
+
+        with patch(SYNTHESIZER, return_value=synthesizer):
+            answers = self.service.ask_batch(questions, collection_name="books", top_k=2)
+
+        embedded = [call.args[0] for call in self.embed_model.get_query_embedding.call_args_list]
+        self.assertEqual(sorted(embedded), sorted(questions))
+        self.embed_model._get_text_embeddings.assert_not_called()
+        self.vector_store.search_batch.assert_called_once_with("books", [[15.0], [19.0], [12.0]], 2, None)
+        self.assertEqual([answer.answer for answer in answers], [f"answer to {q}" for q in questions])
+        self.assertEqual(answers[1].sources, [{"node_id": "n1", "score": 0.9, "source": "moby-dick.pdf", "page": 3}])
+        self.assertEqual(
+            set(answers[0].timings),
+            {"embed_seconds", "search_seconds", "queue_seconds", "synthesis_seconds", "total_seconds"},
+        )
+
+    def test_synthesis_concurrency_is_bounded_and_failures_isolated(self):
+        """Test that at most max_concurrency answers are synthesized at once and a failure stays in its answer."""
+        self.vector_store.search_batch.return_value = [[] for _ in range(6)]
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def synthesize(question, nodes):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            if question == "q3":
+                raise TimeoutError("LLM timed out")  # noqa: TRY003
+            return "ok"
+
+        synthesizer = MagicMock()
+        synthesizer.synthesize.side_effect = synthesize
+        with patch(SYNTHESIZER, return_value=synthesizer):
+            answers = self.service.ask_batch([f"q{i}" for i in range(6)], max_concurrency=2)
+
+        self.assertLessEqual(peak[0], 2)
+        self.assertEqual(answers[3].error, "LLM timed out")
+        self.assertIsNone(answers[3].answer)
+        self.assertEqual([answer.answer for answer in answers if answer.error is None], ["ok"] * 5)
+
+    def test_cached_questions_are_not_embedded_again(self):
+        """Test that with a query cache only new questions are embedded, truncated to the collection's size."""
+        self.embed_model.model_name = "bge-m3"
+        self.embed_model.embed_batch_size = 10
+        self.embed_model._get_query_embedding.side_effect = lambda query: [3.0, 4.0, 1.0]
+        self.vector_store.get_vector_size.return_value = 2
+        service = QuestionService(
+            MagicMock(), self.config, self.vector_store, self.embeddings, MagicMock(), query_cache=QueryEmbeddingCache()
+        )
+
+        service.embed_questions("books", ["Who is Ahab?"])
+        vectors = service.embed_questions("books", ["who is ahab?", "Who is Ishmael?"])
+
+        self.assertEqual(vectors, [[0.6, 0.8], [0.6, 0.8]])
+        self.assertEqual(self.embed_model._get_query_embedding.call_args_list[-1].args, ("Who is Ishmael?",))
+        self.assertEqual(self.embed_model._get_query_embedding.call_count, 2)
+
+    def test_answers_are_cached_by_question_and_nodes(self):
+        """Test that the same question over the same nodes is synthesized once, and a response mode change misses."""
+        llm = MagicMock(model_name="claude")
+        answer_cache = AnswerCache()
+        service = QuestionService(
+            MagicMock(), self.config, self.vector_store, self.embeddings, llm, answer_cache=answer_cache
+        )
+        self.vector_store.search_batch.side_effect = lambda *args: [[mk_node("n1", 0.9), mk_node("n2", 0.8)]]
+        synthesizer = MagicMock()
+        synthesizer.synthesize.return_value = "Ahab is the captain."
+
+        with patch(SYNTHESIZER, return_value=synthesizer):
+            first = service.ask_batch(["Who is Ahab?"])
+            second = service.ask_batch(["  who is AHAB? "])
+            compact = service.ask_batch(["Who is Ahab?"], response_mode="compact")
+
+        self.assertEqual(synthesizer.synthesize.call_count, 2)
+        self.assertEqual((first[0].cached, second[0].cached, compact[0].cached), (False, True, False))
+        self.assertEqual(second[0].answer, "Ahab is the captain.")
+        self.assertEqual(second[0].sources, first[0].sources)
+
+        answer_cache.invalidate_nodes(["n2"])
+        with patch(SYNTHESIZER, return_value=synthesizer):
+            self.assertFalse(service.ask_batch(["Who is Ahab?"])[0].cached)
+
+    def test_failed_answers_are_not_cached(self):
+        answer_cache = AnswerCache()
+        service = QuestionService(
+            MagicMock(), self.config, self.vector_store, self.embeddings, MagicMock(), answer_cache=answer_cache
+        )
+        self.vector_store.search_batch.return_value = [[mk_node("n1", 0.9)]]
+        synthesizer = MagicMock()
+        synthesizer.synthesize.side_effect = TimeoutError("LLM timed out")
+
+        with patch(SYNTHESIZER, return_value=synthesizer):
+            service.ask_batch(["Who is Ahab?"])
+
+        self.assertEqual(answer_cache.metrics()["entries"], 0)
+
+    def test_filters_scope_the_search(self):
+        """Test that metadata filters are passed on to the batched search."""
+        self.vector_store.search_batch.return_value = [[]]
+        with patch(SYNTHESIZER):
+            self.service.ask_batch(["Who is Ahab?"], filters={"source": "moby-dick.pdf", "page": [3, 4]})
+
+        self.assertEqual(self.vector_store.search_batch.call_args[0][3], {"source": "moby-dick.pdf", "page": [3, 4]})
+
+    def test_retrieve_returns_scored_nodes_without_llm(self):
+        """Test that retrieval embeds and searches the query with the collection's top_k, and never synthesizes."""
+        self.vector_store.search_batch.return_value = [[mk_node("n1", 0.9), mk_node("n2", 0.7)]]
+
+        with patch(SYNTHESIZER) as mock_synthesizer:
+            nodes = self.service.retrieve("Who is Ahab?", collection_name="books", filters={"page": 3})
+
+        mock_synthesizer.assert_not_called()
+        self.vector_store.search_batch.assert_called_once_with("books", [[12.0]], 5, {"page": 3})
+        self.assertEqual([(node.node_id, node.score) for node in nodes], [("n1", 0.9), ("n2", 0.7)])
+        self.assertEqual(nodes[0].to_dict()["text"], "Call me Ishmael.")
+
+    def test_retrieve_collections_embeds_once_and_fans_out(self):
+        """Test that the agent's collections are all searched with one embedding, fused into top_k nodes."""
+        self.config.get.side_effect = lambda key, default: {"agent.useCollections": ["news", "descriptions"]}.get(
+            key, default
+        )
+        service = QuestionService(MagicMock(), self.config, self.vector_store, self.embeddings, MagicMock())
+
+        async def asearch_batch(collection_name, vectors, top_k, filters):
+            return [[mk_node(f"{collection_name}-{i}", 0.9 - i / 10) for i in range(top_k)]]
+
+        self.vector_store.asearch_batch.side_effect = asearch_batch
+        nodes = asyncio.run(service.aretrieve_collections("Who is Ahab?", top_k=3, fusion="score"))
+
+        self.embed_model.get_query_embedding.assert_called_once_with("Who is Ahab?")
+        self.assertEqual([node.node_id for node in nodes], ["news-0", "descriptions-0", "news-1"])
+        self.assertEqual(nodes[1].metadata["collection"], "descriptions")
+
+    def test_request_overrides_collection_query_settings(self):
+        """Test that the response mode and context budget come from the request first, then the collection."""
+        overrides = {
+            "vectorstore.qdrant.collections.books.query.similarity_top_k": 2,
+            "vectorstore.qdrant.collections.books.query.response_mode": "compact",
+        }
+        self.config.get.side_effect = lambda key, default: overrides.get(key, default)
+        self.vector_store.search_batch.return_value = [
+            [mk_node("n1", 0.9, "one two three"), mk_node("n2", 0.8, "four five")]
+        ]
+
+        with patch(SYNTHESIZER) as mock_synthesizer, patch(TOKENIZER, return_value=str.split):
+            synthesizer = mock_synthesizer.return_value
+            self.service.ask_batch(["q"], collection_name="books", max_context_tokens=4)
+
+        self.assertEqual(self.vector_store.search_batch.call_args[0][2], 2)
+        self.assertEqual(mock_synthesizer.call_args.kwargs["response_mode"], ResponseMode("compact"))
+        self.assertEqual([node.node.node_id for node in synthesizer.synthesize.call_args.kwargs["nodes"]], ["n1"])
+
+    def test_query_settings(self):
+        config = MagicMock()
+        config.get.side_effect = lambda key, default: {"query.response_mode": "refine"}.get(key, default)
+
+        settings = QuerySettings.from_config(config, "books")
+
+        self.assertEqual(settings, QuerySettings(5, "refine", None))
+        self.assertEqual(settings.override(response_mode="no_text").response_mode, "no_text")
+        with self.assertRaises(ValueError):
+            QuerySettings(response_mode="summarize")
+
+    def test_limit_context_tokens(self):
+        """Test that the leading nodes are kept while they fit, and the first one in any case."""
+        nodes = [mk_node("n1", 0.9, "a b c"), mk_node("n2", 0.8, "d e"), mk_node("n3", 0.7, "f")]
+
+        self.assertEqual(limit_context_tokens(nodes, 5, str.split), nodes[:2])
+        self.assertEqual(limit_context_tokens(nodes, 1, str.split), nodes[:1])
+        self.assertEqual(limit_context_tokens(nodes, None), nodes)
+
+    def test_empty_batch(self):
+        self.assertEqual(self.service.ask_batch([]), [])
+        self.vector_store.search_batch.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,12 @@
 import os
 import unittest
-from unittest.mock import Mock, patch
+from datetime import datetime, timezone
+from unittest.mock import Mock, call, patch
 
 from botocore.exceptions import ClientError
 
 from files_ingestor.adapters.repositories.s3_storage import S3StorageAdapter
+from files_ingestor.domain.model.storage_entry import StorageEntry
 from files_ingestor.domain.ports.config import ConfigPort
 from files_ingestor.domain.ports.logger_port import LoggerPort
 
@@ -14,18 +16,16 @@ class TestS3StorageAdapter(unittest.TestCase):
         """Set up test dependencies."""
         self.mock_logger = Mock(spec=LoggerPort)
         self.mock_config = Mock(spec=ConfigPort)
+        self.mock_config.get.side_effect = lambda key, default=None: default
 
         # Patch boto3.client to return a mock before creating the adapter
         self.boto3_patcher = patch("boto3.client")
         self.mock_boto3_client = self.boto3_patcher.start()
 
-        # Create mock S3 client and paginator
+        # Create mock S3 client
         self.mock_s3_client = Mock()
         self.mock_boto3_client.return_value = self.mock_s3_client
 
-        self.mock_paginator = Mock()
-        self.mock_s3_client.get_paginator.return_value = self.mock_paginator
-
         # Create the S3 storage adapter
         self.s3_storage_adapter = S3StorageAdapter(self.mock_logger, self.mock_config)
 
@@ -41,16 +41,14 @@ class TestS3StorageAdapter(unittest.TestCase):
 
     def test_list_files_non_recursive(self):
         """Test listing files in a non-recursive manner."""
-        # Mock pagination response
-        self.mock_paginator.paginate.return_value = [
-            {
-                "Contents": [
-                    {"Key": "folder/document1.pdf"},
-                    {"Key": "folder/document2.txt"},
-                    {"Key": "folder/subfolder/document3.pdf"},
-                ]
-            }
-        ]
+        # Mock listing response
+        self.mock_s3_client.list_objects_v2.return_value = {
+            "Contents": [
+                {"Key": "folder/document1.pdf"},
+                {"Key": "folder/document2.txt"},
+                {"Key": "folder/subfolder/document3.pdf"},
+            ]
+        }
 
         # List files non-recursively
         files = self.s3_storage_adapter.list_files("s3://test-bucket/folder/", recursive=False)
@@ -60,22 +58,21 @@ class TestS3StorageAdapter(unittest.TestCase):
         self.assertIn("s3://test-bucket/folder/document1.pdf", files)
         self.assertIn("s3://test-bucket/folder/document2.txt", files)
 
-        # Verify method calls
-        self.mock_s3_client.get_paginator.assert_called_once_with("list_objects_v2")
-        self.mock_paginator.paginate.assert_called_once_with(Bucket="test-bucket", Prefix="folder/")
+        # Verify the delimiter is pushed down to S3
+        self.mock_s3_client.list_objects_v2.assert_called_once_with(
+            Bucket="test-bucket", Prefix="folder/", Delimiter="/"
+        )
 
     def test_list_files_recursive(self):
         """Test listing files recursively."""
-        # Mock pagination response
-        self.mock_paginator.paginate.return_value = [
-            {
-                "Contents": [
-                    {"Key": "folder/document1.pdf"},
-                    {"Key": "folder/document2.txt"},
-                    {"Key": "folder/subfolder/document3.pdf"},
-                ]
-            }
-        ]
+        # Mock listing response
+        self.mock_s3_client.list_objects_v2.return_value = {
+            "Contents": [
+                {"Key": "folder/document1.pdf"},
+                {"Key": "folder/document2.txt"},
+                {"Key": "folder/subfolder/document3.pdf"},
+            ]
+        }
 
         # List files recursively
         files = self.s3_storage_adapter.list_files("s3://test-bucket/folder/", recursive=True)
@@ -86,13 +83,13 @@ class TestS3StorageAdapter(unittest.TestCase):
         self.assertIn("s3://test-bucket/folder/document2.txt", files)
         self.assertIn("s3://test-bucket/folder/subfolder/document3.pdf", files)
 
-        # Verify paginator calls
-        self.mock_paginator.paginate.assert_called_once_with(Bucket="test-bucket", Prefix="folder/")
+        # Verify listing calls
+        self.mock_s3_client.list_objects_v2.assert_called_once_with(Bucket="test-bucket", Prefix="folder/")
 
     def test_list_files_empty_response(self):
         """Test listing files when no files exist."""
         # Mock empty response
-        self.mock_paginator.paginate.return_value = [{}]
+        self.mock_s3_client.list_objects_v2.return_value = {}
 
         # List files
         files = self.s3_storage_adapter.list_files("s3://test-bucket/empty/", recursive=True)
@@ -100,6 +97,48 @@ class TestS3StorageAdapter(unittest.TestCase):
         # Verify empty result
         self.assertEqual(len(files), 0)
 
+    def test_iter_files_pages_and_filters(self):
+        """Test streaming entries across pages with suffix and pattern filters."""
+        last_modified = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        second_page = "token-2"
+        self.mock_s3_client.list_objects_v2.side_effect = [
+            {
+                "Contents": [
+                    {"Key": "folder/2024/doc1.pdf", "Size": 10, "ETag": '"etag-1"', "LastModified": last_modified},
+                    {"Key": "folder/2024/notes.txt", "Size": 20, "ETag": '"etag-2"', "LastModified": last_modified},
+                ],
+                "IsTruncated": True,
+                "NextContinuationToken": second_page,
+            },
+            {
+                "Contents": [{"Key": "folder/2024/doc2.PDF", "Size": 30}],
+                "IsTruncated": False,
+            },
+        ]
+
+        entries = self.s3_storage_adapter.iter_files(
+            "s3://test-bucket/folder", recursive=True, suffix=".pdf", pattern="2024/*"
+        )
+
+        # Nothing is listed until the first entry is requested
+        self.mock_s3_client.list_objects_v2.assert_not_called()
+        self.assertEqual(
+            list(entries),
+            [
+                StorageEntry(
+                    url="s3://test-bucket/folder/2024/doc1.pdf",
+                    size=10,
+                    etag="etag-1",
+                    mtime=last_modified.timestamp(),
+                ),
+                StorageEntry(url="s3://test-bucket/folder/2024/doc2.PDF", size=30, page_token=second_page),
+            ],
+        )
+        self.mock_s3_client.list_objects_v2.assert_has_calls([
+            call(Bucket="test-bucket", Prefix="folder/2024/"),
+            call(Bucket="test-bucket", Prefix="folder/2024/", ContinuationToken=second_page),
+        ])
+
     def test_download_file(self):
         """Test downloading a file from S3."""
         # Prepare local path
@@ -112,7 +151,20 @@ class TestS3StorageAdapter(unittest.TestCase):
 
         # Verify download
         self.assertEqual(downloaded_path, local_path)
-        self.mock_s3_client.download_file.assert_called_once_with("test-bucket", "path/to/file.pdf", local_path)
+        self.mock_s3_client.download_file.assert_called_once_with(
+            "test-bucket", "path/to/file.pdf", local_path, Config=self.s3_storage_adapter.transfer_config
+        )
+
+    def test_read_bytes(self):
+        """Test fetching a small object into memory."""
+        body = Mock()
+        body.read.return_value = b"%PDF-1.7"
+        self.mock_s3_client.get_object.return_value = {"Body": body}
+
+        data = self.s3_storage_adapter.read_bytes("s3://test-bucket/path/to/file.pdf")
+
+        self.assertEqual(data, b"%PDF-1.7")
+        self.mock_s3_client.get_object.assert_called_once_with(Bucket="test-bucket", Key="path/to/file.pdf")
 
     def test_invalid_url_raises_error(self):
         """Test that invalid URLs raise a ValueError."""
@@ -140,7 +192,7 @@ class TestS3StorageAdapter(unittest.TestCase):
         for error_code, error_message in errors:
             with self.subTest(error=error_code):
                 # Mock error for list_files
-                self.mock_paginator.paginate.side_effect = ClientError(
+                self.mock_s3_client.list_objects_v2.side_effect = ClientError(
                     {"Error": {"Code": error_code, "Message": error_message}}, "ListObjectsV2"
                 )
 
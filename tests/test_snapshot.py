@@ -0,0 +1,72 @@
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+
+from files_ingestor.domain.model.snapshot import SnapshotManifest, SnapshotReader, SnapshotWriter
+
+
+class TestSnapshotBundle(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp_dir, "bundles", "books.snapshot")
+        self.docstore_path = os.path.join(self.tmp_dir, "docstore.json")
+        with open(self.docstore_path, "w") as f:
+            json.dump({"docstore/data": {}}, f)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """Test that points, docstore files and the manifest come back from a bundle."""
+        points = [
+            {"id": f"00000000-0000-0000-0000-00000000000{i}", "vector": [0.5, -0.25, i], "payload": {"page": i}}
+            for i in range(5)
+        ]
+        with SnapshotWriter(self.path) as writer:
+            writer.add_points(points[:3])
+            writer.add_points(points[3:])
+            writer.add_file("docstore.json", self.docstore_path)
+            writer.finish(SnapshotManifest("books", "bge-m3", vector_size=3))
+
+        restored_path = os.path.join(self.tmp_dir, "restored", "docstore.json")
+        with SnapshotReader(self.path) as bundle:
+            self.assertEqual(bundle.manifest.points, 5)
+            self.assertEqual(bundle.manifest.files, ["docstore.json"])
+            self.assertEqual((bundle.manifest.embedding_model, bundle.manifest.vector_size), ("bge-m3", 3))
+            batches = list(bundle.points(batch_size=2))
+            bundle.extract_file("docstore.json", restored_path)
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual([point for batch in batches for point in batch], points)
+        with open(restored_path) as f:
+            self.assertEqual(json.load(f), {"docstore/data": {}})
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["books.snapshot"])
+
+    def test_unfinished_bundle_is_not_written(self):
+        """Test that a failed export leaves neither a bundle nor temp files behind."""
+        with self.assertRaises(RuntimeError), SnapshotWriter(self.path) as writer:
+            writer.add_points([{"id": 1, "vector": [1.0], "payload": {}}])
+            raise RuntimeError("scroll failed")  # noqa: TRY003
+
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), [])
+
+    def test_named_vectors_are_rejected(self):
+        with self.assertRaises(TypeError), SnapshotWriter(self.path) as writer:
+            writer.add_points([{"id": 1, "vector": {"text-dense": [1.0]}, "payload": {}}])
+
+    def test_unknown_format_version(self):
+        """Test that a bundle of another format version is refused."""
+        with SnapshotWriter(self.path) as writer:
+            writer.finish(SnapshotManifest("books", "bge-m3", vector_size=3, format_version=99))
+
+        with self.assertRaises(ValueError):
+            SnapshotReader(self.path)
+        with tarfile.open(self.path) as tar:
+            self.assertEqual(sorted(tar.getnames()), ["manifest.json", "points.jsonl.gz"])
+
+
+if __name__ == "__main__":
+    unittest.main()
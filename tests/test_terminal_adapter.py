@@ -2,7 +2,10 @@ import unittest
 from unittest.mock import Mock, patch
 
 from files_ingestor.adapters.terminal import TerminalAdapter
-from files_ingestor.application.commands.ingest_pdf import IngestPDFCmd
+from files_ingestor.application.commands.ingest_pdf import IngestCloudStorageCmd, IngestFolderCmd, IngestPDFCmd
+from files_ingestor.application.commands.migrate_collection import MigrateCollectionCmd
+from files_ingestor.application.commands.snapshot import ExportSnapshotCmd, ImportSnapshotCmd
+from files_ingestor.application.commands.warm_text_cache import WarmTextCacheCmd
 from files_ingestor.application.handlers.handler import Handler
 from files_ingestor.domain.ports.logger_port import LoggerPort
 
@@ -52,6 +55,58 @@ class TestTerminalAdapter(unittest.TestCase):
             # Assert that the result was logged
             self.mock_logger.info.assert_called_once_with(f"Result: {expected_result}")
 
+    def test_run_with_sharded_cloud_ingestion(self):
+        """Test running the terminal adapter on one shard of a storage URL."""
+        self.adapter.run(["--url", "s3://bucket/books/", "--shard-index", "1", "--shard-count", "3"])
+
+        command = self.mock_handler.handle.call_args[0][0]
+        self.assertIsInstance(command, IngestCloudStorageCmd)
+        self.assertEqual((command.url, command.shard_index, command.shard_count), ("s3://bucket/books/", 1, 3))
+
+    def test_run_with_folder_ingestion(self):
+        """Test running the terminal adapter on a whole folder."""
+        self.adapter.run(["--folder", "/data/books"])
+
+        command = self.mock_handler.handle.call_args[0][0]
+        self.assertIsInstance(command, IngestFolderCmd)
+        self.assertEqual((command.folder_path, command.shard_index, command.shard_count), ("/data/books", 0, 1))
+
+    def test_run_with_text_cache_warm_up(self):
+        """Test running the terminal adapter to only parse a folder into the text cache."""
+        self.adapter.run(["--folder", "/data/books", "--warm-text-cache"])
+
+        command = self.mock_handler.handle.call_args[0][0]
+        self.assertIsInstance(command, WarmTextCacheCmd)
+        self.assertEqual(command.url, "/data/books")
+
+    def test_run_with_collection_migration(self):
+        """Test running the terminal adapter to migrate a collection to another embedding model."""
+        self.adapter.run([
+            "--migrate",
+            "book-library",
+            "--embeddings",
+            "embeddings.bgem3",
+            "--max-pages-per-second",
+            "5",
+        ])
+
+        command = self.mock_handler.handle.call_args[0][0]
+        self.assertIsInstance(command, MigrateCollectionCmd)
+        self.assertEqual((command.collection_name, command.embeddings), ("book-library", "embeddings.bgem3"))
+        self.assertEqual((command.max_pages_per_second, command.drop_old), (5.0, False))
+        self.assertFalse(command.replace_collection)
+
+    def test_run_with_snapshot_export_and_import(self):
+        """Test running the terminal adapter to export a snapshot bundle and import it elsewhere."""
+        self.adapter.run(["--export-snapshot", "/backups/books.snapshot", "--collection", "book-library"])
+        self.adapter.run(["--import-snapshot", "/backups/books.snapshot", "--replace"])
+
+        export_cmd, import_cmd = (args[0][0] for args in self.mock_handler.handle.call_args_list)
+        self.assertIsInstance(export_cmd, ExportSnapshotCmd)
+        self.assertEqual((export_cmd.path, export_cmd.collection_name), ("/backups/books.snapshot", "book-library"))
+        self.assertIsInstance(import_cmd, ImportSnapshotCmd)
+        self.assertEqual((import_cmd.collection_name, import_cmd.replace), (None, True))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,75 @@
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from files_ingestor.domain.model.text_cache import ExtractedTextCache, content_digest
+
+PAGES = [{"text": "Call me Ishmael.", "metadata": {"page": 0}}, {"text": "Some years ago", "metadata": {"page": 1}}]
+
+
+class TestExtractedTextCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_roundtrip_compressed(self):
+        """Test that pages are stored gzip-compressed under the PDF digest and read back."""
+        cache = ExtractedTextCache(self.cache_dir, "pypdf-5.3.0")
+        digest = content_digest(b"%PDF-1.7 moby dick")
+
+        self.assertIsNone(cache.get(digest))
+        cache.put(digest, PAGES)
+
+        self.assertEqual(cache.get(digest), PAGES)
+        self.assertIn(digest, cache)
+        with gzip.open(cache.entry_path(digest), "rt") as f:
+            self.assertIn("Ishmael", f.read())
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_digest_of_file_matches_bytes(self):
+        """Test that hashing a file in blocks gives the same key as hashing its bytes."""
+        data = os.urandom(3 * 1024 * 1024)
+        self.assertEqual(content_digest(io.BytesIO(data)), content_digest(data))
+
+    def test_entries_keyed_by_extractor_version(self):
+        """Test that text extracted by another parser version is not served."""
+        digest = content_digest(b"%PDF-1.7")
+        ExtractedTextCache(self.cache_dir, "pypdf-4.0.0").put(digest, PAGES)
+
+        self.assertIsNone(ExtractedTextCache(self.cache_dir, "pypdf-5.3.0").get(digest))
+
+    def test_evicts_least_recently_used(self):
+        """Test that outgrowing the limit removes the entries read or written longest ago."""
+        cache = ExtractedTextCache(self.cache_dir, "pypdf-5.3.0", max_bytes=10**9)
+        digests = [content_digest(str(i).encode()) for i in range(3)]
+        for i, digest in enumerate(digests):
+            cache.put(digest, [{"text": os.urandom(2000).hex(), "metadata": {}}])
+            os.utime(cache.entry_path(digest), (1000 + i, 1000 + i))
+        cache.get(digests[0])
+
+        cache.max_bytes = cache.size - 1
+        cache.put(content_digest(b"new"), PAGES)
+
+        self.assertIn(digests[0], cache)
+        self.assertNotIn(digests[1], cache)
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+    def test_corrupt_entry_is_a_miss(self):
+        """Test that a truncated entry is dropped instead of failing the ingestion."""
+        cache = ExtractedTextCache(self.cache_dir, "pypdf-5.3.0")
+        digest = content_digest(b"%PDF-1.7")
+        os.makedirs(os.path.dirname(cache.entry_path(digest)))
+        with open(cache.entry_path(digest), "wb") as f:
+            f.write(b"\x1f\x8b truncated")
+
+        self.assertIsNone(cache.get(digest))
+        self.assertNotIn(digest, cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import math
+import random
+import unittest
+
+from files_ingestor.domain.model.vector_encoding import VectorEncoding
+from files_ingestor.domain.services.vector_encoding import encoding_report
+
+
+def unit(vector):
+    norm = math.sqrt(sum(value * value for value in vector))
+    return [value / norm for value in vector]
+
+
+class TestVectorEncoding(unittest.TestCase):
+    def test_truncate_renormalizes(self):
+        """Test that truncated vectors keep their leading components at unit length."""
+        vector = unit([3.0, 4.0, 12.0])
+
+        truncated = VectorEncoding(dimensions=2).truncate(vector)
+
+        self.assertEqual(len(truncated), 2)
+        self.assertAlmostEqual(truncated[0], 0.6)
+        self.assertAlmostEqual(truncated[1], 0.8)
+        self.assertEqual(VectorEncoding().truncate(vector), vector)
+
+    def test_quantize_precision(self):
+        """Test that quantized vectors stay close to the originals."""
+        rng = random.Random(1)  # noqa: S311
+        vector = unit([rng.uniform(-1, 1) for _ in range(64)])
+
+        for datatype, tolerance in [("float16", 1e-3), ("int8", 1e-2)]:
+            quantized = VectorEncoding(datatype=datatype).quantize(vector)
+            self.assertLess(max(abs(a - b) for a, b in zip(vector, quantized)), tolerance)
+
+    def test_parse_and_size(self):
+        """Test the command line form and the size of each encoding."""
+        self.assertEqual(VectorEncoding.parse("512d/int8"), VectorEncoding(dimensions=512, datatype="int8"))
+        self.assertEqual(VectorEncoding.parse("full/float16"), VectorEncoding(datatype="float16"))
+        self.assertEqual(str(VectorEncoding(dimensions=256, datatype="int8")), "256d/int8")
+        self.assertEqual(VectorEncoding().bytes_per_vector(1024), 4096)
+        self.assertEqual(VectorEncoding(dimensions=256, datatype="int8").bytes_per_vector(1024), 256)
+        with self.assertRaises(ValueError):
+            VectorEncoding(datatype="bfloat8")
+
+    def test_encoding_report(self):
+        """Test that recall is measured against exact full-precision search."""
+        rng = random.Random(0)  # noqa: S311
+        corpus = [unit([rng.gauss(0, 1) for _ in range(32)]) for _ in range(200)]
+        queries = [unit([value + rng.gauss(0, 0.1) for value in corpus[i]]) for i in range(20)]
+        encodings = [VectorEncoding(), VectorEncoding(datatype="float16"), VectorEncoding(dimensions=4)]
+
+        rows = encoding_report(corpus, queries, encodings, k=5)
+
+        self.assertEqual([row.bytes_per_vector for row in rows], [128, 64, 16])
+        self.assertEqual(rows[0].recall, 1.0)
+        self.assertGreater(rows[1].recall, 0.9)
+        self.assertLess(rows[2].recall, rows[1].recall)
+
+
+if __name__ == "__main__":
+    unittest.main()